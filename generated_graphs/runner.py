@@ -1,11 +1,22 @@
 import os
+import re
 import shutil
-import subprocess
-import time
+import sys
+
+# graph_tools lives in the repository root (this is also run as a script from here)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_tools.builds import build_line
+from graph_tools.components import solve_by_components
+from graph_tools.progress import Progress, runtime_history
+from graph_tools.pruning import pattern_min_degree, prune_target
+from graph_tools.repeats import log_samples, run_repeated
 
 
 # Step 1: Configuration
 
+REPO_DIR = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem"
+
 TEST_SOURCE_DIRS = {
     "lad": {
         "er": "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/er_lad",
@@ -30,16 +41,49 @@ SOLVER_DEST_DIRS = {
     "RI":      "/home/jana/Documents/DIPLOMA/SOLVERJI/RI/RI/test",
     "VF3":     "/home/jana/Documents/DIPLOMA/SOLVERJI/VF3/vf3lib/test",
     "SICS":    "/home/jana/Documents/DIPLOMA/SOLVERJI/SICS/sics/test",
+    "Trees":   "/home/jana/Documents/DIPLOMA/SOLVERJI/TREES/test",
+    "Matcher": "/home/jana/Documents/DIPLOMA/SOLVERJI/MATCHER/test",
 }
 
 SOLVER_FORMAT = {
     "Glasgow": "lad",
     "LAD": "lad",
     "SICS": "lad",
+    "Trees": "lad",
+    "Matcher": "lad",
     "RI": "ri",
     "VF3": "vf3",
 }
 
+# Solvers that only handle some of the families (default: all of them).
+SOLVER_FAMILIES = {
+    "Trees": ["tree"],
+}
+
+# Replace every staged target by the k-core of its group's patterns
+# (k = smallest pattern degree) before the solvers run.
+PRUNE_TARGETS = False
+
+# Solve the connected components of each target separately, largest first
+# and in parallel, stopping at the first component that holds the pattern.
+SPLIT_COMPONENTS = False
+COMPONENT_JOBS = os.cpu_count() or 1
+
+# Repeated measurement (graph_tools.repeats): up to REPEATS timed runs per
+# cell after WARMUP_RUNS discarded ones, stopping early once the 95% CI of
+# the median is within REPEAT_REL_CI of it.  Set by `benchmark.py run
+# --repeats/--warmup/--rel-ci`; components mode always runs once.
+REPEATS = 1
+WARMUP_RUNS = 0
+REPEAT_REL_CI = 0.05
+
+# Live progress (graph_tools.progress): status for `benchmark.py progress`
+# and a Prometheus textfile (None: don't write one).  The ETA starts from
+# the per-solver runtimes of the last campaign's results dataset.
+PROGRESS_FILE = os.path.join("results", "progress.json")
+METRICS_FILE = os.path.join("results", "benchmark_generated.prom")
+HISTORY_DATASET = "summaries"
+
 # Step 2: Helper for logging
 
 def log_print(msg, log_file):
@@ -60,6 +104,9 @@ def copy_tests(solver_name, test_type):
     dst = os.path.join(dst_base, test_type)
     if os.path.exists(dst):
         shutil.rmtree(dst)
+    if test_type not in SOLVER_FAMILIES.get(solver_name, [test_type]):
+        print(f"[Copy] Skipping {solver_name}/{test_type} (family not supported)")
+        return
     os.makedirs(dst, exist_ok=True)
 
     print(f"[Copy] {solver_name}: copying {test_type} → {dst}")
@@ -70,6 +117,50 @@ def copy_tests(solver_name, test_type):
             shutil.copy2(sp, dp)
 
 
+# Step 3b: Prune staged targets to the core the patterns can live in
+
+def prune_tests(solver, test_type):
+    test_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], test_type)
+    fmt = SOLVER_FORMAT[solver["name"]]
+    map_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], f"{test_type}_maps")
+    if os.path.exists(map_dir):
+        shutil.rmtree(map_dir)
+
+    target_re = re.compile("^" + re.escape(solver["file_pattern"]["target"]).replace(r"\{group\}", "(.+)") + "$")
+    for f in sorted(os.listdir(test_dir)):
+        m = target_re.match(f)
+        if not m:
+            continue
+        grp = m.group(1)
+        patterns = [os.path.join(test_dir, solver["file_pattern"]["pattern"].format(group=grp, level=lvl))
+                    for lvl in (10, 20, 60)]
+        patterns = [p for p in patterns if os.path.exists(p)]
+        if not patterns:
+            continue
+        k = min(pattern_min_degree(p, fmt) for p in patterns)
+        n0, n1, m0, m1 = prune_target(os.path.join(test_dir, f), fmt, k,
+                                      os.path.join(map_dir, f + ".npy"))
+        if n1 < n0:
+            print(f"[Prune] {solver['name']} {test_type} grp={grp}: {k}-core {n0}->{n1} vertices, {m0}->{m1} edges")
+
+
+# Step 3c: Count the runs ahead (progress total)
+
+def count_cells(solver, test_type):
+    test_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], test_type)
+    if not os.path.isdir(test_dir):
+        return 0
+    target_re = re.compile("^" + re.escape(solver["file_pattern"]["target"]).replace(r"\{group\}", "(.+)") + "$")
+    pattern = solver["file_pattern"]["pattern"]
+    cells = 0
+    for f in os.listdir(test_dir):
+        m = target_re.match(f)
+        if m:
+            cells += sum(os.path.exists(os.path.join(test_dir, pattern.format(group=m.group(1), level=lvl)))
+                         for lvl in (10, 20, 60))
+    return cells
+
+
 # Step 4: Run tests for one solver & one type
 
 
@@ -77,7 +168,7 @@ def run_all_tests_for_solver(solver, test_type, log_file):
     test_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], test_type)
 
     # determine filename suffix
-    if solver["name"] in ("Glasgow", "LAD", "SICS"):
+    if solver["name"] in ("Glasgow", "LAD", "SICS", "Trees", "Matcher"):
         suffix = "_original_graph"
     elif solver["name"] == "RI":
         suffix = "_original_graph.gfu"
@@ -109,6 +200,14 @@ def run_all_tests_for_solver(solver, test_type, log_file):
                 log_print(f"[Run] Missing pattern {pattern_abs}", log_file)
                 continue
 
+            if SPLIT_COMPONENTS:
+                log_print(f"\n[Run] {solver['name']} grp={grp} lvl={lvl}", log_file)
+                solve_by_components(solver, SOLVER_FORMAT[solver["name"]], pattern_abs, target_abs,
+                                    os.path.join(SOLVER_DEST_DIRS[solver["name"]], f"{test_type}_components"),
+                                    60.0, COMPONENT_JOBS, lambda msg: log_print(msg, log_file),
+                                    os.path.join(SOLVER_DEST_DIRS[solver["name"]], f"{test_type}_maps", target_file + ".npy"))
+                continue
+
             # relative paths for execution
             pattern_rel = "./" + os.path.relpath(pattern_abs, solver["workdir"])
             target_rel  = "./" + os.path.relpath(target_abs,  solver["workdir"])
@@ -125,29 +224,18 @@ def run_all_tests_for_solver(solver, test_type, log_file):
                 f"--track-origins=yes "
                 f"--log-file={vg_log} "
                 f"{base_cmd}"
-            )
+            ) if solver.get("valgrind", True) else base_cmd
 
             log_print(f"\n[Run] {solver['name']} grp={grp} lvl={lvl}", log_file)
             log_print(f"[Run] CMD: {vg_cmd}", log_file)
 
-            start = time.time()
-            try:
-                proc = subprocess.run(
-                    vg_cmd,
-                    cwd=solver["workdir"],
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                    timeout=60.0
-                )
-                elapsed = time.time() - start
-                log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
-
-            except subprocess.TimeoutExpired:
-                elapsed = time.time() - start
+            proc, samples, warmups, elapsed = run_repeated(vg_cmd, solver["workdir"], 60.0,
+                                                           REPEATS, WARMUP_RUNS, REPEAT_REL_CI)
+            log_samples(samples, warmups, lambda msg: log_print(msg, log_file))
+            if proc is None:
                 log_print(f"[Run] TIMED OUT after 60s (elapsed={elapsed:.2f}s)", log_file)
                 continue
+            log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
 
             # log solver output
             if proc.stdout:
@@ -234,9 +322,42 @@ def main():
                 "target": "{group}_original_graph",
                 "pattern": "{group}_subgraph_{level}"
             }
+        },
+        {
+            # in-repo tree-in-tree matcher (graph_tools/trees.py), tree family only
+            "name": "Trees",
+            "workdir": REPO_DIR,
+            "command": "python3 -m graph_tools.trees {pattern} {target}",
+            "valgrind": False,
+            "file_pattern": {
+                "target": "{group}_original_graph",
+                "pattern": "{group}_subgraph_{level}"
+            }
+        },
+        {
+            # in-repo bitset matcher (graph_tools/matcher.py)
+            "name": "Matcher",
+            "workdir": REPO_DIR,
+            "command": "python3 -m graph_tools.matcher --timeout 60 {pattern} {target}",
+            "valgrind": False,
+            "file_pattern": {
+                "target": "{group}_original_graph",
+                "pattern": "{group}_subgraph_{level}"
+            }
         }
     ]
 
+    if PRUNE_TARGETS:
+        for t in all_types:
+            for solver in solvers:
+                if os.path.isdir(os.path.join(SOLVER_DEST_DIRS[solver["name"]], t)):
+                    prune_tests(solver, t)
+
+    progress = Progress("generated", PROGRESS_FILE, METRICS_FILE, runtime_history(HISTORY_DATASET))
+    for t in all_types:
+        for solver in solvers:
+            progress.plan(solver["name"], count_cells(solver, t))
+
     # Run & log
     for t in all_types:
         for solver in solvers:
@@ -247,7 +368,8 @@ def main():
             log_path = os.path.join("results", f"{solver['name']}_{t}_results.txt")
             with open(log_path, "w") as lf:
                 log_print(f"=== START {solver['name']} ({t}) ===", lf)
-                run_all_tests_for_solver(solver, t, lf)
+                log_print(build_line(solver), lf)
+                run_all_tests_for_solver(solver, t, progress.watch(lf))
                 log_print(f"=== END   {solver['name']} ({t}) ===", lf)
             print(f"[Done] {solver['name']} {t} → {log_path}")
 
@@ -1,303 +1,189 @@
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
 
-# Create output directory for saving plots
-output_dir = "plots"
-if not os.path.exists(output_dir):
-   os.makedirs(output_dir)
+import numpy as np
+
+from graph_tools.dataset import load_datasets
+from results import SUITES
+
+# Figures for the three suites, rendered from the results datasets that
+# results.py writes next to the summaries.  The datasets are loaded once,
+# every figure becomes a task holding just its slice of the data, and the
+# tasks are rendered on a process pool with the Agg backend.  A figure is
+# only re-rendered when the hash of its slice (or of the plotting code's
+# RENDER_VERSION) differs from the one recorded in the output directory.
+
+RENDER_VERSION = 1
+CACHE_FILE = ".figures.json"
+JOBS = os.cpu_count() or 1
+
+DATASET_DIRS = [summaries for _, summaries in SUITES.values()]
 
 # color mapping for solvers
 SOLVER_COLORS = {
-   "Glasgow": "tab:orange",
-   "PathLAD": "tab:blue",
-   "RI": "tab:red",
-   "VF3": "tab:purple",
-   "SICS": "tab:green"
+    "Glasgow": "tab:orange",
+    "PathLAD": "tab:blue",
+    "RI": "tab:red",
+    "VF3": "tab:purple",
+    "SICS": "tab:green"
 }
 
 SOLVER_ORDER = ["Glasgow", "SICS", "PathLAD", "RI", "VF3"]
 
+REAL_FAMILIES = ["pentagon", "quatrilateral", "triangle"]
+GENERATED_FAMILIES = ["tree", "er", "scale_free"]
+GENERATED_LEVELS = [10, 20, 60]
+RANDOM_SIZES = ["1000-100", "700-70", "500-50"]
+
 def map_solver_name(solver):
-   """Map file names to display names"""
-   if solver == "LAD":
-       return "PathLAD"
-   return solver
+    """Map file names to display names"""
+    if solver == "LAD":
+        return "PathLAD"
+    return solver
 
 def get_solver_color(solver):
-   # default to gray if not found
-   return SOLVER_COLORS.get(solver, "gray")
-
-def clean_and_sort_data(df, column_to_sort):
-   df[column_to_sort] = pd.to_numeric(df[column_to_sort], errors='coerce')
-   df = df.sort_values(by=column_to_sort, ascending=True, na_position='last')
-   return df
-
-# ========== REAL GRAPHS ==========
-def load_real_summary_files(folder_path, graph_type):
-   data = {}
-   for file_name in os.listdir(folder_path):
-       if file_name.endswith("_summary.txt") and graph_type in file_name:
-           file_path = os.path.join(folder_path, file_name)
-           df = pd.read_csv(file_path, sep="|", skiprows=2, names=["graph", "time(s)", "alloc(B)"])
-           df["time(s)"] = pd.to_numeric(df["time(s)"].str.strip(), errors='coerce')
-           df["alloc(B)"] = pd.to_numeric(df["alloc(B)"].str.strip(), errors='coerce')
-           solver_name = file_name.split("_")[0]
-           solver_name = map_solver_name(solver_name)
-           data[solver_name] = df
-   return data
-
-def plot_cumulative_real(data, time_limit=120, save_path=None):
-   plt.figure(figsize=(10, 6))
-   for solver in SOLVER_ORDER:
-       if solver in data:
-           df = data[solver]
-           times = df["time(s)"].dropna().sort_values()
-           x = [0] + list(times[times <= time_limit])
-           y = [0] + list(range(1, len(x)))
-           if len(x) > 0 and x[-1] < time_limit:
-               x.append(time_limit)
-               y.append(y[-1])
-           plt.plot(x, y, label=solver, color=get_solver_color(solver))
-   plt.xlim(0, time_limit)
-   plt.ylim(0, 100)  
-   plt.yticks(range(0, 101, 20))
-   plt.xlabel("čas [s]")
-   plt.ylabel("število rešenih primerov")
-   plt.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-   plt.grid()
-   plt.tight_layout()
-   if save_path:
-       plt.savefig(save_path)
-   plt.close()
-
-def plot_memory_time_real(data, time_limit=120, save_path=None):
-   plt.figure(figsize=(10, 6))
-   max_mem = 0
-   for solver in SOLVER_ORDER:
-       if solver in data:
-           df = data[solver]
-           times = pd.to_numeric(df["time(s)"], errors='coerce')
-           mems = pd.to_numeric(df["alloc(B)"], errors='coerce') / (1024 * 1024)  # MB
-           mask = (~times.isna()) & (~mems.isna()) & (times <= time_limit)
-           plt.scatter(times[mask], mems[mask], color=get_solver_color(solver), label=solver, s=40)
-           if mems[mask].max(skipna=True) > max_mem:
-               max_mem = mems[mask].max(skipna=True)
-   plt.xlim(0, time_limit)
-   plt.ylim(0, max_mem * 1.05 if max_mem > 0 else 1)
-   plt.xlabel("čas [s]")
-   plt.ylabel("poraba pomnilnika [MB]")
-   plt.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-   plt.grid()
-   plt.tight_layout()
-   if save_path:
-       plt.savefig(save_path)
-   plt.close()
-
-# ========== GENERATED GRAPHS (SYNTHETIC) ==========
-def load_and_process_summary_files(folder_path, graph_type):
-   data = {}
-   for file_name in os.listdir(folder_path):
-       if file_name.endswith("_summary.txt"):
-           file_path = os.path.join(folder_path, file_name)
-           with open(file_path, "r") as f:
-               lines = f.readlines()
-           section_start = None
-           for idx, line in enumerate(lines):
-               if f"-- test family: {graph_type} --" in line:
-                   section_start = idx
-                   break
-           if section_start is not None:
-               header_idx = section_start + 1
-               data_start = section_start + 2
-               content = []
-               for line in lines[data_start:]:
-                   if not line.strip() or line.startswith("-- test family:"):
-                       break
-                   content.append(line.strip())
-               if content:
-                   df = pd.DataFrame([row.split(" | ") for row in content])
-                   df.columns = ["group", "10_time(s)", "20_time(s)", "60_time(s)", "10_alloc(B)", "20_alloc(B)", "60_alloc(B)"]
-                   solver_name = file_name.split("_")[0]
-                   solver_name = map_solver_name(solver_name)
-                   data[solver_name] = df
-   return data
-
-def plot_cumulative_graph(data, column_to_sort, graph_type, save_path=None):
-   plt.figure(figsize=(10, 6))
-   for solver in SOLVER_ORDER:
-       if solver in data:
-           df = data[solver]
-           df = clean_and_sort_data(df, column_to_sort)
-           total_instances = len(df)
-           if total_instances == 0:
-               continue
-           valid_data = df[column_to_sort].dropna()
-           solved_counts = valid_data.rank(method='min', pct=False)
-           x = list(valid_data)
-           y = list(solved_counts)
-           x = [0] + x
-           y = [0] + y
-           if x[-1] < 60:
-               x.append(60)
-               y.append(y[-1])
-           elif x[-1] > 60:
-               x[-1] = 60
-           plt.plot(x, y, linestyle='-', label=solver, color=get_solver_color(solver))
-   plt.xlim(0, 60)
-   plt.ylim(0, 100)
-   plt.xlabel("čas [s]")
-   plt.ylabel("število rešenih primerov")
-   plt.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-   plt.grid()
-   plt.tight_layout()
-   if save_path:
-       plt.savefig(save_path)
-   plt.close()
-
-def plot_memory_time(data, time_column, memory_column, graph_type, save_path=None):
-   plt.figure(figsize=(10, 6))
-   max_mem = 0
-   for solver in SOLVER_ORDER:
-       if solver in data:
-           df = data[solver]
-           times = pd.to_numeric(df[time_column], errors='coerce')
-           mems = pd.to_numeric(df[memory_column], errors='coerce') / (1024 * 1024)  # Convert to MB
-           mask = (~times.isna()) & (~mems.isna()) & (times <= 60)
-           plt.scatter(times[mask], mems[mask], color=get_solver_color(solver), label=solver, s=40)
-           if mems[mask].max(skipna=True) > max_mem:
-               max_mem = mems[mask].max(skipna=True)
-   plt.xlim(0, 60)
-   plt.ylim(0, max_mem * 1.05 if max_mem > 0 else 1)
-   plt.xlabel("čas [s]")
-   plt.ylabel("poraba pomnilnika [MB]") 
-   plt.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-   plt.grid()
-   plt.tight_layout()
-   if save_path:
-       plt.savefig(save_path)
-   plt.close()
-
-# ========== NEGATIVE INSTANCES (RANDOM) ==========
-def load_negative_summary_files(folder_path):
-    data = {}
-    size_patterns = ["1000-100", "700-70", "500-50"]
-    
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith("_random_summary.txt"):
-            parts = file_name.split("_")
-            solver_name = parts[0]
-            size_pattern = parts[1]
-            
-            if size_pattern in size_patterns:
-                file_path = os.path.join(folder_path, file_name)
-                df = pd.read_csv(file_path, sep="|", skiprows=2, names=["graph", "time(s)", "alloc(B)"])
-                df["time(s)"] = pd.to_numeric(df["time(s)"].str.strip(), errors='coerce')
-                df["alloc(B)"] = pd.to_numeric(df["alloc(B)"].str.strip(), errors='coerce')
-                
-                solver_name = map_solver_name(solver_name)
-                
-                if size_pattern not in data:
-                    data[size_pattern] = {}
-                data[size_pattern][solver_name] = df
-                
-    return data
-
-def plot_cumulative_negative(data, size_pattern, time_limit=120, save_path=None):
-    plt.figure(figsize=(10, 6))
-    
-    if size_pattern in data:
-        for solver in SOLVER_ORDER:
-            if solver in data[size_pattern]:
-                df = data[size_pattern][solver]
-                times = df["time(s)"].dropna().sort_values()
-                x = [0] + list(times[times <= time_limit])
-                y = [0] + list(range(1, len(x)))
-                if len(x) > 0 and x[-1] < time_limit:
-                    x.append(time_limit)
-                    y.append(y[-1])
-                plt.plot(x, y, label=solver, color=get_solver_color(solver))
-    
+    # default to gray if not found
+    return SOLVER_COLORS.get(solver, "gray")
+
+# ========== TASKS ==========
+def _slice(columns, mask, reported=False):
+    """Per-solver (times of solved runs, allocations in MB), in SOLVER_ORDER.
+
+    With ``reported`` a solver's own runtime replaces the wall time where it
+    prints one, as in the generated summaries.
+    """
+    out = {}
+    solvers = np.array([map_solver_name(s) for s in columns["solver"][mask]])
+    solved = columns["status"][mask] == "solved"
+    wall = columns["wall"][mask]
+    if reported and "runtime" in columns:
+        own = columns["runtime"][mask]
+        wall = np.where(np.isfinite(own), own, wall)
+    wall = np.where(solved, wall, np.nan)
+    alloc = columns["alloc"][mask] / (1024 * 1024)
+    for solver in SOLVER_ORDER:
+        sel = solvers == solver
+        if sel.any():
+            out[solver] = (wall[sel], alloc[sel])
+    return out
+
+def figure_tasks(columns):
+    """(file name, kind, time limit, data slice) for every figure."""
+    suite, family, level = columns["suite"], columns["family"], columns["level"]
+    slices = []
+    for fam in REAL_FAMILIES:
+        slices.append((fam, 120, (suite == "real") & (family == fam), False))
+    for fam in GENERATED_FAMILIES:
+        for lvl in GENERATED_LEVELS:
+            slices.append((f"{fam}{lvl}", 60, (suite == "generated") & (family == fam) & (level == lvl), True))
+    for size in RANDOM_SIZES:
+        slices.append((f"negative_{size.replace('-', '_')}", 120,
+                       (suite == "random") & (family == f"{size}_random"), False))
+    tasks = []
+    for name, limit, mask, reported in slices:
+        if not mask.any():
+            continue
+        data = _slice(columns, mask, reported)
+        tasks.append((f"{name}.png", "cumulative", limit, data))
+        tasks.append((f"{name}_memory.png", "memory", limit, data))
+    return tasks
+
+def task_hash(task):
+    name, kind, limit, data = task
+    h = hashlib.sha1(f"{RENDER_VERSION}|{name}|{kind}|{limit}".encode())
+    for solver, (wall, alloc) in data.items():
+        h.update(solver.encode())
+        h.update(np.ascontiguousarray(wall).tobytes())
+        h.update(np.ascontiguousarray(alloc).tobytes())
+    return h.hexdigest()
+
+# ========== RENDERING ==========
+def plot_cumulative(plt, data, time_limit):
+    for solver, (wall, _) in data.items():
+        times = np.sort(wall[np.isfinite(wall) & (wall <= time_limit)])
+        x = np.concatenate([[0], times, [time_limit]])
+        y = np.concatenate([[0], np.arange(1, len(times) + 1), [len(times)]])
+        plt.plot(x, y, label=solver, color=get_solver_color(solver))
     plt.xlim(0, time_limit)
     plt.ylim(0, 100)
     plt.yticks(range(0, 101, 20))
     plt.xlabel("čas [s]")
     plt.ylabel("število rešenih primerov")
-    plt.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-    plt.grid()
-    plt.tight_layout()
-    if save_path:
-        plt.savefig(save_path)
-    plt.close()
 
-def plot_memory_negative(data, size_pattern, time_limit=120, save_path=None):
-    plt.figure(figsize=(10, 6))
+def plot_memory(plt, data, time_limit):
     max_mem = 0
-    
-    if size_pattern in data:
-        for solver in SOLVER_ORDER:
-            if solver in data[size_pattern]:
-                df = data[size_pattern][solver]
-                times = pd.to_numeric(df["time(s)"], errors='coerce')
-                mems = pd.to_numeric(df["alloc(B)"], errors='coerce') / (1024 * 1024)  # MB
-                mask = (~times.isna()) & (~mems.isna()) & (times <= time_limit)
-                plt.scatter(times[mask], mems[mask], color=get_solver_color(solver), label=solver, s=40)
-                if mems[mask].max(skipna=True) > max_mem:
-                    max_mem = mems[mask].max(skipna=True)
-    
+    for solver, (wall, alloc) in data.items():
+        mask = np.isfinite(wall) & np.isfinite(alloc) & (wall <= time_limit)
+        plt.scatter(wall[mask], alloc[mask], color=get_solver_color(solver), label=solver, s=40)
+        if mask.any():
+            max_mem = max(max_mem, alloc[mask].max())
     plt.xlim(0, time_limit)
     plt.ylim(0, max_mem * 1.05 if max_mem > 0 else 1)
     plt.xlabel("čas [s]")
     plt.ylabel("poraba pomnilnika [MB]")
+
+def render(args):
+    task, out_dir = args
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    name, kind, limit, data = task
+    plt.figure(figsize=(10, 6))
+    (plot_cumulative if kind == "cumulative" else plot_memory)(plt, data, limit)
     plt.legend(loc="center left", bbox_to_anchor=(1, 0.5))
     plt.grid()
     plt.tight_layout()
-    if save_path:
-        plt.savefig(save_path)
+    path = os.path.join(out_dir, name)
+    plt.savefig(path)
     plt.close()
-
-# ========== MAIN EXECUTION ==========
-
-# 1. REAL GRAPHS
-print("Processing real graphs...")
-real_folder_path = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/real_graphs/summaries"
-real_graph_types = ["pentagon", "quatrilateral", "triangle"]
-
-for graph_type in real_graph_types:
-   summary_data = load_real_summary_files(real_folder_path, graph_type)
-   plot_cumulative_real(summary_data, time_limit=120, save_path=os.path.join(output_dir, f"{graph_type}.png"))
-   plot_memory_time_real(summary_data, time_limit=120, save_path=os.path.join(output_dir, f"{graph_type}_memory.png"))
-
-# 2. SYNTHETIC GRAPHS
-print("Processing synthetic graphs...")
-synthetic_folder_path = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/generated_graphs/summaries"
-graph_types = ["tree", "er", "scale_free"]
-time_columns = ["10_time(s)", "20_time(s)", "60_time(s)"]
-memory_columns = ["10_alloc(B)", "20_alloc(B)", "60_alloc(B)"]
-
-for graph_type in graph_types:
-   summary_data = load_and_process_summary_files(synthetic_folder_path, graph_type)
-   for time_column in time_columns:
-       save_name = f"{graph_type}{time_column.split('_')[0]}.png"
-       plot_cumulative_graph(summary_data, time_column, graph_type, save_path=os.path.join(output_dir, save_name))
-
-for graph_type in graph_types:
-   summary_data = load_and_process_summary_files(synthetic_folder_path, graph_type)
-   for time_column, memory_column in zip(time_columns, memory_columns):
-       save_name = f"{graph_type}{time_column.split('_')[0]}_memory.png"
-       plot_memory_time(summary_data, time_column, memory_column, graph_type, save_path=os.path.join(output_dir, save_name))
-
-# 3. NEGATIVE INSTANCES
-print("Processing negative instances...")
-negative_folder_path = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/random_graphs/summaries"
-negative_data = load_negative_summary_files(negative_folder_path)
-
-size_patterns = ["1000-100", "700-70", "500-50"]
-for pattern in size_patterns:
-    safe_pattern = pattern.replace("-", "_")
-    plot_cumulative_negative(negative_data, pattern, time_limit=120, 
-                           save_path=os.path.join(output_dir, f"negative_{safe_pattern}.png"))
-    plot_memory_negative(negative_data, pattern, time_limit=120, 
-                       save_path=os.path.join(output_dir, f"negative_{safe_pattern}_memory.png"))
-
-print(f"All plots have been saved to the '{output_dir}' folder.")
\ No newline at end of file
+    return path
+
+def render_all(columns, out_dir, jobs=JOBS, force=False):
+    """Render the figures whose data changed; returns the paths written."""
+    os.makedirs(out_dir, exist_ok=True)
+    cache_path = os.path.join(out_dir, CACHE_FILE)
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    todo = []
+    for task in figure_tasks(columns):
+        digest = task_hash(task)
+        if force or cache.get(task[0]) != digest or not os.path.exists(os.path.join(out_dir, task[0])):
+            todo.append((task, digest))
+    work = [(task, out_dir) for task, _ in todo]
+    if jobs > 1 and len(work) > 1:
+        with mp.Pool(min(jobs, len(work))) as pool:
+            written = pool.map(render, work, chunksize=1)
+    else:
+        written = [render(w) for w in work]
+
+    cache.update({task[0]: digest for task, digest in todo})
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=1)
+    return written
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render the result figures from the results datasets.")
+    ap.add_argument("datasets", nargs="*", default=DATASET_DIRS, help="dataset files or summary directories")
+    ap.add_argument("--out", default="plots")
+    ap.add_argument("--jobs", type=int, default=JOBS)
+    ap.add_argument("--force", action="store_true", help="re-render every figure")
+    args = ap.parse_args(argv)
+
+    columns = load_datasets(args.datasets)
+    if columns is None:
+        print("No results datasets found (run results.py first).")
+        return 1
+    written = render_all(columns, args.out, args.jobs, args.force)
+    print(f"Rendered {len(written)} figures into '{args.out}'.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from graph_tools.dataset import load_dataset
+
+# Campaign statistics over the results dataset, vectorised over the whole
+# instance x solver runtime matrix of each (suite, family):
+#
+#   PAR-k            mean runtime with unsolved runs counted as k * cutoff
+#   VBS              virtual best solver (per-instance minimum)
+#   best pair        the two-solver portfolio with the lowest PAR-10
+#   win/loss         wins[i, j] = instances solver i solves faster than j
+#   bootstrap        percentile CIs for solved counts and PAR-10 from
+#                    resampled instance sets
+#
+# Timeouts, skipped and missing runs count as unsolved.  Instances the
+# refuter proved infeasible were never given to the solvers (their rows are
+# "refuted"), so they are left out of the family, Refuter row included, and
+# only counted.  In a selector campaign (rows "unselected") each instance
+# ran only with the solver graph_tools.selector picked; the per-solver
+# columns would be mostly gaps, so the family is reported as one
+# "Selector" portfolio row with how often it picked each solver.
+
+CUTOFF = {"generated": 60.0, "random": 120.0, "real": 120.0}
+BOOTSTRAP_CHUNK = 1 << 23
+
+
+def runtime_matrix(columns, mask=None):
+    """(instances, solvers, T) with T[i, s] the runtime, inf where unsolved."""
+    mask = np.ones(len(columns["solver"]), dtype=bool) if mask is None else mask
+    instances, inst = np.unique(columns["instance_hash"][mask], return_inverse=True)
+    solvers, solv = np.unique(columns["solver"][mask], return_inverse=True)
+    solved = columns["status"][mask] == "solved"
+    T = np.full((len(instances), len(solvers)), np.inf)
+    T[inst[solved], solv[solved]] = columns["wall"][mask][solved]
+    return instances, solvers, T
+
+
+def par_scores(T, cutoff, k):
+    """Per-instance PAR-k scores (same shape as T)."""
+    return np.where(T <= cutoff, T, k * cutoff)
+
+
+def vbs(T):
+    return T.min(axis=1)
+
+
+def pair_par(T, cutoff, k=10):
+    """PAR-k of every two-solver portfolio (symmetric, diagonal = single solvers)."""
+    pair = np.minimum(T[:, :, None], T[:, None, :])
+    return par_scores(pair, cutoff, k).mean(axis=0)
+
+
+def best_pair(T, cutoff, k=10):
+    """((i, j), PAR-k) of the best two-solver portfolio with i < j, or None."""
+    if T.shape[1] < 2:
+        return None
+    scores = pair_par(T, cutoff, k)
+    iu = np.triu_indices(T.shape[1], 1)
+    best = np.argmin(scores[iu])
+    return (int(iu[0][best]), int(iu[1][best])), float(scores[iu][best])
+
+
+def win_loss(T, cutoff):
+    """wins[i, j]: instances solver i solves within the cutoff strictly faster than j."""
+    S = np.where(T <= cutoff, T, np.inf)
+    return ((S[:, :, None] < S[:, None, :]) & np.isfinite(S)[:, :, None]).sum(axis=0)
+
+
+def bootstrap(values, reps=1000, confidence=0.95, seed=None):
+    """Percentile CIs of the column sums of ``values`` (instances x k) over resampled instances."""
+    rng = np.random.default_rng(seed)
+    n, k = values.shape
+    chunk = max(1, BOOTSTRAP_CHUNK // max(n, 1))
+    sums = np.empty((reps, k))
+    for lo in range(0, reps, chunk):
+        hi = min(reps, lo + chunk)
+        # resample weights (how often each instance is drawn), one row per resample
+        idx = rng.integers(n, size=(hi - lo, n)) + (np.arange(hi - lo) * n)[:, None]
+        weights = np.bincount(idx.ravel(), minlength=(hi - lo) * n).reshape(hi - lo, n)
+        sums[lo:hi] = weights @ values
+    alpha = (1 - confidence) / 2
+    return np.quantile(sums, alpha, axis=0), np.quantile(sums, 1 - alpha, axis=0)
+
+
+def analyse(columns, cutoff=None, reps=1000, seed=None):
+    """One result dict per (suite, family) of the dataset."""
+    keys = np.char.add(np.char.add(columns["suite"], "|"), columns["family"])
+    results = []
+    for key in np.unique(keys):
+        suite, family = key.split("|", 1)
+        limit = cutoff or CUTOFF.get(suite, 120.0)
+        sel = keys == key
+        refuted = np.unique(columns["instance_hash"][sel & (columns["status"] == "refuted")])
+        portfolio = sel & (columns["status"] == "unselected")
+        ran = sel & ~portfolio & ~np.isin(columns["instance_hash"], refuted)
+        instances, solvers, T = runtime_matrix(columns, ran)
+        picked = {}
+        if portfolio.any():
+            # inconclusive Refuter rows are "missing"; they did not stand in for the pick
+            ran &= columns["status"] != "missing"
+            instances, solvers, T = runtime_matrix(columns, ran)
+            picked = dict(zip(*(x.tolist() for x in np.unique(columns["solver"][ran], return_counts=True))))
+            singles = T[:, :0]
+            T, names = T.min(axis=1, keepdims=True), ["Selector"]
+        else:
+            singles = T
+            T = np.column_stack([T, vbs(T)])
+            names = list(solvers) + ["VBS"]
+        solved = T <= limit
+        par10 = par_scores(T, limit, 10)
+        lo, hi = bootstrap(np.column_stack([solved, par10 / len(instances)]), reps, seed=seed)
+        k = len(names)
+        pair = best_pair(singles, limit)
+        results.append({
+            "suite": suite, "family": family, "cutoff": limit, "instances": len(instances),
+            "refuted": len(refuted), "picked": picked,
+            "solvers": names,
+            "solved": solved.sum(axis=0), "solved_ci": (lo[:k], hi[:k]),
+            "par2": par_scores(T, limit, 2).mean(axis=0), "par10": par10.mean(axis=0),
+            "par10_ci": (lo[k:], hi[k:]),
+            "best_pair": None if pair is None else ((names[pair[0][0]], names[pair[0][1]]), pair[1]),
+            "wins": win_loss(singles, limit),
+        })
+    return results
+
+
+def print_report(results):
+    for r in results:
+        refuted = f", {r['refuted']} refuted left out" if r["refuted"] else ""
+        print(f"== {r['suite']} / {r['family']} ({r['instances']} instances{refuted}, cutoff {r['cutoff']:g}s) ==")
+        print("solver | solved | 95% CI | PAR-2 | PAR-10 | PAR-10 95% CI")
+        for i, name in enumerate(r["solvers"]):
+            lo, hi = r["solved_ci"][0][i], r["solved_ci"][1][i]
+            plo, phi = r["par10_ci"][0][i], r["par10_ci"][1][i]
+            print(f"{name} | {r['solved'][i]} | {lo:.0f}-{hi:.0f} | {r['par2'][i]:.2f} | "
+                  f"{r['par10'][i]:.2f} | {plo:.2f}-{phi:.2f}")
+        if r["best_pair"]:
+            (a, b), score = r["best_pair"]
+            print(f"best pair: {a} + {b} (PAR-10 {score:.2f})")
+        if r["picked"]:
+            print("selector picked: " + ", ".join(f"{s} {n}" for s, n in r["picked"].items()))
+        solvers = r["solvers"][:len(r["wins"])]
+        if not solvers:
+            print()
+            continue
+        print("wins (row beats column) | " + " | ".join(solvers))
+        for name, row in zip(solvers, r["wins"]):
+            print(f"{name} | " + " | ".join(str(int(w)) for w in row))
+        print()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="PAR scores, VBS, best pairs, win/loss and bootstrap CIs.")
+    ap.add_argument("dataset", help="results dataset (file or summaries directory)")
+    ap.add_argument("--cutoff", type=float, default=None, help="default: 60 s generated, 120 s random/real")
+    ap.add_argument("--bootstrap", type=int, default=1000, help="resamples")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    columns = load_dataset(args.dataset)
+    if columns is None:
+        print(f"No results dataset in {args.dataset} (run results.py first).")
+        return 1
+    start = time.time()
+    results = analyse(columns, args.cutoff, args.bootstrap, args.seed)
+    print_report(results)
+    print(f"analysed {len(columns['solver'])} runs in {time.time() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import argparse
+import sys
+import time
+
+from graph_tools.csr import read_graph
+from graph_tools.cycles import CycleFinder, pattern_cycle
+from graph_tools.matcher import BitsetTarget, Matcher, Stats
+from graph_tools.solver_output import format_mapping
+
+# Several patterns against one target: the target is parsed and indexed once
+# (bitset rows and refuter signature for the matcher, 2-core and degeneracy
+# orientation for the cycle detector) and every pattern is answered against
+# the shared index.  Used for the 10/20/60 % patterns of a generated group
+# and the triangle/quadrilateral/pentagon patterns of a real graph.
+
+
+def batch_matcher(target_path, pattern_paths, fmt="lad", timeout=None, build_index=False):
+    """Yield (pattern path, mapping, Stats, seconds) per pattern."""
+    target = BitsetTarget.from_file(target_path, fmt, build_index)
+    patterns = [read_graph(p, fmt) for p in pattern_paths]
+    matchers = [Matcher(*p, target) for p in patterns]
+    # one signature with the largest k serves every pattern
+    target.signature(max((m.signature.k for m in matchers), default=0))
+    for path, matcher in zip(pattern_paths, matchers):
+        stats = Stats()
+        start = time.time()
+        mapping = matcher.solve(timeout, stats)
+        yield path, mapping, stats, time.time() - start
+
+
+def batch_cycles(target_path, pattern_paths, fmt="lad"):
+    """Yield (pattern path, mapping, None, seconds) per cycle pattern."""
+    finder = CycleFinder(*read_graph(target_path, fmt))
+    for path in pattern_paths:
+        order = pattern_cycle(*read_graph(path, fmt))
+        if order is None or len(order) > 5:
+            raise ValueError(f"{path} is not a 3-, 4- or 5-cycle")
+        start = time.time()
+        cycle = finder.find(len(order))
+        mapping = dict(zip(order, cycle)) if cycle else None
+        yield path, mapping, None, time.time() - start
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Match several patterns against one target.")
+    ap.add_argument("target")
+    ap.add_argument("patterns", nargs="+")
+    ap.add_argument("--engine", default="matcher", choices=["matcher", "cycles"])
+    ap.add_argument("--format", default="lad", choices=["lad", "ri", "vf3"])
+    ap.add_argument("--timeout", type=float, default=None, help="seconds per pattern")
+    ap.add_argument("--index", action="store_true", help="build the target index if it is missing")
+    args = ap.parse_args(argv)
+
+    start = time.time()
+    if args.engine == "cycles":
+        results = batch_cycles(args.target, args.patterns, args.format)
+    else:
+        results = batch_matcher(args.target, args.patterns, args.format, args.timeout, args.index)
+    for path, mapping, stats, seconds in results:
+        print(f"pattern = {path}")
+        if stats is not None and stats.aborted:
+            print("status = aborted")
+        elif mapping is None:
+            print("status = false")
+        else:
+            print("status = true")
+            print("mapping = " + format_mapping(mapping))
+        if stats is not None:
+            print(f"nodes = {stats.nodes}")
+        print(f"search_time = {seconds * 1000:.0f} ms")
+        print()
+    print(f"total_time = {(time.time() - start) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
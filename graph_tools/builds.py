@@ -0,0 +1,69 @@
+import hashlib
+import os
+import shlex
+import subprocess
+
+# Which build of a solver produced a log.  The runners write one line per
+# solver log, before its first run:
+#
+#   [Build] Glasgow sha256=3f2a9c0d1e7b4a55 version=glasgow_subgraph_solver 1.0
+#
+# and graph_tools.runlog attaches it to every run that follows.  The hash
+# is of the file the command executes (the solver binary, or the module
+# source for "python3 -m graph_tools.x" engines); the version is the first
+# line the binary prints for --version (or the solver's "version_cmd"),
+# empty when it prints none.
+
+HASH_CHARS = 16
+VERSION_TIMEOUT = 5.0
+
+
+def solver_executable(solver):
+    """Path of the file the solver's command runs (None if it cannot be found)."""
+    argv = shlex.split(solver["command"])
+    if not argv:
+        return None
+    if len(argv) > 2 and argv[1] == "-m" and os.path.basename(argv[0]).startswith("python"):
+        path = os.path.join(solver["workdir"], *argv[2].split(".")) + ".py"
+    else:
+        path = os.path.join(solver["workdir"], argv[0])
+    return path if os.path.isfile(path) else None
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:HASH_CHARS]
+
+
+def solver_version(solver, executable):
+    cmd = solver.get("version_cmd")
+    if cmd is None:
+        if executable is None or executable.endswith(".py"):
+            return ""
+        cmd = f"{shlex.quote(executable)} --version"
+    try:
+        proc = subprocess.run(cmd, cwd=solver["workdir"], shell=True, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, universal_newlines=True, timeout=VERSION_TIMEOUT)
+    except (subprocess.TimeoutExpired, OSError):
+        return ""
+    for line in proc.stdout.splitlines():
+        if line.strip():
+            return " ".join(line.split())[:120]
+    return ""
+
+
+def solver_build(solver):
+    """(hash, version) of the solver's executable; ("", "") if it is missing."""
+    executable = solver_executable(solver)
+    if executable is None:
+        return "", ""
+    return file_hash(executable), solver_version(solver, executable)
+
+
+def build_line(solver):
+    """The "[Build] ..." log line for ``solver``."""
+    digest, version = solver_build(solver)
+    return f"[Build] {solver['name']} sha256={digest or '-'} version={version}"
@@ -0,0 +1,221 @@
+import argparse
+import math
+import sys
+import time
+from collections import deque
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from graph_tools.components import component_labels
+from graph_tools.csr import read_graph
+from graph_tools.solver_output import format_mapping
+from graph_tools.verify import check_embedding
+
+# Randomised colour-coding screen for small tree-like patterns (Alon, Yuster
+# and Zwick).  Each trial colours the target with k = |pattern| colours and
+# looks for a colourful copy of a BFS spanning tree of the pattern.  The DP
+# runs bottom-up over the tree: the table of a pattern vertex u is a boolean
+# matrix with one row per target vertex and one column per colour set S,
+# true when the subtree of u maps to colours S with u on that row.  Merging
+# a child c is one sparse adjacency product (which target vertices have a
+# neighbour that can host c with colours S') followed by ORing the columns
+# of all disjoint pairs S, S'.
+#
+# A hit in the root table is turned into concrete embeddings by walking the
+# tables back down; each one is checked for the pattern's remaining edges
+# and for inducedness (verify.check_embedding), so near-trees such as the
+# real-graph cycles work too.  Any induced embedding is colourful with
+# probability p = k!/k^k, so t trials without a hit leave a false-negative
+# probability of at most (1 - p)^t.
+
+MAX_K = 16
+COLUMN_CHUNK = 64
+
+
+def spanning_tree(indptr, indices):
+    """(root, children lists, BFS order) of a BFS tree from the highest-degree vertex."""
+    n = len(indptr) - 1
+    root = int(np.argmax(np.diff(indptr)))
+    children = [[] for _ in range(n)]
+    seen = np.zeros(n, dtype=bool)
+    seen[root] = True
+    order = [root]
+    queue = deque([root])
+    while queue:
+        u = queue.popleft()
+        for w in indices[indptr[u]:indptr[u + 1]]:
+            if not seen[w]:
+                seen[w] = True
+                children[u].append(int(w))
+                order.append(int(w))
+                queue.append(int(w))
+    return root, children, order
+
+
+def trials_for(k, delta):
+    """Trials that bring the false-negative probability below ``delta``."""
+    p = math.factorial(k) / k ** k
+    return max(1, math.ceil(math.log(delta) / math.log1p(-p)))
+
+
+def miss_probability(k, trials):
+    return (1 - math.factorial(k) / k ** k) ** trials
+
+
+class Table:
+    """Colour sets (bit masks) and the target vertices that can host them."""
+
+    def __init__(self, masks, M):
+        self.masks = masks
+        self.M = M
+        self.col = {int(s): i for i, s in enumerate(masks)}
+
+    def empty(self):
+        return not len(self.masks)
+
+
+class ColourCoding:
+
+    def __init__(self, p_indptr, p_indices, t_indptr, t_indices, seed=None):
+        self.pattern = (p_indptr, p_indices)
+        self.target = (t_indptr, t_indices)
+        self.k = len(p_indptr) - 1
+        self.n = len(t_indptr) - 1
+        self.root, self.children, order = spanning_tree(p_indptr, p_indices)
+        self.post = order[::-1]
+        self.A = csr_matrix((np.ones(len(t_indices), dtype=np.float32), t_indices, t_indptr),
+                            shape=(self.n, self.n))
+        # a pattern vertex of degree d needs a target vertex of degree >= d
+        self.fits = np.diff(t_indptr)[None, :] >= np.diff(p_indptr)[:, None]
+        self.rng = np.random.default_rng(seed)
+
+    def _neighbour_any(self, M):
+        """Rows with at least one neighbour true in each column."""
+        out = np.empty(M.shape, dtype=bool)
+        for lo in range(0, M.shape[1], COLUMN_CHUNK):
+            out[:, lo:lo + COLUMN_CHUNK] = (self.A @ M[:, lo:lo + COLUMN_CHUNK].astype(np.float32)) > 0
+        return out
+
+    def _merge(self, P, C):
+        N = self._neighbour_any(C.M)
+        pairs = []
+        for i, s in enumerate(P.masks):
+            js = np.flatnonzero((C.masks & s) == 0)
+            if len(js):
+                pairs.append((i, js, s | C.masks[js]))
+        if not pairs:
+            return Table(np.empty(0, dtype=np.int64), np.zeros((self.n, 0), dtype=bool))
+        masks = np.unique(np.concatenate([u for _, _, u in pairs]))
+        M = np.zeros((self.n, len(masks)), dtype=bool)
+        for i, js, union in pairs:
+            rows = np.flatnonzero(P.M[:, i])
+            if len(rows):
+                cols = np.searchsorted(masks, union)
+                M[rows[:, None], cols] |= N[rows][:, js]
+        keep = M.any(axis=0)
+        return Table(masks[keep], M[:, keep])
+
+    def _tables(self, colour):
+        """Stage tables per pattern vertex (stage j: first j children merged), or None."""
+        stages = {}
+        for u in self.post:
+            one = np.arange(self.k, dtype=np.int64)
+            M = (colour[:, None] == one[None, :]) & self.fits[u][:, None]
+            keep = M.any(axis=0)
+            table = Table(np.left_shift(1, one)[keep], M[:, keep])
+            stages[u] = [table]
+            for c in self.children[u]:
+                if table.empty():
+                    return None
+                table = self._merge(table, stages[c][-1])
+                stages[u].append(table)
+            if table.empty():
+                return None
+        return stages
+
+    def _embeddings(self, stages, u, j, v, S):
+        """Partial mappings of u's first j subtrees with u -> v on colours S."""
+        if j == 0:
+            yield {u: v}
+            return
+        t_indptr, t_indices = self.target
+        c = self.children[u][j - 1]
+        prev, child = stages[u][j - 1], stages[c][-1]
+        for s_c in child.masks:
+            s_c = int(s_c)
+            rest = S & ~s_c
+            if s_c & ~S or rest not in prev.col or not prev.M[v, prev.col[rest]]:
+                continue
+            nbrs = t_indices[t_indptr[v]:t_indptr[v + 1]]
+            hosts = nbrs[child.M[nbrs, child.col[s_c]]]
+            if not len(hosts):
+                continue
+            for left in self._embeddings(stages, u, j - 1, v, rest):
+                for w in hosts:
+                    for right in self._embeddings(stages, c, len(self.children[c]), int(w), s_c):
+                        yield {**left, **right}
+
+    def trial(self, deadline=None):
+        """One random colouring: (induced mapping or None, whether a colourful copy was seen)."""
+        colour = self.rng.integers(self.k, size=self.n)
+        stages = self._tables(colour)
+        if stages is None:
+            return None, False
+        root = stages[self.root][-1]
+        full = (1 << self.k) - 1
+        if full not in root.col:
+            return None, False
+        for v in np.flatnonzero(root.M[:, root.col[full]]):
+            for mapping in self._embeddings(stages, self.root, len(self.children[self.root]), int(v), full):
+                if check_embedding(self.pattern, self.target, mapping) is None:
+                    return mapping, True
+                if deadline and time.time() > deadline:
+                    return None, True
+        return None, True
+
+    def solve(self, trials, timeout=None):
+        """(mapping or None, trials run, aborted)."""
+        deadline = time.time() + timeout if timeout else None
+        for t in range(trials):
+            if deadline and time.time() > deadline:
+                return None, t, True
+            mapping, _ = self.trial(deadline)
+            if mapping is not None:
+                return mapping, t + 1, False
+        return None, trials, False
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Colour-coding screen for small tree-like patterns.")
+    ap.add_argument("pattern")
+    ap.add_argument("target")
+    ap.add_argument("--format", default="lad", choices=["lad", "ri", "vf3"])
+    ap.add_argument("--delta", type=float, default=0.01, help="false-negative probability to reach")
+    ap.add_argument("--timeout", type=float, default=None)
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    pattern = read_graph(args.pattern, args.format)
+    k = len(pattern[0]) - 1
+    if k > MAX_K or component_labels(*pattern)[0] > 1:
+        print(f"pattern must be connected with at most {MAX_K} vertices", file=sys.stderr)
+        return 2
+
+    start = time.time()
+    engine = ColourCoding(*pattern, *read_graph(args.target, args.format), args.seed)
+    mapping, trials, aborted = engine.solve(trials_for(k, args.delta), args.timeout)
+    elapsed = (time.time() - start) * 1000
+    if mapping is not None:
+        print("status = true")
+        print("mapping = " + format_mapping(mapping))
+    else:
+        print("status = aborted" if aborted else "status = false")
+        print(f"false_negative_probability = {miss_probability(k, trials):.3g}")
+    print(f"trials = {trials}")
+    print(f"search_time = {elapsed:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import signal
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from graph_tools.csr import induced_subgraph, read_graph, write_graph
+from graph_tools.solver_output import format_mapping, parse_mapping, solver_status
+
+# All patterns we benchmark are connected (the generators grow them by
+# neighbour expansion, the real-graph patterns are cycles), so every
+# embedding lies inside one connected component of the target.
+
+
+def component_labels(indptr, indices):
+    n = len(indptr) - 1
+    adj = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+    return connected_components(adj, directed=False)
+
+
+def split_components(target_path, fmt, pattern_n, pattern_m, out_dir):
+    """Write every component that can hold the pattern to its own file.
+
+    Returns a list of (path, original ids) ordered most promising first:
+    components with the most edges come first, since they offer the
+    largest number of candidate images.
+    """
+    indptr, indices = read_graph(target_path, fmt)
+    count, labels = component_labels(indptr, indices)
+    sizes = np.bincount(labels, minlength=count)
+    edges = np.bincount(labels, weights=np.diff(indptr), minlength=count) // 2
+    order = np.lexsort((-sizes, -edges))
+    order = order[(sizes[order] >= pattern_n) & (edges[order] >= pattern_m)]
+
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.basename(target_path)
+    parts = []
+    for i, c in enumerate(order):
+        sub_indptr, sub_indices, old_ids = induced_subgraph(indptr, indices, labels == c)
+        path = os.path.join(out_dir, f"{base}.cc{i}")
+        write_graph(path, sub_indptr, sub_indices, fmt)
+        parts.append((path, old_ids))
+    return parts
+
+
+def _kill(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+def run_first_hit(solver_name, commands, cwd, timeout, jobs):
+    """Run ``commands`` on up to ``jobs`` processes, in order.
+
+    Stops everything as soon as one command reports a solution.  Returns
+    (index of the hit or None, its output, outputs of all finished commands,
+    timed_out).  Output goes to temporary files so that chatty solvers
+    cannot block on a full pipe.
+    """
+    deadline = time.time() + timeout
+    pending = list(enumerate(commands))
+    running = {}
+    outputs = {}
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                i, cmd = pending.pop(0)
+                out = tempfile.TemporaryFile(mode="w+")
+                proc = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=out,
+                                        stderr=subprocess.STDOUT, universal_newlines=True,
+                                        start_new_session=True)
+                running[i] = (proc, out)
+
+            for i, (proc, out) in list(running.items()):
+                if proc.poll() is None:
+                    continue
+                out.seek(0)
+                outputs[i] = out.read()
+                out.close()
+                del running[i]
+                if solver_status(solver_name, outputs[i]) == "sat":
+                    return i, outputs[i], outputs, False
+
+            if time.time() > deadline:
+                return None, None, outputs, True
+            time.sleep(0.01)
+        return None, None, outputs, False
+    finally:
+        for proc, out in running.values():
+            _kill(proc)
+            out.close()
+
+
+def translate_mapping(solver_name, output, old_ids, base_map=None):
+    """Mapping from the solver output in original target ids, or None.
+
+    ``old_ids`` maps component ids to the staged target; ``base_map`` (the
+    pruning map, if the target was pruned) maps those to the source file.
+    """
+    mapping = parse_mapping(solver_name, output)
+    if mapping is None:
+        return None
+    ids = old_ids if base_map is None else base_map[old_ids]
+    return {p: int(ids[t]) for p, t in mapping.items()}
+
+
+def solve_by_components(solver, fmt, pattern_abs, target_abs, scratch_dir, timeout, jobs,
+                        log, base_map_path=None):
+    """Run ``solver`` on the components of the target, logging like the runners.
+
+    ``log`` is the runner's log function bound to its results file.  The
+    elapsed time includes splitting the target.
+    """
+    start = time.time()
+    p_indptr, _ = read_graph(pattern_abs, fmt)
+    pattern_n = len(p_indptr) - 1
+    pattern_m = int(p_indptr[-1]) // 2
+    parts = split_components(target_abs, fmt, pattern_n, pattern_m, scratch_dir)
+    log(f"[Components] {len(parts)} components can hold the pattern "
+        f"(split in {time.time() - start:.2f}s)")
+
+    pattern_rel = "./" + os.path.relpath(pattern_abs, solver["workdir"])
+    commands = []
+    for path, _ in parts:
+        target_rel = "./" + os.path.relpath(path, solver["workdir"])
+        commands.append(solver["command"].format(pattern=pattern_rel, target=target_rel))
+    for cmd in commands:
+        log(f"[Run] CMD: {cmd}")
+
+    remaining = max(0.0, timeout - (time.time() - start))
+    hit, output, outputs, timed_out = run_first_hit(solver["name"], commands, solver["workdir"],
+                                                    remaining, jobs)
+    elapsed = time.time() - start
+    for path, _ in parts:
+        os.remove(path)
+
+    # without a hit the run is only finished if every component was refuted;
+    # one that crashed or hit the solver's own timeout leaves it open
+    undecided = [] if hit is not None else [i for i in range(len(parts))
+                                             if solver_status(solver["name"], outputs.get(i, "")) != "unsat"]
+    if timed_out or undecided:
+        if undecided:
+            log(f"[Components] no verdict from component(s) {', '.join(map(str, undecided))}")
+        log(f"[Run] TIMED OUT after {timeout:.0f}s (elapsed={elapsed:.2f}s)")
+        return
+    log(f"[Run] Done in {elapsed:.2f}s")
+    if hit is None:
+        # every component refuted: show one solver verdict for the log
+        if outputs:
+            log(outputs[max(outputs)])
+        log("[Components] no component contains the pattern")
+        return
+
+    log(output)
+    path, old_ids = parts[hit]
+    log(f"[Components] hit in component {hit} ({len(old_ids)} vertices)")
+    base_map = np.load(base_map_path) if base_map_path and os.path.exists(base_map_path) else None
+    mapping = translate_mapping(solver["name"], output, old_ids, base_map)
+    if mapping is not None:
+        log(f"[Components] mapping = {format_mapping(mapping)}")
@@ -0,0 +1,148 @@
+import numpy as np
+
+# Every generator and converter writes the same undirected graph in three
+# formats: LAD (Glasgow, PathLAD, SICS), RI (.gfu) and VF3 (.grf).  The helpers
+# below read any of them into a compressed sparse row pair (indptr, indices)
+# so that preprocessing can work on plain NumPy arrays.
+
+FORMATS = ("lad", "ri", "vf3")
+
+
+def edge_sources(indptr):
+    """Source vertex of every entry in ``indices``."""
+    n = len(indptr) - 1
+    return np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+
+
+def edge_positions(indptr, vertices):
+    """Positions in ``indices`` of all edges leaving ``vertices``."""
+    vertices = np.asarray(vertices, dtype=np.int64)
+    starts = indptr[vertices]
+    lens = indptr[vertices + 1] - starts
+    total = int(lens.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lens) + lens, lens)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+def from_edges(n, src, dst):
+    """Build a symmetric CSR graph without loops or parallel edges."""
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    u = np.concatenate([src, dst])
+    v = np.concatenate([dst, src])
+    key = np.unique(u * n + v)
+    u, v = key // n, key % n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u, minlength=n), out=indptr[1:])
+    return indptr, v.astype(np.int32)
+
+
+def induced_subgraph(indptr, indices, keep):
+    """Restrict the graph to the vertices where ``keep`` is True.
+
+    Returns the compactly relabelled (indptr, indices) together with the
+    original id of every kept vertex.
+    """
+    keep = np.asarray(keep, dtype=bool)
+    old_ids = np.flatnonzero(keep)
+    new_id = np.full(len(keep), -1, dtype=np.int64)
+    new_id[old_ids] = np.arange(len(old_ids))
+
+    src = edge_sources(indptr)
+    mask = keep[src] & keep[indices]
+    new_src = new_id[src[mask]]
+    new_dst = new_id[indices[mask]]
+
+    sub_indptr = np.zeros(len(old_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(new_src, minlength=len(old_ids)), out=sub_indptr[1:])
+    return sub_indptr, new_dst.astype(np.int32), old_ids
+
+
+# Reading
+
+def _read_lad(path):
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    n = int(lines[0])
+    rows = lines[1:1 + n]
+    degrees = np.array([row.split(None, 1)[0] for row in rows], dtype=np.int64)
+    tokens = np.array(b" ".join(rows).split(), dtype=np.int64)
+    # drop the leading degree of every row, leaving only neighbour ids
+    heads = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degrees + 1, out=heads[1:])
+    is_head = np.zeros(len(tokens), dtype=bool)
+    is_head[heads[:-1]] = True
+    indices = tokens[~is_head]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    return indptr, indices.astype(np.int32)
+
+
+def _read_ri(path):
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    # header, n, n labels, m, m edges
+    n = int(lines[1])
+    m = int(lines[2 + n])
+    edges = np.array(b" ".join(lines[3 + n:3 + n + m]).split(), dtype=np.int64)
+    edges = edges.reshape(-1, 2)
+    return from_edges(n, edges[:, 0], edges[:, 1])
+
+
+def _read_vf3(path):
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    # n, n "id attr" lines, then per vertex a count line followed by its edges
+    n = int(lines[0])
+    edge_lines = [line for line in lines[1 + n:] if len(line.split()) == 2]
+    edges = np.array(b" ".join(edge_lines).split(), dtype=np.int64).reshape(-1, 2)
+    return from_edges(n, edges[:, 0], edges[:, 1])
+
+
+def read_graph(path, fmt):
+    """Read a LAD, RI or VF3 file into (indptr, indices)."""
+    if fmt == "lad":
+        return _read_lad(path)
+    if fmt == "ri":
+        return _read_ri(path)
+    if fmt == "vf3":
+        return _read_vf3(path)
+    raise ValueError(f"unknown graph format: {fmt}")
+
+
+# Writing (same layout as the export_graph_* functions of the generators)
+
+def write_graph(path, indptr, indices, fmt, header="#data"):
+    n = len(indptr) - 1
+    with open(path, "w") as f:
+        if fmt == "lad":
+            f.write(f"{n}\n")
+            for node in range(n):
+                neighbors = indices[indptr[node]:indptr[node + 1]]
+                if len(neighbors):
+                    f.write(f"{len(neighbors)} " + " ".join(map(str, neighbors.tolist())) + "\n")
+                else:
+                    f.write("0\n")
+        elif fmt == "ri":
+            src = edge_sources(indptr)
+            mask = src < indices
+            f.write(f"{header}\n{n}\n")
+            f.writelines("a\n" for _ in range(n))
+            f.write(f"{int(mask.sum())}\n")
+            for u, v in zip(src[mask].tolist(), indices[mask].tolist()):
+                f.write(f"{u} {v}\n")
+        elif fmt == "vf3":
+            f.write(f"{n}\n")
+            for node in range(n):
+                f.write(f"{node} 1\n")
+            for node in range(n):
+                neighbors = indices[indptr[node]:indptr[node + 1]].tolist()
+                f.write(f"{len(neighbors)}\n")
+                for neighbor in neighbors:
+                    f.write(f"{node} {neighbor}\n")
+        else:
+            raise ValueError(f"unknown graph format: {fmt}")
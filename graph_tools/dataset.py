@@ -0,0 +1,173 @@
+import hashlib
+import os
+
+import numpy as np
+
+from graph_tools.repeats import summarize_samples
+from graph_tools.solver_output import STAT_COLUMNS
+
+# Tidy, columnar form of a campaign's results: one row per run with
+#
+#   solver, suite, family, group, level, instance, instance_hash,
+#   build, version, status, answer, samples, repeats, wall, wall_mad, wall_ci_low, wall_ci_high,
+#   cpu, peak_rss, alloc,
+#   nodes, propagations, restarts, nogoods_size, fail_nodes, solutions, search_time, runtime
+#
+# status is "solved", "timeout", "refuted", "unselected", "skipped" or
+# "missing"; wall is the runner's wall time (the elapsed time for
+# timeouts); group/level are -1 outside the generated suite.  The runners
+# record neither CPU time nor peak RSS yet, so those columns are NaN until
+# they do.  instance_hash identifies an instance across solvers (suite,
+# family and instance name).  answer is the solver's "sat"/"unsat"; nodes ..
+# runtime are the search statistics it printed
+# (graph_tools.solver_output.STATS_RE), NaN where it prints none.
+# Cells measured repeatedly (graph_tools.repeats) keep every sample in
+# "samples" (space separated seconds); wall is then their median and
+# wall_mad/wall_ci_* its spread and 95% CI (NaN for single runs).  repeats
+# counts the measured runs, the timed-out one included.
+#
+# The random runner does not hand every instance to every solver:
+# "refuted" instances were proved infeasible by graph_tools.refute, and
+# "unselected" ones went to the solver graph_tools.selector picked.  The
+# summaries and graph_tools.analysis leave these rows out instead of
+# counting them as unsolved.  build/version identify the solver executable
+# that ran (graph_tools.builds; empty for logs written before the runners
+# recorded it).
+#
+# Written as Parquet when pyarrow is installed, or as uncompressed Feather
+# (format="feather", read back zero-copy from a memory map), otherwise as an
+# uncompressed .npz of plain NumPy columns.  One format per directory: writing
+# one removes the dataset files of the others.
+
+STRING_COLUMNS = ["solver", "suite", "family", "instance", "instance_hash", "build", "version",
+                  "status", "answer", "samples"]
+INT_COLUMNS = ["group", "level", "repeats"]
+FLOAT_COLUMNS = ["wall", "wall_mad", "wall_ci_low", "wall_ci_high", "cpu", "peak_rss", "alloc"] + STAT_COLUMNS
+COLUMNS = STRING_COLUMNS + INT_COLUMNS + FLOAT_COLUMNS
+
+DATASET_NAME = "results"
+FORMATS = ("parquet", "feather", "npz")
+
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def instance_hash(suite, family, instance):
+    return hashlib.sha1(f"{suite}/{family}/{instance}".encode()).hexdigest()[:16]
+
+
+def run_row(rec):
+    """Dataset row (dict) for a graph_tools.runlog.RunRecord."""
+    samples = rec.samples
+    spread = (np.nan, np.nan, np.nan)
+    if rec.skipped is not None:
+        status = ("refuted" if rec.skipped.startswith("refuted:") else
+                  "unselected" if rec.skipped.startswith("selected:") else "skipped")
+        wall, repeats = np.nan, 0
+    elif rec.timeout is not None:
+        status, wall, repeats = "timeout", rec.timeout, len(samples) + 1
+    elif rec.time is not None:
+        status, wall = "solved", rec.time
+        samples = samples or [rec.time]
+        repeats = len(samples)
+        spread = summarize_samples(samples)[1:]
+    else:
+        status, wall, repeats = "missing", np.nan, 0
+    return {
+        "solver": rec.solver, "suite": rec.suite, "family": rec.family or "",
+        "instance": rec.instance, "instance_hash": instance_hash(rec.suite, rec.family, rec.instance),
+        "build": rec.build, "version": rec.version,
+        "status": status, "answer": rec.answer or "",
+        "samples": " ".join(f"{t:g}" for t in samples),
+        "group": int(rec.group) if rec.group is not None else -1,
+        "level": int(rec.level) if rec.level is not None else -1,
+        "repeats": repeats,
+        "wall": wall, "wall_mad": spread[0], "wall_ci_low": spread[1], "wall_ci_high": spread[2],
+        "cpu": np.nan, "peak_rss": np.nan,
+        "alloc": rec.alloc if rec.alloc is not None else np.nan,
+        **{name: rec.stats.get(name, np.nan) for name in STAT_COLUMNS},
+    }
+
+
+def to_columns(rows, columns=COLUMNS):
+    """{column: NumPy array} from row dicts."""
+    out = {}
+    for name in columns:
+        if name in STRING_COLUMNS:
+            out[name] = np.array([row.get(name, "") for row in rows], dtype=str)
+        elif name in INT_COLUMNS:
+            out[name] = np.array([row.get(name, -1) for row in rows], dtype=np.int64)
+        else:
+            out[name] = np.array([row.get(name, np.nan) for row in rows], dtype=np.float64)
+    return out
+
+
+def default_format():
+    return "parquet" if pyarrow else "npz"
+
+
+def dataset_path(directory, name=DATASET_NAME, fmt=None):
+    return os.path.join(directory, f"{name}.{fmt or default_format()}")
+
+
+def write_dataset(columns, directory, name=DATASET_NAME, fmt=None):
+    """Write the columns next to the summaries; returns the file written."""
+    fmt = fmt or default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown dataset format {fmt!r}")
+    if fmt != "npz" and pyarrow is None:
+        raise RuntimeError(f"writing {fmt} needs pyarrow")
+    path = dataset_path(directory, name, fmt)
+    tmp = path + ".tmp"
+    if fmt == "parquet":
+        pyarrow.parquet.write_table(pyarrow.table(columns), tmp)
+    elif fmt == "feather":
+        pyarrow.feather.write_feather(pyarrow.table(columns), tmp, compression="uncompressed")
+    else:
+        with open(tmp, "wb") as f:
+            np.savez(f, **columns)
+    os.replace(tmp, path)
+    for other in FORMATS:
+        if other != fmt and os.path.exists(dataset_path(directory, name, other)):
+            os.remove(dataset_path(directory, name, other))
+    return path
+
+
+def load_dataset(path):
+    """{column: NumPy array} from a file written by write_dataset, or from its
+    directory (None if the directory holds no dataset)."""
+    if os.path.isdir(path):
+        for fmt in FORMATS:
+            if os.path.exists(dataset_path(path, fmt=fmt)):
+                path = dataset_path(path, fmt=fmt)
+                break
+        else:
+            return None
+    if path.endswith(".parquet"):
+        table = pyarrow.parquet.read_table(path, memory_map=True)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    if path.endswith(".feather"):
+        table = pyarrow.feather.read_table(path, memory_map=True)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def load_datasets(paths):
+    """The datasets under ``paths`` (files or directories) concatenated, or None if there are none."""
+    parts = [load_dataset(p) for p in paths if os.path.exists(p)]
+    parts = [p for p in parts if p is not None and len(p["solver"])]
+    if not parts:
+        return None
+    names = [n for n in parts[0] if all(n in p for p in parts)]
+    return {n: np.concatenate([p[n] for p in parts]) for n in names}
+
+
+def load_frame(path):
+    """The dataset as a pandas DataFrame (for the plotting scripts)."""
+    import pandas as pd
+    return pd.DataFrame(load_dataset(path))
@@ -0,0 +1,161 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from graph_tools.csr import edge_positions, from_edges, induced_subgraph, read_graph
+from graph_tools.cycles import CycleFinder, pattern_cycle
+from graph_tools.solver_output import format_mapping
+
+# Induced 3/4/5-cycle search over a series of snapshots of one graph (the
+# AS-733 days), updated from edge deltas instead of solving every day from
+# scratch.  Snapshots are read from the SNAP edge lists, because the
+# converter renumbers each day's vertices.
+#
+# From day d to day d+1:
+#   - a witness cycle whose vertex pairs did not change is still induced;
+#   - any induced cycle that is new on day d+1 contains both endpoints of a
+#     changed pair (an added edge, or a removed chord), so it lies within
+#     distance length // 2 of a changed endpoint.  Searching that ball is
+#     enough to keep "no cycle" up to date, and usually finds a replacement
+#     witness too;
+#   - only a broken witness with no replacement in the ball needs a full
+#     search.
+#
+# Mappings are printed in the converter's numbering (vertices of the day in
+# ascending original id), like the solvers' output on the converted files.
+
+KEY_SHIFT = np.int64(1 << 32)
+
+
+def read_snap_edges(path):
+    """(ids, keys) of a SNAP edge list: every vertex id, sorted, and the
+    undirected edges (u < v, original ids) as sorted unique keys.
+
+    A vertex whose only edge is a self-loop has no edge key but keeps its
+    id, as the converter keeps it, so the numbering of the vertices after
+    it matches the converted files.
+    """
+    edges = np.loadtxt(path, dtype=np.int64, comments="#", ndmin=2)[:, :2]
+    u, v = edges.min(axis=1), edges.max(axis=1)
+    keep = u != v
+    return np.unique(edges), np.unique(u[keep] * KEY_SHIFT + v[keep])
+
+
+def snapshot_graph(ids, keys):
+    """(indptr, indices): the snapshot's CSR over ``ids`` (ascending)."""
+    u, v = keys // KEY_SHIFT, keys % KEY_SHIFT
+    return from_edges(len(ids), np.searchsorted(ids, u), np.searchsorted(ids, v))
+
+
+def ball(indptr, indices, sources, radius):
+    """Mask of the vertices within ``radius`` hops of ``sources``."""
+    mask = np.zeros(len(indptr) - 1, dtype=bool)
+    mask[sources] = True
+    frontier = np.flatnonzero(mask)
+    for _ in range(radius):
+        nbrs = indices[edge_positions(indptr, frontier)]
+        frontier = np.unique(nbrs[~mask[nbrs]])
+        mask[frontier] = True
+    return mask
+
+
+class DynamicCycles:
+    """Induced ``length``-cycle witness kept up to date across snapshots."""
+
+    def __init__(self, length):
+        self.length = length
+        self.keys = None
+        self.witness = None  # original ids, in cycle order
+
+    def _still_induced(self, keys):
+        w = self.witness
+        for i in range(self.length):
+            for j in range(i + 1, self.length):
+                a, b = min(w[i], w[j]), max(w[i], w[j])
+                probe = a * KEY_SHIFT + b
+                at = np.searchsorted(keys, probe)
+                present = at < len(keys) and keys[at] == probe
+                if present != (j - i in (1, self.length - 1)):
+                    return False
+        return True
+
+    def update(self, ids, keys):
+        """Move to the snapshot with vertices ``ids`` and edge keys ``keys``;
+        returns (cycle in local ids or None, how)."""
+        indptr, indices = snapshot_graph(ids, keys)
+        if self.keys is None:
+            how = "full"
+            cycle = CycleFinder(indptr, indices).find(self.length)
+        else:
+            changed = np.setxor1d(self.keys, keys, assume_unique=True)
+            if self.witness is not None and self._still_induced(keys):
+                self.keys = keys
+                return list(np.searchsorted(ids, self.witness)), "kept"
+            ends = np.unique(np.concatenate([changed // KEY_SHIFT, changed % KEY_SHIFT]))
+            ends = np.searchsorted(ids, ends[np.isin(ends, ids)])
+            how = "local"
+            cycle = None
+            if len(ends):
+                sub_indptr, sub_indices, old_ids = induced_subgraph(
+                    indptr, indices, ball(indptr, indices, ends, self.length // 2))
+                cycle = CycleFinder(sub_indptr, sub_indices).find(self.length)
+                if cycle:
+                    cycle = [int(old_ids[u]) for u in cycle]
+            if cycle is None and self.witness is not None:
+                how = "full"
+                cycle = CycleFinder(indptr, indices).find(self.length)
+        self.keys = keys
+        self.witness = [int(ids[u]) for u in cycle] if cycle else None
+        return cycle, how
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Find an induced cycle pattern in every snapshot of a temporal graph.")
+    ap.add_argument("pattern", help="3-, 4- or 5-cycle pattern")
+    ap.add_argument("snapshots", nargs="+", help="SNAP edge lists in time order")
+    ap.add_argument("--format", default="lad", choices=["lad", "ri", "vf3"], help="pattern format")
+    ap.add_argument("--from-scratch", action="store_true", help="also solve every day from scratch and compare")
+    args = ap.parse_args(argv)
+
+    order = pattern_cycle(*read_graph(args.pattern, args.format))
+    if order is None or len(order) > 5:
+        print("pattern is not a 3-, 4- or 5-cycle", file=sys.stderr)
+        return 2
+
+    dynamic = DynamicCycles(len(order))
+    total = scratch_total = 0.0
+    disagreements = 0
+    for path in args.snapshots:
+        ids, keys = read_snap_edges(path)
+        start = time.time()
+        cycle, how = dynamic.update(ids, keys)
+        elapsed = time.time() - start
+        total += elapsed
+        print(f"snapshot = {os.path.basename(path)}")
+        if cycle is None:
+            print("status = false")
+        else:
+            print("status = true")
+            print("mapping = " + format_mapping(dict(zip(order, cycle))))
+        print(f"update = {how}")
+        print(f"search_time = {elapsed * 1000:.0f} ms")
+        if args.from_scratch:
+            start = time.time()
+            scratch = CycleFinder(*snapshot_graph(ids, keys)).find(len(order))
+            scratch_total += time.time() - start
+            if (scratch is None) != (cycle is None):
+                disagreements += 1
+                print("[Check] from-scratch search disagrees")
+        print()
+    print(f"total_time = {total * 1000:.0f} ms")
+    if args.from_scratch:
+        print(f"from_scratch_time = {scratch_total * 1000:.0f} ms")
+        return 1 if disagreements else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from graph_tools.components import component_labels
+from graph_tools.csr import read_graph
+from graph_tools.pruning import core_numbers
+from graph_tools.triangles import triangle_counts
+
+# Structural features of every pattern and target, cached by the SHA-1 of the
+# file contents so each graph (including the large SNAP targets) is only
+# analysed once.  Bump FEATURES_VERSION when the feature set changes.
+
+FEATURES_VERSION = 1
+CACHE_DIR = "features_cache"
+
+FEATURE_NAMES = [
+    "n", "m", "density",
+    "deg_mean", "deg_std", "deg_skew", "deg_kurtosis", "max_degree",
+    "degeneracy", "triangles", "avg_clustering", "transitivity", "components",
+]
+
+
+def guess_format(path):
+    if path.endswith(".gfu"):
+        return "ri"
+    if path.endswith(".grf"):
+        return "vf3"
+    return "lad"
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def graph_features(indptr, indices):
+    n = len(indptr) - 1
+    m = len(indices) // 2
+    deg = np.diff(indptr).astype(np.float64)
+    feats = {"n": n, "m": m, "density": 2.0 * m / (n * (n - 1)) if n > 1 else 0.0}
+
+    mean = deg.mean() if n else 0.0
+    std = deg.std() if n else 0.0
+    z = (deg - mean) / std if std > 0 else np.zeros_like(deg)
+    feats.update({
+        "deg_mean": float(mean),
+        "deg_std": float(std),
+        "deg_skew": float((z ** 3).mean()) if n else 0.0,
+        "deg_kurtosis": float((z ** 4).mean() - 3.0) if n and std > 0 else 0.0,
+        "max_degree": int(deg.max()) if n else 0,
+        "degeneracy": int(core_numbers(indptr, indices).max()) if n else 0,
+    })
+
+    tri = triangle_counts(indptr, indices)
+    wedges = deg * (deg - 1) / 2
+    local = np.divide(tri, wedges, out=np.zeros(n), where=wedges > 0)
+    feats.update({
+        "triangles": int(tri.sum() // 3),
+        "avg_clustering": float(local.mean()) if n else 0.0,
+        "transitivity": float(tri.sum() / wedges.sum()) if wedges.sum() else 0.0,
+        "components": int(component_labels(indptr, indices)[0]) if n else 0,
+    })
+    return feats
+
+
+def instance_features(path, fmt=None, cache_dir=CACHE_DIR, digest=None):
+    """Features of one instance file, computed once per file content."""
+    digest = digest or file_hash(path)
+    cache_path = os.path.join(cache_dir, f"{digest}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached.get("version") == FEATURES_VERSION:
+            return cached["features"]
+
+    feats = graph_features(*read_graph(path, fmt or guess_format(path)))
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": FEATURES_VERSION, "path": path, "features": feats}, f)
+        os.replace(tmp, cache_path)
+    return feats
+
+
+def iter_instance_files(roots):
+    for root in roots:
+        if os.path.isfile(root):
+            yield root
+        for dirpath, dirnames, files in os.walk(root):
+            # skip target indexes (graph_tools.target_index)
+            dirnames[:] = [d for d in dirnames if d != "__pycache__" and not d.endswith((".idx", ".idx.tmp"))]
+            for f in sorted(files):
+                if not f.endswith((".py", ".pyc", ".png", ".npy", ".txt", ".log")):
+                    yield os.path.join(dirpath, f)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compute (cached) structural features of instance files.")
+    ap.add_argument("roots", nargs="+", help="instance files or directories")
+    ap.add_argument("--out", default="features.csv")
+    ap.add_argument("--cache", default=CACHE_DIR)
+    args = ap.parse_args(argv)
+
+    with open(args.out, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["path", "hash"] + FEATURE_NAMES)
+        count = 0
+        for path in iter_instance_files(args.roots):
+            digest = file_hash(path)
+            feats = instance_features(path, cache_dir=args.cache, digest=digest)
+            writer.writerow([path, digest] + [feats[k] for k in FEATURE_NAMES])
+            count += 1
+    print(f"Wrote features of {count} instances → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import argparse
+import copy
+import sys
+import time
+
+import numpy as np
+
+from graph_tools.csr import edge_sources, read_graph
+from graph_tools.refute import Signature, candidate_matrix, refute
+from graph_tools.solver_output import format_mapping
+from graph_tools.target_index import load_index
+
+# In-repo induced subgraph isomorphism solver.  Every domain and every
+# target adjacency row is a packed uint64 bitset (bit t of word t >> 6), so
+# assigning u -> t propagates to all unassigned pattern vertices at once:
+#
+#   D[v] &= adj[t]      for the pattern neighbours v of u
+#   D[v] &= nonadj[t]   for the pattern non-neighbours v of u
+#
+# Neither row contains t itself, which also enforces all-different.  A wiped
+# out domain, or fewer values left in the union of the unassigned domains
+# than unassigned vertices, fails the branch; singleton domains are
+# assigned immediately.  Initial domains come from the refuter's degree,
+# triangle and neighbour-degree filters.  The next variable is the one with
+# the smallest domain, ties broken by larger pattern degree.
+#
+# Output follows Glasgow's format.
+
+# Dense bitset rows take n_T^2 / 8 bytes (128 MiB at this size).
+MAX_TARGET = 32768
+
+if hasattr(np, "bitwise_count"):
+    def popcount(words):
+        return np.bitwise_count(words)
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        counts = _BYTE_COUNTS[words.view(np.uint8)]
+        return counts.reshape(words.shape + (8,)).sum(axis=-1)
+
+
+def pack_rows(mask):
+    """Boolean (rows, n) matrix -> (rows, ceil(n / 64)) uint64 bitsets."""
+    rows, n = mask.shape
+    padded = np.zeros((rows, -(-n // 64) * 64), dtype=bool)
+    padded[:, :n] = mask
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+
+
+def bits(row):
+    """Indices of the set bits of one bitset row."""
+    return np.flatnonzero(np.unpackbits(row.view(np.uint8), bitorder="little"))
+
+
+class Stats:
+
+    def __init__(self):
+        self.nodes = 0
+        self.aborted = False
+
+
+class BitsetTarget:
+    """Target graph with bitset adjacency and non-adjacency rows."""
+
+    def __init__(self, indptr, indices, index=None):
+        n = len(indptr) - 1
+        if n > MAX_TARGET:
+            raise ValueError(f"target has {n} vertices, the bitset matcher handles at most {MAX_TARGET}")
+        self.indptr = indptr
+        self.indices = indices
+        self.n = n
+        self.words = -(-n // 64)
+        self.adj = np.zeros((n, self.words), dtype=np.uint64)
+        np.bitwise_or.at(self.adj, (edge_sources(indptr), indices >> 6),
+                         np.left_shift(np.uint64(1), (indices & 63).astype(np.uint64)))
+        full = pack_rows(np.ones((1, n), dtype=bool))[0]
+        self.nonadj = ~self.adj & full
+        ids = np.arange(n)
+        self.nonadj[ids, ids >> 6] &= ~np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64))
+        self.index = index
+        self._signature = None
+
+    def signature(self, k):
+        """Refuter signature keeping the k largest neighbour degrees.
+
+        Read from the target index if there is one.  Otherwise built once for
+        the largest k asked for; smaller k take a prefix of the (descending)
+        neighbour degrees.
+        """
+        if self.index is not None:
+            return self.index.signature(k)
+        if self._signature is None or self._signature.k < k:
+            self._signature = Signature(self.indptr, self.indices, k)
+        if self._signature.k == k:
+            return self._signature
+        sig = copy.copy(self._signature)
+        sig.k = k
+        sig.nds = self._signature.nds[:, :k]
+        return sig
+
+    @classmethod
+    def from_file(cls, path, fmt="lad", build_index=False):
+        """Target from a graph file, memory-mapping its index when there is one."""
+        index = load_index(path, fmt, build=build_index)
+        if index is not None:
+            return cls(index.indptr, index.indices, index)
+        return cls(*read_graph(path, fmt))
+
+
+class Matcher:
+    """Search for one induced embedding of a pattern in a BitsetTarget."""
+
+    def __init__(self, p_indptr, p_indices, target):
+        self.target = target
+        self.n = len(p_indptr) - 1
+        self.p_adj = np.zeros((self.n, self.n), dtype=bool)
+        self.p_adj[edge_sources(p_indptr), p_indices] = True
+        self.p_deg = np.diff(p_indptr)
+        self.signature = Signature(p_indptr, p_indices)
+
+    def initial_domains(self):
+        """Packed initial domains, or None if the refuter already rules the instance out."""
+        T = self.target.signature(self.signature.k)
+        if refute(self.signature, T):
+            return None
+        return pack_rows(candidate_matrix(self.signature, T))
+
+    def assign(self, D, assigned, u, t):
+        """Assign u -> t in place and propagate; False on a wipe-out."""
+        T = self.target
+        while True:
+            D[u] = 0
+            D[u, t >> 6] = np.uint64(1) << np.uint64(t & 63)
+            assigned[u] = True
+            rows = np.flatnonzero(~assigned)
+            if not len(rows):
+                return True
+            D[rows] &= np.where(self.p_adj[u, rows, None], T.adj[t], T.nonadj[t])
+            sizes = popcount(D[rows]).sum(axis=1)
+            if sizes.min() == 0:
+                return False
+            if popcount(np.bitwise_or.reduce(D[rows], axis=0)).sum() < len(rows):
+                return False
+            single = rows[sizes == 1]
+            if not len(single):
+                return True
+            u = int(single[0])
+            t = int(bits(D[u])[0])
+
+    def branch(self, D, assigned):
+        """Next variable and its values."""
+        rows = np.flatnonzero(~assigned)
+        sizes = popcount(D[rows]).sum(axis=1)
+        best = rows[np.lexsort((-self.p_deg[rows], sizes))[0]]
+        return int(best), bits(D[best])
+
+    def search(self, D, assigned, deadline=None, stop=None, stats=None, branch=None, share=None):
+        """Depth-first search from the given (propagated) state.
+
+        Returns the mapping or None; ``stats.aborted`` tells a timeout (or a
+        set ``stop`` event) apart from a refutation.  ``branch`` fixes the
+        variable and values tried first.  ``share(stack)`` is called every
+        256 nodes and may hand untried values of the stack frames
+        ([D, assigned, var, values, next position]) to other workers.
+        """
+        stats = stats or Stats()
+        if assigned.all():
+            return self.mapping(D)
+        stack = [[D, assigned, *(branch or self.branch(D, assigned)), 0]]
+        while stack:
+            frame = stack[-1]
+            D, assigned, var, values, pos = frame
+            if pos == len(values):
+                stack.pop()
+                continue
+            frame[4] += 1
+            stats.nodes += 1
+            if stats.nodes % 256 == 0:
+                if (deadline and time.time() > deadline) or (stop is not None and stop.is_set()):
+                    stats.aborted = True
+                    return None
+                if share:
+                    share(stack)
+            D2, a2 = D.copy(), assigned.copy()
+            if not self.assign(D2, a2, var, int(values[pos])):
+                continue
+            if a2.all():
+                return self.mapping(D2)
+            stack.append([D2, a2, *self.branch(D2, a2), 0])
+        return None
+
+    def mapping(self, D):
+        return {u: int(bits(D[u])[0]) for u in range(self.n)}
+
+    def solve(self, timeout=None, stats=None):
+        stats = stats or Stats()
+        if self.n == 0:
+            return {}
+        D = self.initial_domains()
+        if D is None or (popcount(D).sum(axis=1) == 0).any():
+            return None
+        deadline = time.time() + timeout if timeout else None
+        return self.search(D, np.zeros(self.n, dtype=bool), deadline, stats=stats)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Find an induced embedding with the in-repo bitset matcher.")
+    ap.add_argument("pattern")
+    ap.add_argument("target")
+    ap.add_argument("--format", default="lad", choices=["lad", "ri", "vf3"])
+    ap.add_argument("--timeout", type=float, default=None, help="seconds")
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes (see graph_tools.parallel)")
+    ap.add_argument("--index", action="store_true", help="build the target index if it is missing")
+    args = ap.parse_args(argv)
+
+    start = time.time()
+    target = BitsetTarget.from_file(args.target, args.format, args.index)
+    matcher = Matcher(*read_graph(args.pattern, args.format), target)
+    stats = Stats()
+    if args.jobs > 1:
+        from graph_tools.parallel import solve_parallel
+        mapping = solve_parallel(matcher, args.jobs, args.timeout, stats)
+    else:
+        mapping = matcher.solve(args.timeout, stats)
+    elapsed = (time.time() - start) * 1000
+    if stats.aborted:
+        print("status = aborted")
+    elif mapping is None:
+        print("status = false")
+    else:
+        print("status = true")
+        print("mapping = " + format_mapping(mapping))
+    print(f"nodes = {stats.nodes}")
+    print(f"search_time = {elapsed:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
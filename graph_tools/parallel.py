@@ -0,0 +1,209 @@
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+
+import numpy as np
+
+from graph_tools.csr import read_graph
+from graph_tools.matcher import BitsetTarget, Matcher, Stats, popcount
+
+# Multi-core search for the bitset matcher.  The first levels of the search
+# tree are expanded in the parent until there are a few subproblems per
+# worker; these go to a shared task queue.  A worker that notices idle
+# workers (every 256 nodes) donates half of the untried values of its
+# shallowest open stack frame back to the queue, so long-running subtrees
+# are split further while the search runs.  The first solution sets a
+# shared stop event that ends every worker.  A worker whose subtree was cut
+# off by the deadline says so in its "done" message, so running out of
+# pending subproblems only means UNSAT when none of them was aborted.
+#
+# Workers are forked so the target bitsets are shared copy-on-write.
+
+TASKS_PER_JOB = 4
+MAX_SPLIT_DEPTH = 3
+
+
+def split(matcher, D, assigned, want):
+    """Expand the search tree breadth-first to about ``want`` subproblems.
+
+    Returns (states, mapping): the open (D, assigned) states, or the mapping
+    if one turned up while expanding.
+    """
+    states = [(D, assigned)]
+    for _ in range(MAX_SPLIT_DEPTH):
+        if len(states) >= want:
+            break
+        expanded = []
+        for D, assigned in states:
+            var, values = matcher.branch(D, assigned)
+            for t in values:
+                D2, a2 = D.copy(), assigned.copy()
+                if not matcher.assign(D2, a2, var, int(t)):
+                    continue
+                if a2.all():
+                    return [], matcher.mapping(D2)
+                expanded.append((D2, a2))
+        states = expanded
+    return states, None
+
+
+def _worker(matcher, tasks, results, stop, idle, pending, deadline):
+    def share(stack):
+        if idle.value <= 0:
+            return
+        for frame in stack:
+            rest = len(frame[3]) - frame[4]
+            if rest >= 1:
+                cut = frame[4] + rest // 2
+                with pending.get_lock():
+                    pending.value += 1
+                tasks.put((frame[0], frame[1], (frame[2], frame[3][cut:])))
+                frame[3] = frame[3][:cut]
+                return
+
+    # unread tasks must not keep the worker alive at exit
+    tasks.cancel_join_thread()
+    waiting = False
+    while not stop.is_set():
+        try:
+            D, assigned, branch = tasks.get(timeout=0.05)
+        except queue.Empty:
+            if not waiting:
+                with idle.get_lock():
+                    idle.value += 1
+                waiting = True
+            continue
+        if waiting:
+            with idle.get_lock():
+                idle.value -= 1
+            waiting = False
+
+        stats = Stats()
+        mapping = matcher.search(D, assigned, deadline, stop, stats, branch, share)
+        if mapping is not None:
+            results.put(("sat", stats.nodes, mapping))
+            stop.set()
+        with pending.get_lock():
+            pending.value -= 1
+        # an aborted subtree is not a refuted one
+        results.put(("done", stats.nodes, stats.aborted))
+
+
+def solve_parallel(matcher, jobs, timeout=None, stats=None):
+    """Like Matcher.solve, with ``jobs`` worker processes."""
+    stats = stats or Stats()
+    if matcher.n == 0:
+        return {}
+    D = matcher.initial_domains()
+    if D is None or (popcount(D).sum(axis=1) == 0).any():
+        return None
+    deadline = time.time() + timeout if timeout else None
+
+    states, mapping = split(matcher, D, np.zeros(matcher.n, dtype=bool), jobs * TASKS_PER_JOB)
+    if mapping is not None or not states:
+        return mapping
+
+    ctx = mp.get_context("fork")
+    tasks, results = ctx.Queue(), ctx.Queue()
+    stop = ctx.Event()
+    idle = ctx.Value("i", 0)
+    pending = ctx.Value("i", len(states))
+    for D, assigned in states:
+        tasks.put((D, assigned, None))
+    workers = [ctx.Process(target=_worker, args=(matcher, tasks, results, stop, idle, pending, deadline),
+                           daemon=True) for _ in range(jobs)]
+    for w in workers:
+        w.start()
+
+    mapping = None
+    try:
+        while True:
+            if deadline and time.time() > deadline:
+                stats.aborted = True
+                break
+            try:
+                kind, nodes, found = results.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            stats.nodes += nodes
+            if kind == "sat":
+                mapping = found
+                break
+            if found or (deadline and time.time() > deadline):
+                stats.aborted = True
+                break
+            if pending.value == 0:
+                break
+    finally:
+        stop.set()
+        # collect the node counts of the stopped workers before joining them
+        give_up = time.time() + 1.0
+        while any(w.is_alive() for w in workers) and time.time() < give_up:
+            try:
+                stats.nodes += results.get(timeout=0.05)[1]
+            except queue.Empty:
+                pass
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+            w.join()
+        # subproblems nobody will take any more
+        tasks.cancel_join_thread()
+        tasks.close()
+    return mapping
+
+
+# Scaling report on the generated ER family
+
+def scaling(instance_dir, groups, levels, job_counts, timeout):
+    """Rows (jobs, solved, total seconds) over the given ER instances."""
+    instances = []
+    for g in groups:
+        target = os.path.join(instance_dir, f"{g}_original_graph")
+        for lvl in levels:
+            pattern = os.path.join(instance_dir, f"{g}_subgraph_{lvl}")
+            if os.path.exists(target) and os.path.exists(pattern):
+                instances.append((pattern, target))
+
+    rows = []
+    for jobs in job_counts:
+        solved, total = 0, 0.0
+        for pattern, target in instances:
+            matcher = Matcher(*read_graph(pattern, "lad"), BitsetTarget.from_file(target))
+            stats = Stats()
+            start = time.time()
+            if jobs > 1:
+                solve_parallel(matcher, jobs, timeout, stats)
+            else:
+                matcher.solve(timeout, stats)
+            elapsed = time.time() - start
+            solved += not stats.aborted
+            total += timeout if stats.aborted else elapsed
+        rows.append((jobs, solved, len(instances), total))
+        print(f"[Scaling] jobs={jobs}: solved {solved}/{len(instances)} in {total:.1f}s")
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Scaling of the parallel bitset matcher on the ER family.")
+    ap.add_argument("--instances", default="generated_graphs/instances/er_lad")
+    ap.add_argument("--groups", type=int, default=10, help="first N groups")
+    ap.add_argument("--levels", type=int, nargs="+", default=[10, 20, 60])
+    ap.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    args = ap.parse_args(argv)
+
+    job_counts = sorted({1, args.max_jobs} | {2 ** i for i in range(1, 16) if 2 ** i < args.max_jobs})
+    rows = scaling(args.instances, range(1, args.groups + 1), args.levels, job_counts, args.timeout)
+    base = rows[0][3]
+    print("jobs | solved | time(s) | speedup")
+    for jobs, solved, count, total in rows:
+        print(f"{jobs} | {solved}/{count} | {total:.1f} | {base / total:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Live progress of a runner campaign.  The runners hand their log files to
+# Progress.watch(); every "[Run] ..." line written through it (header, Done,
+# TIMED OUT, Skipped -- the grammar graph_tools.runlog parses) moves the
+# counters, and after each event two small files are replaced atomically:
+#
+#   progress.json     status for `benchmark.py progress` (the terminal view)
+#   <name>.prom       Prometheus text format, for a node-exporter textfile
+#                     collector (point the runner's METRICS_FILE into its
+#                     --collector.textfile.directory)
+#
+# A cell is one solver run on one instance; the runners plan() the cells of
+# every solver before the first one starts.  The ETA charges every remaining
+# cell the solver's expected runtime: the mean of the runs so far, shrunk
+# towards the solver's mean in the previous campaign's results dataset with
+# the weight of PRIOR_RUNS runs (timeouts count with their elapsed time).
+#
+# Only the standard library is imported at module level, so the terminal
+# view starts quickly; NumPy is needed only to read the history.
+
+PRIOR_RUNS = 5
+STALLED_AFTER = 3600
+METRIC_PREFIX = "benchmark"
+
+
+def runtime_history(dataset):
+    """{solver: mean wall seconds per run} from an earlier results dataset ({} without one)."""
+    from graph_tools.dataset import load_dataset
+    try:
+        columns = load_dataset(dataset)
+    except (OSError, ValueError, KeyError):
+        return {}
+    if columns is None:
+        return {}
+    import numpy as np
+    ran = np.isin(columns["status"], ["solved", "timeout"]) & np.isfinite(columns["wall"])
+    history = {}
+    for solver in np.unique(columns["solver"][ran]):
+        history[str(solver)] = float(columns["wall"][ran & (columns["solver"] == solver)].mean())
+    return history
+
+
+class _WatchedLog:
+    """File-like wrapper that reports the runner's "[Run]" lines to a Progress."""
+
+    def __init__(self, log_file, progress):
+        self.log_file = log_file
+        self.progress = progress
+
+    def write(self, text):
+        if text.startswith("[Run] ") or text.startswith("\n[Run] "):
+            self.progress.feed(text.strip("\n").split("\n", 1)[0])
+        return self.log_file.write(text)
+
+    def flush(self):
+        self.log_file.flush()
+
+
+class Progress:
+    """Counters, ETA and the status/metrics files of one runner campaign."""
+
+    def __init__(self, suite, status_path, metrics_path=None, history=None):
+        self.suite = suite
+        self.status_path = status_path
+        self.metrics_path = metrics_path
+        self.history = history or {}
+        self.started = time.time()
+        self.cells = {}        # solver -> planned cells
+        self.done = {}         # solver -> finished cells (any status)
+        self.timeouts = {}
+        self.skipped = {}
+        self.runs = {}         # solver -> finished non-skipped runs
+        self.seconds = {}      # solver -> wall seconds of those runs
+        self.current = None    # (solver, instance, start time)
+
+    def plan(self, solver, cells):
+        self.cells[solver] = self.cells.get(solver, 0) + cells
+        self.write()
+
+    def watch(self, log_file):
+        """``log_file`` wrapped so the runner's log lines drive the progress."""
+        return _WatchedLog(log_file, self)
+
+    def feed(self, line):
+        """Update from one "[Run] ..." log line."""
+        if line.startswith("[Run] Done in "):
+            self.finish("solved", float(line[14:].rstrip("s")))
+        elif line.startswith("[Run] TIMED OUT"):
+            at = line.find("elapsed=")
+            self.finish("timeout", float(line[at + 8:].rstrip(")s")) if at >= 0 else None)
+        elif line.startswith("[Run] Skipped"):
+            self.finish("skipped", 0.0)
+        else:
+            tokens = line[6:].split()
+            if len(tokens) == 3 and (tokens[1].startswith("grp=") or tokens[2].startswith("graph=")):
+                instance = (f"{tokens[1][4:]}_{tokens[2][4:]}" if tokens[1].startswith("grp=")
+                            else tokens[2][6:])
+                self.start(tokens[0], instance)
+
+    def start(self, solver, instance):
+        if self.current:
+            # the previous run ended without a verdict (e.g. refuter inconclusive)
+            self.finish("missing", None)
+        self.current = (solver, instance, time.time())
+        self.write()
+
+    def finish(self, status, elapsed):
+        if not self.current:
+            return
+        solver, _, start = self.current
+        self.current = None
+        # the cell's wall clock: with repeats and warm-ups it is more than
+        # the median the runner logs
+        elapsed = max(elapsed or 0.0, time.time() - start)
+        self.done[solver] = self.done.get(solver, 0) + 1
+        if status == "timeout":
+            self.timeouts[solver] = self.timeouts.get(solver, 0) + 1
+        if status == "skipped":
+            self.skipped[solver] = self.skipped.get(solver, 0) + 1
+        else:
+            self.runs[solver] = self.runs.get(solver, 0) + 1
+            self.seconds[solver] = self.seconds.get(solver, 0.0) + elapsed
+        self.write()
+
+    def expected_runtime(self, solver):
+        """Expected seconds of the solver's next run, None if nothing is known."""
+        runs, seconds = self.runs.get(solver, 0), self.seconds.get(solver, 0.0)
+        prior = self.history.get(solver)
+        if prior is not None:
+            return (PRIOR_RUNS * prior + seconds) / (PRIOR_RUNS + runs)
+        if runs:
+            return seconds / runs
+        total = sum(self.runs.values())
+        return sum(self.seconds.values()) / total if total else None
+
+    def eta(self, now=None):
+        """Seconds until every planned cell is done, None while unknown."""
+        now = now or time.time()
+        eta = 0.0
+        for solver, cells in self.cells.items():
+            remaining = max(0, cells - self.done.get(solver, 0))
+            if remaining:
+                expected = self.expected_runtime(solver)
+                if expected is None:
+                    return None
+                eta += remaining * expected
+                if self.current and self.current[0] == solver:
+                    eta -= min(now - self.current[2], expected)
+        return max(0.0, eta)
+
+    def status(self, now=None):
+        now = now or time.time()
+        elapsed = now - self.started
+        done = sum(self.done.values())
+        solvers = {}
+        for solver in sorted(set(self.cells) | set(self.done)):
+            solvers[solver] = {
+                "cells": self.cells.get(solver, 0), "done": self.done.get(solver, 0),
+                "timeouts": self.timeouts.get(solver, 0), "skipped": self.skipped.get(solver, 0),
+                "mean_seconds": self.seconds[solver] / self.runs[solver] if self.runs.get(solver) else None,
+            }
+        current = None
+        if self.current:
+            current = {"solver": self.current[0], "instance": self.current[1], "started": self.current[2]}
+        return {
+            "suite": self.suite, "pid": os.getpid(), "started": self.started, "updated": now,
+            "cells": sum(self.cells.values()), "done": done,
+            "timeouts": sum(self.timeouts.values()), "skipped": sum(self.skipped.values()),
+            "cells_per_hour": done * 3600.0 / elapsed if elapsed > 0 else 0.0,
+            "eta_seconds": self.eta(now), "current": current, "solvers": solvers,
+        }
+
+    def write(self):
+        status = self.status()
+        _replace(self.status_path, json.dumps(status, indent=1) + "\n")
+        if self.metrics_path:
+            _replace(self.metrics_path, prometheus_text(status))
+
+
+def _replace(path, text):
+    """Write ``path`` atomically (collectors must never see a half-written file)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def _labels(**labels):
+    escaped = {k: str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+               for k, v in labels.items()}
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+
+def prometheus_text(status):
+    """The status in the Prometheus text exposition format."""
+    suite = status["suite"]
+    p = METRIC_PREFIX
+    out = []
+
+    def metric(name, kind, help, samples):
+        out.append(f"# HELP {p}_{name} {help}")
+        out.append(f"# TYPE {p}_{name} {kind}")
+        for labels, value in samples:
+            out.append(f"{p}_{name}{_labels(**labels)} {value:.6g}" if isinstance(value, float)
+                       else f"{p}_{name}{_labels(**labels)} {value}")
+
+    solvers = status["solvers"]
+    metric("cells", "gauge", "Cells (solver x instance runs) planned in the campaign.",
+           [({"suite": suite, "solver": s}, v["cells"]) for s, v in solvers.items()])
+    metric("cells_done_total", "counter", "Cells finished, whatever the outcome.",
+           [({"suite": suite, "solver": s}, v["done"]) for s, v in solvers.items()])
+    metric("timeouts_total", "counter", "Runs that hit the time limit.",
+           [({"suite": suite, "solver": s}, v["timeouts"]) for s, v in solvers.items()])
+    metric("skipped_total", "counter", "Cells skipped (refuted or not selected).",
+           [({"suite": suite, "solver": s}, v["skipped"]) for s, v in solvers.items()])
+    metric("run_mean_seconds", "gauge", "Mean wall time of the solver's runs so far.",
+           [({"suite": suite, "solver": s}, float(v["mean_seconds"]))
+            for s, v in solvers.items() if v["mean_seconds"] is not None])
+    metric("cells_per_hour", "gauge", "Campaign throughput.",
+           [({"suite": suite}, float(status["cells_per_hour"]))])
+    if status["eta_seconds"] is not None:
+        metric("eta_seconds", "gauge", "Estimated seconds until every planned cell is done.",
+               [({"suite": suite}, float(status["eta_seconds"]))])
+    if status["current"]:
+        cur = status["current"]
+        metric("current_run_start_timestamp_seconds", "gauge",
+               "Start of the running cell; time() minus this is how long it has been running.",
+               [({"suite": suite, "solver": cur["solver"], "instance": cur["instance"]}, float(cur["started"]))])
+    metric("started_timestamp_seconds", "gauge", "Start of the campaign.",
+           [({"suite": suite}, float(status["started"]))])
+    metric("last_update_timestamp_seconds", "gauge", "Last progress event.",
+           [({"suite": suite}, float(status["updated"]))])
+    return "\n".join(out) + "\n"
+
+
+def _duration(seconds):
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def render(status, now=None, width=30):
+    """Compact terminal view of a status dict."""
+    now = now or time.time()
+    cells, done = status["cells"], status["done"]
+    frac = done / cells if cells else 0.0
+    bar = "#" * int(round(frac * width)) + "-" * (width - int(round(frac * width)))
+    eta = status["eta_seconds"]
+    if eta is not None:
+        # the ETA was computed at the last event
+        eta = max(0.0, eta - (now - status["updated"]))
+    lines = [f"{status['suite']} [{bar}] {frac:6.1%}  {done}/{cells} cells  "
+             f"timeouts {status['timeouts']}  skipped {status['skipped']}  "
+             f"{status['cells_per_hour']:.1f} cells/h  elapsed {_duration(now - status['started'])}  "
+             f"ETA {_duration(eta)}"]
+    for solver, s in status["solvers"].items():
+        mean = f"{s['mean_seconds']:.1f}s" if s["mean_seconds"] is not None else "-"
+        line = (f"  {solver:<12} {s['done']:>5}/{s['cells']:<5} timeouts {s['timeouts']:<4} "
+                f"skipped {s['skipped']:<4} mean {mean}")
+        cur = status["current"]
+        if cur and cur["solver"] == solver:
+            line += f"  running {cur['instance']} for {_duration(now - cur['started'])}"
+        lines.append(line)
+    if done < cells and now - status["updated"] > STALLED_AFTER:
+        # the runs time out long before this, so the runner is stuck or gone
+        lines.append(f"  no progress for {_duration(now - status['updated'])} (runner stopped?)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Show the live progress of running benchmark campaigns.")
+    ap.add_argument("status", nargs="*", default=[os.path.join(d, "results", "progress.json")
+                                                  for d in ("generated_graphs", "random_graphs", "real_graphs")],
+                    help="progress.json files written by the runners")
+    ap.add_argument("--watch", type=float, default=None, metavar="SECONDS", help="redraw every SECONDS")
+    args = ap.parse_args(argv)
+
+    while True:
+        views = []
+        for path in args.status:
+            try:
+                with open(path) as f:
+                    views.append(render(json.load(f)))
+            except (OSError, ValueError):
+                continue
+        if args.watch:
+            sys.stdout.write("\033[H\033[J")
+        print("\n\n".join(views) if views else "No progress files found.")
+        if not args.watch:
+            return 0
+        sys.stdout.flush()
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+
+from graph_tools.csr import edge_positions, induced_subgraph, read_graph, write_graph
+
+# Every vertex of an embedding keeps at least deg_P(u) >= min_degree(P)
+# neighbours inside the image, so the image always lies in the
+# min_degree(P)-core of the target.  For cycle patterns that is the 2-core.
+
+
+def k_core_mask(indptr, indices, k):
+    """Boolean mask of the vertices in the k-core of the graph.
+
+    Vertices of degree < k are peeled in rounds; each round only touches the
+    edges of the vertices removed in it.
+    """
+    n = len(indptr) - 1
+    deg = np.diff(indptr).astype(np.int64)
+    alive = np.ones(n, dtype=bool)
+    peel = np.flatnonzero(deg < k)
+    while len(peel):
+        alive[peel] = False
+        nbrs = indices[edge_positions(indptr, peel)]
+        nbrs = nbrs[alive[nbrs]]
+        deg -= np.bincount(nbrs, minlength=n)
+        touched = np.unique(nbrs)
+        peel = touched[deg[touched] < k]
+    return alive
+
+
+def core_numbers(indptr, indices):
+    """Core number of every vertex (vectorized batch peeling)."""
+    n = len(indptr) - 1
+    deg = np.diff(indptr).astype(np.int64)
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    remaining = n
+    k = 0
+    while remaining:
+        k = max(k, int(deg[alive].min()))
+        peel = np.flatnonzero(alive & (deg <= k))
+        while len(peel):
+            alive[peel] = False
+            core[peel] = k
+            remaining -= len(peel)
+            nbrs = indices[edge_positions(indptr, peel)]
+            nbrs = nbrs[alive[nbrs]]
+            deg -= np.bincount(nbrs, minlength=n)
+            touched = np.unique(nbrs)
+            peel = touched[deg[touched] <= k]
+    return core
+
+
+def pattern_min_degree(path, fmt):
+    indptr, _ = read_graph(path, fmt)
+    if len(indptr) == 1:
+        return 0
+    return int(np.diff(indptr).min())
+
+
+def prune_target(target_path, fmt, min_degree, map_path=None):
+    """Replace the target file by its ``min_degree``-core, relabelled 0..n'-1.
+
+    The original id of every remaining vertex is saved to ``map_path`` (.npy)
+    so solver mappings can be translated back.  Returns
+    (n_before, n_after, m_before, m_after); the file is left untouched when
+    nothing can be removed.
+    """
+    indptr, indices = read_graph(target_path, fmt)
+    n, m = len(indptr) - 1, len(indices) // 2
+    if min_degree <= 0:
+        return n, n, m, m
+
+    keep = k_core_mask(indptr, indices, min_degree)
+    if keep.all():
+        return n, n, m, m
+
+    sub_indptr, sub_indices, old_ids = induced_subgraph(indptr, indices, keep)
+    write_graph(target_path, sub_indptr, sub_indices, fmt)
+    if map_path:
+        os.makedirs(os.path.dirname(map_path), exist_ok=True)
+        np.save(map_path, old_ids)
+    return n, len(old_ids), m, len(sub_indices) // 2
@@ -0,0 +1,138 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching
+
+from graph_tools.csr import edge_sources, read_graph
+from graph_tools.triangles import triangle_counts
+
+# Necessary conditions for an induced embedding f: P -> T.  Each check is a
+# few array operations; the first one that fails proves the instance
+# infeasible and its description is returned as the reason.
+#
+#   counts      n_P <= n_T, m_P <= m_T and the same for non-edges
+#   degrees     deg_T(f(u)) >= deg_P(u) and, because non-edges are kept too,
+#               n_T - 1 - deg_T(f(u)) >= n_P - 1 - deg_P(u)
+#   triangles   tri_T(f(u)) >= tri_P(u)
+#   neighbours  the sorted neighbour degrees of u are dominated by those of f(u)
+#
+# The sequence checks compare sorted sequences; the per-vertex checks are
+# combined into a candidate matrix on which an injective assignment must
+# exist (maximum bipartite matching).
+
+
+def neighbour_degrees(indptr, indices, k):
+    """(n, k) matrix of the k largest neighbour degrees of every vertex, zero padded."""
+    n = len(indptr) - 1
+    deg = np.diff(indptr)
+    out = np.zeros((n, k), dtype=np.int64)
+    if k == 0 or len(indices) == 0:
+        return out
+    src = edge_sources(indptr)
+    nd = deg[indices]
+    order = np.lexsort((-nd, src))
+    rank = np.arange(len(order)) - indptr[src[order]]
+    keep = rank < k
+    out[src[order][keep], rank[keep]] = nd[order][keep]
+    return out
+
+
+class Signature:
+    """Everything the checks need to know about one graph."""
+
+    def __init__(self, indptr, indices, k=None):
+        self.n = len(indptr) - 1
+        self.m = len(indices) // 2
+        self.deg = np.diff(indptr)
+        if k is None:
+            # a pattern keeps all its neighbour degrees
+            k = int(self.deg.max()) if self.n else 0
+        self.k = k
+        self.tri = triangle_counts(indptr, indices)
+        self.nds = neighbour_degrees(indptr, indices, k)
+        self._deg_desc = None
+
+    @classmethod
+    def from_file(cls, path, fmt, k=None):
+        return cls(*read_graph(path, fmt), k)
+
+    @classmethod
+    def from_arrays(cls, n, m, deg, tri, nds, deg_desc=None):
+        """Signature from precomputed arrays (e.g. a memory-mapped target index)."""
+        sig = cls.__new__(cls)
+        sig.n, sig.m, sig.deg, sig.tri, sig.nds = n, m, deg, tri, nds
+        sig.k = nds.shape[1]
+        sig._deg_desc = deg_desc
+        return sig
+
+    def degrees_desc(self):
+        if self._deg_desc is None:
+            self._deg_desc = np.sort(self.deg)[::-1]
+        return self._deg_desc
+
+
+def _dominated(small, large_desc):
+    """True if sorted(small) can be matched element-wise under the descending ``large_desc``."""
+    a = np.sort(small)[::-1]
+    return bool(np.all(a <= large_desc[:len(a)]))
+
+
+def candidate_matrix(P, T, chunk=64):
+    """Boolean (n_P, n_T) matrix of target vertices each pattern vertex may use."""
+    t_codeg = T.n - 1 - T.deg
+    p_codeg = P.n - 1 - P.deg
+    rows = []
+    for lo in range(0, P.n, chunk):
+        hi = min(P.n, lo + chunk)
+        ok = (P.deg[lo:hi, None] <= T.deg[None, :])
+        ok &= (p_codeg[lo:hi, None] <= t_codeg[None, :])
+        ok &= (P.tri[lo:hi, None] <= T.tri[None, :])
+        ok &= np.all(P.nds[lo:hi, None, :] <= T.nds[None, :, :], axis=2)
+        rows.append(ok)
+    return np.vstack(rows) if rows else np.zeros((0, T.n), dtype=bool)
+
+
+def refute(P, T):
+    """Reason why P cannot be an induced subgraph of T, or None."""
+    if P.n > T.n:
+        return f"pattern has more vertices ({P.n} > {T.n})"
+    if P.m > T.m:
+        return f"pattern has more edges ({P.m} > {T.m})"
+    p_non = P.n * (P.n - 1) // 2 - P.m
+    t_non = T.n * (T.n - 1) // 2 - T.m
+    if p_non > t_non:
+        return f"pattern has more non-edges ({p_non} > {t_non})"
+    if not _dominated(P.deg, T.degrees_desc()):
+        return "degree sequence not dominated"
+    if not _dominated(P.n - 1 - P.deg, T.n - 1 - T.degrees_desc()[::-1]):
+        return "non-degree sequence not dominated"
+    if not _dominated(P.tri, np.sort(T.tri)[::-1]):
+        return "triangle counts not dominated"
+
+    cand = candidate_matrix(P, T)
+    empty = np.flatnonzero(~cand.any(axis=1))
+    if len(empty):
+        return f"no candidate for pattern vertex {int(empty[0])}"
+    match = maximum_bipartite_matching(csr_matrix(cand), perm_type="column")
+    matched = int((match >= 0).sum())
+    if matched < P.n:
+        return f"no injective assignment (matching {matched} < {P.n})"
+    return None
+
+
+def refute_files(pattern_path, target_path, fmt="lad"):
+    P = Signature.from_file(pattern_path, fmt)
+    return refute(P, Signature.from_file(target_path, fmt, P.k))
+
+
+def saved_solver_hours(refuted, previous_times, timeout):
+    """Solver time no longer needed for the refuted instances.
+
+    ``previous_times`` maps solver -> {instance: seconds or None (timed out)}
+    from earlier logs; instances without a record are counted at the timeout.
+    """
+    total = 0.0
+    for times in previous_times.values():
+        for name in refuted:
+            t = times.get(name)
+            total += timeout if t is None else t
+    return total / 3600.0
@@ -0,0 +1,154 @@
+import argparse
+import sys
+
+import numpy as np
+
+from graph_tools.analysis import CUTOFF
+
+# Performance regressions between two builds of the solvers.  Each run
+# records the solver executable's hash and version (graph_tools.builds,
+# the "build"/"version" dataset columns); this compares a baseline results
+# dataset with a candidate one, per (suite, family, solver), on the
+# instances both ran:
+#
+#   runtime   Wilcoxon signed-rank test, one-sided (candidate slower), on
+#             the paired wall times with timeouts censored at the cutoff;
+#             pairs that timed out in both carry no information and drop
+#             out as zero differences.  The effect is the median per-instance
+#             ratio candidate/baseline (times floored at RESOLUTION, the
+#             runners' 2 decimals).
+#   solved    exact McNemar test, one-sided, on the instances solved by
+#             only one of the two builds.
+#
+# p-values are Holm-corrected over all groups, separately for the two
+# tests.  A group is a regression when the runtime test is significant and
+# the slowdown exceeds --min-slowdown, or the solved test is significant.
+# main() exits 1 if there is any, so it can gate a nightly pipeline.
+
+RESOLUTION = 0.01
+RUN_STATUSES = ("solved", "timeout")
+
+
+def holm(pvalues):
+    """Holm-Bonferroni adjusted p-values, in the input order."""
+    p = np.asarray(pvalues, dtype=float)
+    order = np.argsort(p)
+    out = np.empty_like(p)
+    out[order] = np.minimum(np.maximum.accumulate((len(p) - np.arange(len(p))) * p[order]), 1.0)
+    return out
+
+
+def _cells(columns):
+    """{(suite, family, solver): {instance_hash: (solved, wall)}} of the runs in a dataset."""
+    cells = {}
+    for i in np.flatnonzero(np.isin(columns["status"], RUN_STATUSES)):
+        key = (columns["suite"][i], columns["family"][i], columns["solver"][i])
+        cells.setdefault(key, {})[columns["instance_hash"][i]] = (
+            columns["status"][i] == "solved", float(columns["wall"][i]))
+    return cells
+
+
+def _builds(columns, key):
+    """"hash version" of the builds behind a group ("?" for logs without a [Build] line)."""
+    if "build" not in columns:
+        return "?"
+    mask = ((columns["suite"] == key[0]) & (columns["family"] == key[1]) & (columns["solver"] == key[2]))
+    found = sorted({f"{b} {v}".strip() for b, v in zip(columns["build"][mask], columns["version"][mask])})
+    return ", ".join(b or "?" for b in found)
+
+
+def compare_runs(base, new, limit):
+    """Paired comparison of two {instance_hash: (solved, wall)} dicts (see module comment)."""
+    from scipy.stats import binomtest, wilcoxon
+
+    common = sorted(base.keys() & new.keys())
+    b_solved = np.array([base[h][0] for h in common], dtype=bool)
+    n_solved = np.array([new[h][0] for h in common], dtype=bool)
+    b_wall = np.array([base[h][1] if base[h][0] else limit for h in common])
+    n_wall = np.array([new[h][1] if new[h][0] else limit for h in common])
+    b_wall = np.maximum(np.minimum(b_wall, limit), RESOLUTION)
+    n_wall = np.maximum(np.minimum(n_wall, limit), RESOLUTION)
+
+    informative = b_solved | n_solved
+    ratio = float(np.exp(np.median(np.log(n_wall[informative] / b_wall[informative])))) if informative.any() else 1.0
+    diff = n_wall - b_wall
+    p_slower = float(wilcoxon(diff, alternative="greater").pvalue) if np.count_nonzero(diff) else 1.0
+    lost = int(np.count_nonzero(b_solved & ~n_solved))
+    gained = int(np.count_nonzero(n_solved & ~b_solved))
+    p_lost = float(binomtest(lost, lost + gained, 0.5, alternative="greater").pvalue) if lost else 1.0
+    return {
+        "pairs": len(common), "ratio": ratio, "p_slower": p_slower,
+        "base_solved": int(b_solved.sum()), "new_solved": int(n_solved.sum()),
+        "lost": lost, "gained": gained, "p_lost": p_lost,
+    }
+
+
+def compare(base, new, alpha=0.05, min_slowdown=0.05, cutoff=None):
+    """One result dict per (suite, family, solver) in both datasets, with the regression flags."""
+    base_cells, new_cells = _cells(base), _cells(new)
+    results = []
+    for key in sorted(base_cells.keys() & new_cells.keys()):
+        limit = cutoff or CUTOFF.get(key[0], 120.0)
+        r = compare_runs(base_cells[key], new_cells[key], limit)
+        if not r["pairs"]:
+            continue
+        r.update(suite=key[0], family=key[1], solver=key[2],
+                 base_build=_builds(base, key), new_build=_builds(new, key))
+        results.append(r)
+    if results:
+        for name in ("p_slower", "p_lost"):
+            for r, p in zip(results, holm([r[name] for r in results])):
+                r[name + "_adj"] = float(p)
+    for r in results:
+        r["slower"] = r["p_slower_adj"] < alpha and r["ratio"] > 1 + min_slowdown
+        r["fewer_solved"] = r["p_lost_adj"] < alpha
+        r["same_build"] = r["base_build"] == r["new_build"] and r["base_build"] != "?"
+    return results
+
+
+def print_comparison(results):
+    print("suite | family | solver | pairs | baseline build | candidate build | "
+          "median ratio | p(slower) | solved | p(fewer solved) | verdict")
+    for r in results:
+        verdict = []
+        if r["slower"]:
+            verdict.append("SLOWER")
+        if r["fewer_solved"]:
+            verdict.append("FEWER SOLVED")
+        if r["same_build"]:
+            verdict.append("same build")
+        print(f"{r['suite']} | {r['family']} | {r['solver']} | {r['pairs']} | {r['base_build']} | "
+              f"{r['new_build']} | {r['ratio']:.3f} | {r['p_slower_adj']:.3g} | "
+              f"{r['base_solved']}->{r['new_solved']} (-{r['lost']} +{r['gained']}) | "
+              f"{r['p_lost_adj']:.3g} | {', '.join(verdict) or 'ok'}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Compare two builds' results datasets; exits 1 on a significant regression.")
+    ap.add_argument("baseline", help="results dataset (file or summaries directory) of the old builds")
+    ap.add_argument("candidate", help="results dataset of the new builds")
+    ap.add_argument("--alpha", type=float, default=0.05, help="significance level after Holm correction")
+    ap.add_argument("--min-slowdown", type=float, default=0.05,
+                    help="smallest median slowdown reported as a regression (0.05 = 5%%)")
+    ap.add_argument("--cutoff", type=float, default=None, help="default: 60 s generated, 120 s random/real")
+    args = ap.parse_args(argv)
+
+    from graph_tools.dataset import load_dataset
+    base, new = load_dataset(args.baseline), load_dataset(args.candidate)
+    for path, columns in ((args.baseline, base), (args.candidate, new)):
+        if columns is None:
+            print(f"No results dataset in {path} (run results.py first).")
+            return 2
+    results = compare(base, new, args.alpha, args.min_slowdown, args.cutoff)
+    if not results:
+        print("No instances in common between the two datasets.")
+        return 2
+    print_comparison(results)
+    regressions = sum(r["slower"] or r["fewer_solved"] for r in results)
+    print(f"{regressions} regression(s) in {len(results)} group(s).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import argparse
+import math
+import subprocess
+import sys
+import time
+
+# Repeated measurement of one (solver, instance) cell.  The runners call
+# run_repeated() in place of a single subprocess.run(): after ``warmup``
+# discarded runs the command is run until the 95% confidence interval of the
+# median is within ``rel_ci`` of the median (at least MIN_REPEATS samples)
+# or ``repeats`` samples are taken.  With repeats=1 and no warm-up this is
+# exactly one run, as before.
+#
+# The interval is the large-sample one for the median with the spread
+# estimated robustly from the MAD: median +- z * 1.2533 * 1.4826 * MAD / sqrt(n)
+# (1.4826 * MAD estimates sigma, the median's standard error is
+# 1.2533 * sigma / sqrt(n) for normal noise).
+#
+# The runners log every sample ("[Run] Warm-up: ..." and "[Run] Samples: ...",
+# read back by graph_tools.runlog) and report the median as "Done in".
+# A timeout in any run ends the cell as a timeout.
+
+MIN_REPEATS = 3
+Z = {0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+
+def median(samples):
+    s = sorted(samples)
+    n = len(s)
+    return s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
+
+
+def summarize_samples(samples, confidence=0.95):
+    """(median, MAD, CI low, CI high); MAD and CI are NaN for a single sample."""
+    med = median(samples)
+    if len(samples) < 2:
+        return med, math.nan, math.nan, math.nan
+    mad = median([abs(x - med) for x in samples])
+    half = Z[confidence] * 1.2533 * 1.4826 * mad / math.sqrt(len(samples))
+    return med, mad, med - half, med + half
+
+
+def converged(samples, rel_ci, confidence=0.95):
+    if len(samples) < MIN_REPEATS:
+        return False
+    med, _, lo, hi = summarize_samples(samples, confidence)
+    return (hi - lo) / 2 <= rel_ci * med
+
+
+def run_repeated(cmd, cwd, timeout, repeats=1, warmup=0, rel_ci=0.05):
+    """Run the shell command ``cmd`` as a measured cell.
+
+    Returns (proc, samples, warmups, elapsed): ``proc`` is the last run's
+    CompletedProcess, or None when a run timed out after ``elapsed`` seconds;
+    otherwise ``elapsed`` is the median of ``samples``.
+    """
+    samples, warmups = [], []
+    proc = None
+    while len(samples) < max(1, repeats):
+        start = time.time()
+        try:
+            proc = subprocess.run(
+                cmd,
+                cwd=cwd,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return None, samples, warmups, time.time() - start
+        elapsed = time.time() - start
+        if len(warmups) < warmup:
+            warmups.append(elapsed)
+            continue
+        samples.append(elapsed)
+        if converged(samples, rel_ci):
+            break
+    return proc, samples, warmups, median(samples)
+
+
+def log_samples(samples, warmups, log):
+    """The runner log lines for a repeated cell (nothing for a single run)."""
+    if warmups:
+        log("[Run] Warm-up: " + " ".join(f"{t:.2f}" for t in warmups))
+    if len(samples) > 1 or warmups:
+        log("[Run] Samples: " + " ".join(f"{t:.2f}" for t in samples))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Median, MAD and 95% CI of every repeated cell in a results dataset.")
+    ap.add_argument("dataset", help="results dataset (file or summaries directory)")
+    ap.add_argument("--all", action="store_true", help="also list cells measured once")
+    args = ap.parse_args(argv)
+
+    from graph_tools.dataset import load_dataset
+    columns = load_dataset(args.dataset)
+    if columns is None:
+        print(f"No results dataset in {args.dataset} (run results.py first).")
+        return 1
+    print("suite | family | solver | instance | n | median(s) | MAD(s) | 95% CI")
+    for i in range(len(columns["solver"])):
+        n = int(columns["repeats"][i])
+        if n < 2 and not args.all:
+            continue
+        print(f"{columns['suite'][i]} | {columns['family'][i]} | {columns['solver'][i]} | "
+              f"{columns['instance'][i]} | {n} | {columns['wall'][i]:.3f} | {columns['wall_mad'][i]:.3f} | "
+              f"{columns['wall_ci_low'][i]:.3f}-{columns['wall_ci_high'][i]:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
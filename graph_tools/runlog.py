@@ -0,0 +1,237 @@
+import mmap
+import os
+import sys
+
+from graph_tools.solver_output import SAT_RE, solver_stats, solver_status
+
+# One streaming parser for the logs of all three runners:
+#
+#   [Build] Glasgow sha256=3f2a... version=...  once per log (graph_tools.builds)
+#   [Run] Glasgow grp=1 lvl=10                 generated_graphs/runner.py
+#   [Run] RI random graph=10_random_graph.gfu  random_graphs/runnerRandom.py
+#   [Run] VF3 real graph=Amazon0302_graph.grf  real_graphs/realGraphsRunner.py
+#   [Run] CMD: ...
+#   [Run] Warm-up: 19.80                       with warm-up runs
+#   [Run] Samples: 19.20 19.45 19.11           repeated measurements
+#   [Run] Done in 19.20s | [Run] TIMED OUT after 60s (elapsed=60.10s) | [Run] Skipped (...)
+#   ... solver output ...
+#   [Valgrind] ==13567==   total heap usage: 48,345 allocs, 48,345 frees, 1,798,050 bytes allocated
+#
+# The file is memory-mapped and the scanner jumps from one "\n[" to the
+# next, so solver output (a Glasgow "where =" line alone can be kilobytes)
+# is skipped by a single bytes search and never split or matched.  Only the
+# anchor lines are decoded.  Each record keeps the byte range of its block,
+# so callers that need the solver output can slice it from the file;
+# iter_records(..., stats=True) does that for the solver's search
+# statistics and SAT/UNSAT answer (graph_tools.solver_output).
+#
+# The in-repo engines stop at their own --timeout and print "status =
+# aborted", which the runner logs as "Done in"; such runs are records with
+# a timeout, not a time.
+
+PARSER_VERSION = 5
+
+RESULTS_SUFFIX = "_results.txt"
+
+# in-repo engines (run with their own --timeout)
+ENGINES = frozenset({"Cycles", "Trees", "Matcher", "ColourCoding"})
+ABORTED = b"\nstatus = aborted"
+
+
+class RunRecord:
+    """One [Run] block of a runner log."""
+
+    __slots__ = ("log", "solver", "family", "suite", "instance", "group", "level", "graph",
+                 "cmd", "time", "timeout", "skipped", "samples", "warmups", "alloc", "in_use",
+                 "answer", "stats", "build", "version", "start", "end")
+
+    def __init__(self, log, solver, family, suite, group=None, level=None, graph=None, start=0):
+        self.log = log
+        self.solver = solver
+        self.family = family
+        self.suite = suite
+        self.group = group
+        self.level = level
+        self.graph = graph
+        self.instance = f"{group}_{level}" if graph is None else graph.split(".")[0]
+        self.cmd = None
+        self.time = None      # wall seconds of a finished run
+        self.timeout = None   # elapsed seconds of a timed-out run
+        self.skipped = None
+        self.samples = []     # wall seconds of repeated runs (time is their median)
+        self.warmups = []
+        self.alloc = None     # bytes allocated (Valgrind total heap usage)
+        self.in_use = None    # bytes in use at exit
+        self.answer = None    # "sat" / "unsat" (with stats=True)
+        self.stats = {}       # solver search statistics (with stats=True)
+        self.build = ""       # solver executable hash and version ([Build] line)
+        self.version = ""
+        self.start = start
+        self.end = start
+
+    def solved(self):
+        return self.time is not None
+
+    def output(self):
+        """Raw bytes of the block (header to the next header)."""
+        with open(self.log, "rb") as f:
+            f.seek(self.start)
+            return f.read(self.end - self.start)
+
+    def __repr__(self):
+        return (f"RunRecord({self.solver} {self.suite}/{self.family} {self.instance}: "
+                f"time={self.time} timeout={self.timeout} alloc={self.alloc})")
+
+
+def log_family(path):
+    """Family part of "<solver>_<family>_results.txt", or None."""
+    name = os.path.basename(path)
+    if not name.endswith(RESULTS_SUFFIX) or "_" not in name[:-len(RESULTS_SUFFIX)]:
+        return None
+    return name[:-len(RESULTS_SUFFIX)].split("_", 1)[1]
+
+
+def _header(line, path, family, start):
+    """RunRecord for a "[Run] <solver> ..." header line, None for other [Run] lines."""
+    tokens = line[6:].split()
+    if len(tokens) == 3 and tokens[1].startswith(b"grp=") and tokens[2].startswith(b"lvl="):
+        return RunRecord(path, tokens[0].decode(), family, "generated",
+                         group=tokens[1][4:].decode(), level=tokens[2][4:].decode(), start=start)
+    if len(tokens) == 3 and tokens[1] in (b"real", b"random") and tokens[2].startswith(b"graph="):
+        return RunRecord(path, tokens[0].decode(), family, tokens[1].decode(),
+                         graph=tokens[2][6:].decode(), start=start)
+    return None
+
+
+def _bytes_count(line, marker):
+    """Integer with thousands separators right before ``marker`` (e.g. b" bytes allocated")."""
+    end = line.find(marker)
+    if end < 0:
+        return None
+    begin = line.rfind(b" ", 0, end) + 1
+    return int(line[begin:end].replace(b",", b""))
+
+
+def _build(line):
+    """(hash, version) of a "[Build] <solver> sha256=<hash> version=<text>" line."""
+    text = line[8:].decode(errors="replace")
+    at = text.find(" version=")
+    version = text[at + 9:].strip() if at >= 0 else ""
+    digest = text[:at if at >= 0 else len(text)].partition(" sha256=")[2].strip()
+    return ("" if digest == "-" else digest), version
+
+
+def _finish(rec, mm, end, stats):
+    rec.end = end
+    if rec.time is not None and rec.solver in ENGINES and mm.find(ABORTED, rec.start, end) >= 0:
+        rec.timeout, rec.time = rec.time, None
+    if stats and rec.time is not None:
+        _read_output(rec, mm)
+
+
+def _read_output(rec, mm):
+    if rec.solver in SAT_RE:
+        output = mm[rec.start:rec.end].decode(errors="replace")
+        rec.answer = solver_status(rec.solver, output)
+        rec.stats = solver_stats(rec.solver, output)
+
+
+def iter_records(path, stats=False):
+    """Yield a RunRecord per [Run] block of the log at ``path``.
+
+    With ``stats`` the solver output of every finished run is read as well.
+    """
+    family = log_family(path)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            rec = None
+            build = version = ""
+            if mm[:1] == b"[":
+                pos = 0
+            else:
+                nxt = mm.find(b"\n[")
+                pos = nxt + 1 if nxt >= 0 else -1
+            while pos >= 0:
+                eol = mm.find(b"\n", pos)
+                if eol < 0:
+                    eol = size
+                line = mm[pos:eol].rstrip(b"\r")
+                if line.startswith(b"[Run] "):
+                    if line.startswith(b"[Run] Done in "):
+                        if rec:
+                            rec.time = float(line[14:].rstrip(b"s"))
+                    elif line.startswith(b"[Run] TIMED OUT"):
+                        if rec:
+                            at = line.find(b"elapsed=")
+                            rec.timeout = float(line[at + 8:].rstrip(b")s")) if at >= 0 else 0.0
+                    elif line.startswith(b"[Run] CMD: "):
+                        if rec and rec.cmd is None:
+                            rec.cmd = line[11:].decode(errors="replace")
+                    elif line.startswith(b"[Run] Samples: "):
+                        if rec:
+                            rec.samples = [float(t) for t in line[15:].split()]
+                    elif line.startswith(b"[Run] Warm-up: "):
+                        if rec:
+                            rec.warmups = [float(t) for t in line[15:].split()]
+                    elif line.startswith(b"[Run] Skipped ("):
+                        if rec:
+                            rec.skipped = line[15:].rstrip(b")").decode(errors="replace")
+                    else:
+                        new = _header(line, path, family, pos)
+                        if new:
+                            if rec:
+                                _finish(rec, mm, pos, stats)
+                                yield rec
+                            rec = new
+                            rec.build, rec.version = build, version
+                elif line.startswith(b"[Build] "):
+                    build, version = _build(line)
+                elif line.startswith(b"[Valgrind] ") and rec:
+                    if b"total heap usage:" in line:
+                        rec.alloc = _bytes_count(line, b" bytes allocated")
+                    elif b"in use at exit:" in line:
+                        rec.in_use = _bytes_count(line, b" bytes in ")
+                nxt = mm.find(b"\n[", eol)
+                pos = nxt + 1 if nxt >= 0 else -1
+            if rec:
+                _finish(rec, mm, size, stats)
+                yield rec
+
+
+def iter_results_logs(roots):
+    """Every "*_results.txt" under ``roots`` (files or directories), sorted."""
+    for root in roots:
+        if os.path.isfile(root):
+            yield root
+            continue
+        for dirpath, dirnames, files in os.walk(root):
+            dirnames.sort()
+            for name in sorted(files):
+                if name.endswith(RESULTS_SUFFIX):
+                    yield os.path.join(dirpath, name)
+
+
+def iter_tree(roots, stats=False):
+    """RunRecords of every results log under ``roots``, in one pass."""
+    for path in iter_results_logs(roots):
+        yield from iter_records(path, stats)
+
+
+def main(argv=None):
+    roots = (argv if argv is not None else sys.argv[1:]) or ["."]
+    counts = {}
+    for rec in iter_tree(roots):
+        key = (rec.suite, rec.solver, rec.family)
+        solved, timeouts, total = counts.get(key, (0, 0, 0))
+        counts[key] = (solved + rec.solved(), timeouts + (rec.timeout is not None), total + 1)
+    print("suite | solver | family | runs | solved | timeouts")
+    for (suite, solver, family), (solved, timeouts, total) in sorted(counts.items()):
+        print(f"{suite} | {solver} | {family} | {total} | {solved} | {timeouts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
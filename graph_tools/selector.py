@@ -0,0 +1,302 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+import numpy as np
+from scipy.stats import norm
+
+from graph_tools.features import FEATURE_NAMES, instance_features
+
+# Per-instance algorithm selection.  For every solver a ridge regression
+# predicts log10(runtime) from pattern and target features.  Timed-out runs
+# are right-censored at the cutoff and handled with the Schmee & Hahn
+# iteration: censored targets are replaced by the mean of the fitted normal
+# truncated at the cutoff, and the model is refitted until it settles.  The
+# selector picks the solver with the lowest expected PAR10 score under the
+# fitted log-normal runtime distributions.
+
+SOLVERS = ["Glasgow", "LAD", "SICS", "RI", "VF3"]
+
+GENERATED_DIRS = {"er": "er_lad", "tree": "tree_lad", "scale_free": "scalefree_lad"}
+REAL_PATTERNS = {
+    "triangle":      "real_graphs/generating_instances/triangle/triangleLAD",
+    "quatrilateral": "real_graphs/generating_instances/quadrilateral/quadrilateralLAD",
+    "pentagon":      "real_graphs/generating_instances/pentagon/pentagonLAD",
+}
+CUTOFFS = {"generated": 60.0, "real": 120.0, "random": 120.0}
+
+SUMMARY_ROW_RE = re.compile(r"^\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|")
+
+
+def _time(value):
+    return None if value == "NaN" else float(value)
+
+
+# Loading runtimes from the summaries
+#
+# Each record: (instance key, solver, seconds or None, cutoff, pattern, target)
+# with pattern/target pointing at LAD files.  The synthetic generators drew a
+# new graph per format, so for those families the LAD files of the same
+# family/group/level stand in for the RI and VF3 instances (VF3 groups are
+# numbered from 0, the others from 1).
+
+def load_generated(summary_dir, instance_dir="generated_graphs/instances"):
+    records = []
+    for solver in SOLVERS:
+        path = os.path.join(summary_dir, f"{solver}_summary.txt")
+        if not os.path.exists(path):
+            continue
+        family = None
+        with open(path) as f:
+            for line in f:
+                if line.startswith("-- test family:"):
+                    family = line[len("-- test family:"):].strip(" -\n")
+                    continue
+                cells = [c.strip() for c in line.split("|")]
+                if family not in GENERATED_DIRS or len(cells) != 7 or not cells[0].isdigit():
+                    continue
+                grp = int(cells[0]) + (1 if solver == "VF3" else 0)
+                d = os.path.join(instance_dir, GENERATED_DIRS[family])
+                for lvl, value in zip((10, 20, 60), cells[1:4]):
+                    records.append(((family, grp, lvl), solver, _time(value), CUTOFFS["generated"],
+                                    os.path.join(d, f"{grp}_subgraph_{lvl}"),
+                                    os.path.join(d, f"{grp}_original_graph")))
+    return records
+
+
+def _load_flat(path):
+    rows = []
+    with open(path) as f:
+        for line in f:
+            m = SUMMARY_ROW_RE.match(line)
+            if m and m.group(1) != "graph":
+                rows.append((m.group(1).split(".")[0], _time(m.group(2))))
+    return rows
+
+
+def load_real(summary_dir, target_dir):
+    records = []
+    for fn in sorted(os.listdir(summary_dir)):
+        m = re.match(r"^(.+?)_(triangle|quatrilateral|pentagon)_summary\.txt$", fn)
+        if not m or m.group(1) not in SOLVERS:
+            continue
+        solver, pattern = m.groups()
+        for stem, t in _load_flat(os.path.join(summary_dir, fn)):
+            records.append(((pattern, stem), solver, t, CUTOFFS["real"],
+                            REAL_PATTERNS[pattern], os.path.join(target_dir, stem + ".lad")))
+    return records
+
+
+def load_random(summary_dir, instance_dir="random_graphs/instances"):
+    records = []
+    for fn in sorted(os.listdir(summary_dir)):
+        m = re.match(r"^(.+?)_(\d+)-(\d+)_random_summary\.txt$", fn)
+        if not m or m.group(1) not in SOLVERS:
+            continue
+        solver, n1, n2 = m.groups()
+        d = os.path.join(instance_dir, f"{n1}-{n2}", "LAD")
+        for stem, t in _load_flat(os.path.join(summary_dir, fn)):
+            records.append(((f"{n1}-{n2}", stem), solver, t, CUTOFFS["random"],
+                            os.path.join(d, f"subgraph{n2}.lad"), os.path.join(d, stem + ".lad")))
+    return records
+
+
+# Features of a (pattern, target) pair
+
+def _squash(x):
+    return np.sign(x) * np.log1p(np.abs(x))
+
+
+def pair_features(pattern_path, target_path):
+    p = instance_features(pattern_path)
+    t = instance_features(target_path)
+    pv = np.array([p[k] for k in FEATURE_NAMES], dtype=np.float64)
+    tv = np.array([t[k] for k in FEATURE_NAMES], dtype=np.float64)
+    ratios = np.array([p["n"] / max(t["n"], 1), p["m"] / max(t["m"], 1),
+                       p["max_degree"] / max(t["max_degree"], 1)])
+    return np.concatenate([_squash(pv), _squash(tv), ratios])
+
+
+# Model
+
+def fit_censored(X, y, censored, cutoff, ridge=1.0, iters=20):
+    """Ridge regression of y on X, treating y[censored] as lower bounds."""
+    A = np.hstack([X, np.ones((len(X), 1))])
+    reg = ridge * np.eye(A.shape[1])
+    reg[-1, -1] = 0.0
+    y_fit = y.copy()
+    w = np.zeros(A.shape[1])
+    sigma = 1.0
+    for _ in range(iters):
+        w = np.linalg.solve(A.T @ A + reg, A.T @ y_fit)
+        mu = A @ w
+        sigma = max(float(np.std(y_fit - mu)), 1e-3)
+        if not censored.any():
+            break
+        a = (cutoff[censored] - mu[censored]) / sigma
+        tail = norm.pdf(a) / np.clip(norm.sf(a), 1e-12, None)
+        new = np.maximum(mu[censored] + sigma * tail, cutoff[censored])
+        if np.allclose(new, y_fit[censored], atol=1e-4):
+            break
+        y_fit[censored] = new
+    return w, sigma
+
+
+class Selector:
+
+    def __init__(self, mean, std, weights, sigma):
+        self.mean = np.asarray(mean)
+        self.std = np.asarray(std)
+        self.weights = {s: np.asarray(w) for s, w in weights.items()}
+        self.sigma = dict(sigma)
+
+    def predict(self, x):
+        """Predicted log10 runtime per solver for feature rows ``x``."""
+        z = (np.atleast_2d(x) - self.mean) / self.std
+        z = np.hstack([z, np.ones((len(z), 1))])
+        return {s: z @ w for s, w in self.weights.items()}
+
+    def expected_par10(self, x, cutoff):
+        """Expected PAR10 score per solver under the fitted log-normal models."""
+        out = {}
+        c = np.log10(cutoff)
+        for s, mu in self.predict(x).items():
+            sd = self.sigma[s]
+            p_solve = norm.cdf((c - mu) / sd)
+            # E[t; t < cutoff] of a log-normal runtime, capped at the cutoff
+            ln10 = np.log(10)
+            body = (np.exp(ln10 * mu + (ln10 * sd) ** 2 / 2)
+                    * norm.cdf((c - mu) / sd - ln10 * sd))
+            out[s] = body + (1 - p_solve) * 10 * cutoff
+        return out
+
+    def choose(self, pattern_path, target_path, cutoff=CUTOFFS["random"]):
+        score = self.expected_par10(pair_features(pattern_path, target_path), cutoff)
+        return min(score, key=lambda s: score[s][0])
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"mean": self.mean.tolist(), "std": self.std.tolist(),
+                       "weights": {s: w.tolist() for s, w in self.weights.items()},
+                       "sigma": self.sigma}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            d = json.load(f)
+        return cls(d["mean"], d["std"], d["weights"], d["sigma"])
+
+
+def build_dataset(records):
+    """Instance keys, feature matrix, runtime matrix (NaN = no run) and cutoffs."""
+    by_key = {}
+    for key, solver, t, cutoff, pattern, target in records:
+        if not (os.path.exists(pattern) and os.path.exists(target)):
+            continue
+        entry = by_key.setdefault(key, {"pattern": pattern, "target": target,
+                                        "cutoff": cutoff, "times": {}})
+        entry["times"][solver] = cutoff if t is None or t > cutoff else t
+        entry.setdefault("timeouts", set())
+        if t is None or t > cutoff:
+            entry["timeouts"].add(solver)
+
+    keys = sorted(by_key, key=str)
+    X = np.array([pair_features(by_key[k]["pattern"], by_key[k]["target"]) for k in keys])
+    T = np.full((len(keys), len(SOLVERS)), np.nan)
+    censored = np.zeros_like(T, dtype=bool)
+    cutoff = np.array([by_key[k]["cutoff"] for k in keys])
+    for i, k in enumerate(keys):
+        for j, s in enumerate(SOLVERS):
+            if s in by_key[k]["times"]:
+                T[i, j] = by_key[k]["times"][s]
+                censored[i, j] = s in by_key[k]["timeouts"]
+    return keys, X, T, censored, cutoff
+
+
+def train(X, T, censored, cutoff, ridge=1.0):
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = (X - mean) / std
+    weights, sigma = {}, {}
+    for j, s in enumerate(SOLVERS):
+        rows = ~np.isnan(T[:, j])
+        if rows.sum() < 2:
+            continue
+        y = np.log10(np.maximum(T[rows, j], 1e-3))
+        weights[s], sigma[s] = fit_censored(Z[rows], y, censored[rows, j],
+                                     np.log10(cutoff[rows]), ridge)
+    return Selector(mean, std, weights, sigma)
+
+
+def par10(times, solved, cutoff):
+    return np.where(solved, times, 10 * cutoff)
+
+
+def evaluate(selector, X, T, censored, cutoff, train_rows):
+    """(solved, PAR10) on the held-out rows for the selector, the single best
+    solver on the training rows and the virtual best solver."""
+    solved = ~np.isnan(T) & ~censored
+    scores = par10(T, solved, cutoff[:, None])
+    scores[np.isnan(T)] = np.inf
+    sbs = int(np.argmin(np.nan_to_num(scores[train_rows], posinf=1e12).sum(axis=0)))
+
+    test = ~train_rows
+    pred = selector.expected_par10(X[test], cutoff[test])
+    pred = np.column_stack([pred.get(s, np.full(test.sum(), np.inf)) for s in SOLVERS])
+    pred[np.isnan(T[test])] = np.inf
+    rows = np.arange(test.sum())
+
+    result = {}
+    for name, col in [("selector", np.argmin(pred, axis=1)),
+                      (f"single best ({SOLVERS[sbs]})", np.full(test.sum(), sbs)),
+                      ("virtual best", np.argmin(scores[test], axis=1))]:
+        s = scores[test][rows, col]
+        s[np.isinf(s)] = 10 * cutoff[test][np.isinf(s)]
+        result[name] = (int(solved[test][rows, col].sum()), float(s.mean()))
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Train or apply the per-instance solver selector.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("train")
+    t.add_argument("--out", default="selector.json")
+    t.add_argument("--real-targets", default=None, help="directory with the LAD real graphs")
+    t.add_argument("--test-fraction", type=float, default=0.3)
+    t.add_argument("--seed", type=int, default=0)
+    t.add_argument("--ridge", type=float, default=1.0)
+    p = sub.add_parser("predict")
+    p.add_argument("pattern")
+    p.add_argument("target")
+    p.add_argument("--model", default="selector.json")
+    p.add_argument("--cutoff", type=float, default=CUTOFFS["random"])
+    args = ap.parse_args(argv)
+
+    if args.cmd == "predict":
+        print(Selector.load(args.model).choose(args.pattern, args.target, args.cutoff))
+        return 0
+
+    records = load_generated("generated_graphs/summaries") + load_random("random_graphs/summaries")
+    if args.real_targets:
+        records += load_real("real_graphs/summaries", args.real_targets)
+    keys, X, T, censored, cutoff = build_dataset(records)
+    rng = np.random.default_rng(args.seed)
+    train_rows = rng.random(len(keys)) >= args.test_fraction
+
+    selector = train(X[train_rows], T[train_rows], censored[train_rows], cutoff[train_rows], args.ridge)
+    selector.save(args.out)
+    print(f"Trained on {train_rows.sum()} instances, held out {(~train_rows).sum()} → {args.out}")
+    result = evaluate(selector, X, T, censored, cutoff, train_rows)
+    for name, (solved, score) in result.items():
+        print(f"  {name:24s} solved {solved:4d}  PAR10 {score:8.2f}")
+    sel, sbs, vbs = (score for _, score in result.values())
+    if sbs > vbs:
+        print(f"  gap to virtual best: {sel - vbs:.2f} s, {(sbs - sel) / (sbs - vbs):.0%} of the SBS-VBS gap closed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
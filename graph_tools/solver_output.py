@@ -0,0 +1,121 @@
+import re
+
+# What each solver prints when it finds (or refutes) an induced embedding:
+#   Glasgow  status = true / status = false, mapping = (0 -> 3) (1 -> 7) ...
+#   LAD      Run completed: 1 solutions; ...
+#   SICS     Found an induced isomorphism. / No induced isomorphism found.
+#   RI       {(0,12)(1,5)...} and number of found matches: 1
+#   VF3      "<solutions> <first time> <total time>"
+#
+# The in-repo engines print Glasgow's format.
+
+SAT_RE = {
+    "Glasgow": re.compile(r"^status = true$", re.M),
+    "LAD":     re.compile(r"Run completed: [1-9][0-9]* solutions"),
+    "SICS":    re.compile(r"^Found an induced isomorphism", re.M),
+    "RI":      re.compile(r"number of found matches: [1-9]"),
+    "VF3":     re.compile(r"^[1-9][0-9]* [0-9.e+-]+ [0-9.e+-]+$", re.M),
+}
+SAT_RE["Cycles"] = SAT_RE["Trees"] = SAT_RE["Matcher"] = SAT_RE["ColourCoding"] = SAT_RE["Glasgow"]
+
+UNSAT_RE = {
+    "Glasgow": re.compile(r"^status = false$", re.M),
+    "LAD":     re.compile(r"Run completed: 0 solutions"),
+    "SICS":    re.compile(r"^No induced isomorphism found", re.M),
+    "RI":      re.compile(r"number of found matches: 0"),
+    "VF3":     re.compile(r"^0 [0-9.e+-]+ [0-9.e+-]+$", re.M),
+}
+UNSAT_RE["Cycles"] = UNSAT_RE["Trees"] = UNSAT_RE["Matcher"] = UNSAT_RE["ColourCoding"] = UNSAT_RE["Glasgow"]
+
+GLASGOW_STYLE = ("Glasgow", "Cycles", "Trees", "Matcher", "ColourCoding")
+
+# Search statistics, as (column, pattern, scale to the column's unit).
+# "nodes" is each solver's own count of search-tree nodes (RI: search space
+# size); "search_time" is the solver's own time in seconds, which unlike
+# the runner's wall time excludes start-up and Valgrind overhead.
+# "runtime" is the total time the solver reports for the whole run
+# (Glasgow: runtime, RI: total time, SICS and VF3: their only time); the
+# generated summaries report it.  pathLAD prints none.
+STATS_RE = {
+    "Glasgow": [
+        ("nodes",        re.compile(r"^nodes = (\d+)$", re.M), 1),
+        ("propagations", re.compile(r"^propagations = (\d+)$", re.M), 1),
+        ("restarts",     re.compile(r"^restarts = (\d+)$", re.M), 1),
+        ("nogoods_size", re.compile(r"^nogoods_size = (\d+)$", re.M), 1),
+        ("search_time",  re.compile(r"^search_time = ([0-9.]+)", re.M), 1e-3),
+        ("runtime",      re.compile(r"^runtime = ([0-9.]+)", re.M), 1e-3),
+    ],
+    "LAD": [
+        ("solutions",    re.compile(r"Run completed: (\d+) solutions"), 1),
+        ("fail_nodes",   re.compile(r"solutions; (\d+) fail nodes"), 1),
+        ("nodes",        re.compile(r"fail nodes; (\d+) nodes"), 1),
+        ("search_time",  re.compile(r" nodes; ([0-9.]+) seconds"), 1),
+    ],
+    "SICS": [
+        ("solutions",    re.compile(r"^Number of induced isomorphisms: (\d+)", re.M), 1),
+        ("search_time",  re.compile(r"^Time to find first induced isomorphism: ([0-9.]+) ms", re.M), 1e-3),
+        ("runtime",      re.compile(r"^Time to find first induced isomorphism: ([0-9.]+) ms", re.M), 1e-3),
+    ],
+    "RI": [
+        ("nodes",        re.compile(r"^search space size: (\d+)", re.M), 1),
+        ("solutions",    re.compile(r"^number of found matches: (\d+)", re.M), 1),
+        ("search_time",  re.compile(r"^matching time: ([0-9.e+-]+)", re.M), 1),
+        ("runtime",      re.compile(r"^total time: ([0-9.e+-]+)", re.M), 1),
+    ],
+    "VF3": [
+        ("solutions",    re.compile(r"^(\d+) [0-9.e+-]+ [0-9.e+-]+$", re.M), 1),
+        ("search_time",  re.compile(r"^\d+ [0-9.e+-]+ ([0-9.e+-]+)$", re.M), 1),
+        ("runtime",      re.compile(r"^\d+ [0-9.e+-]+ ([0-9.e+-]+)$", re.M), 1),
+    ],
+}
+for _name in GLASGOW_STYLE[1:]:
+    STATS_RE[_name] = STATS_RE["Glasgow"]
+
+STAT_COLUMNS = ["nodes", "propagations", "restarts", "nogoods_size", "fail_nodes", "solutions", "search_time", "runtime"]
+
+GLASGOW_MAPPING_RE = re.compile(r"^mapping = (.*)$", re.M)
+GLASGOW_PAIR_RE    = re.compile(r"\((\d+) -> (\d+)\)")
+RI_MAPPING_RE      = re.compile(r"^\{((?:\(\d+,\d+\))*)\}$", re.M)
+RI_PAIR_RE         = re.compile(r"\((\d+),(\d+)\)")
+
+
+def solver_status(solver_name, output):
+    """'sat', 'unsat' or None when the output says neither."""
+    if SAT_RE[solver_name].search(output):
+        return "sat"
+    if UNSAT_RE[solver_name].search(output):
+        return "unsat"
+    return None
+
+
+def solver_stats(solver_name, output):
+    """{column: value} of the search statistics the solver printed."""
+    stats = {}
+    for column, pattern, scale in STATS_RE.get(solver_name, ()):
+        m = pattern.search(output)
+        if m:
+            stats[column] = float(m.group(1)) * scale
+    return stats
+
+
+def parse_mapping(solver_name, output):
+    """Pattern -> target mapping printed by the solver, or None.
+
+    Only Glasgow, RI and the in-repo engines print the embedding in the
+    configurations we run.
+    """
+    if solver_name in GLASGOW_STYLE:
+        m = GLASGOW_MAPPING_RE.search(output)
+        pairs = GLASGOW_PAIR_RE.findall(m.group(1)) if m else []
+    elif solver_name == "RI":
+        m = RI_MAPPING_RE.search(output)
+        pairs = RI_PAIR_RE.findall(m.group(1)) if m else []
+    else:
+        return None
+    if not pairs:
+        return None
+    return {int(p): int(t) for p, t in pairs}
+
+
+def format_mapping(mapping):
+    return " ".join(f"({p} -> {t})" for p, t in sorted(mapping.items()))
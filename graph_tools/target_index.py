@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+
+from graph_tools.csr import read_graph
+from graph_tools.features import guess_format, iter_instance_files
+from graph_tools.pruning import core_numbers
+from graph_tools.refute import Signature, neighbour_degrees
+from graph_tools.triangles import triangle_counts
+
+# Persistent per-target index, stored as <graph>.idx/ next to the converted
+# graph: the CSR arrays, the vertices in descending degree order, core
+# numbers, per-vertex triangle counts and the NDS_COLUMNS largest neighbour
+# degrees of every vertex.  The arrays are .npy files opened with
+# mmap_mode="r", so a query against an indexed target neither parses the
+# graph text nor recomputes anything.  An index whose recorded source size
+# or mtime no longer matches the graph file is rebuilt.
+
+INDEX_VERSION = 1
+NDS_COLUMNS = 16
+
+ARRAYS = ["indptr", "indices", "order", "deg", "core", "tri", "nds"]
+
+
+def index_dir(graph_path):
+    return graph_path + ".idx"
+
+
+def _source_stamp(graph_path):
+    st = os.stat(graph_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class TargetIndex:
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, name + ".npy"), mmap_mode="r"))
+        self.n = self.meta["n"]
+        self.m = self.meta["m"]
+
+    def signature(self, k):
+        """Refuter signature keeping the k largest neighbour degrees."""
+        nds = self.nds[:, :k] if k <= self.nds.shape[1] else neighbour_degrees(self.indptr, self.indices, k)
+        return Signature.from_arrays(self.n, self.m, self.deg, self.tri, nds, self.deg[self.order])
+
+
+def build_index(graph_path, fmt=None, nds_columns=NDS_COLUMNS):
+    fmt = fmt or guess_format(graph_path)
+    indptr, indices = read_graph(graph_path, fmt)
+    deg = np.diff(indptr).astype(np.int32)
+    k = min(nds_columns, int(deg.max()) if len(deg) else 0)
+    arrays = {
+        "indptr": indptr,
+        "indices": indices,
+        "order": np.argsort(-deg, kind="stable").astype(np.int32),
+        "deg": deg,
+        "core": core_numbers(indptr, indices).astype(np.int32),
+        "tri": triangle_counts(indptr, indices),
+        "nds": neighbour_degrees(indptr, indices, k).astype(np.int32),
+    }
+    meta = {"version": INDEX_VERSION, "format": fmt, "n": len(deg), "m": len(indices) // 2,
+            "nds_columns": k, **_source_stamp(graph_path)}
+
+    final = index_dir(graph_path)
+    tmp = final + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, a in arrays.items():
+        np.save(os.path.join(tmp, name + ".npy"), a)
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    shutil.rmtree(final, ignore_errors=True)
+    os.replace(tmp, final)
+    return TargetIndex(final)
+
+
+def load_index(graph_path, fmt=None, build=True):
+    """The index of ``graph_path``; (re)built if missing or stale and ``build``, else None."""
+    path = index_dir(graph_path)
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stamp = _source_stamp(graph_path)
+        if (meta.get("version") == INDEX_VERSION and meta["size"] == stamp["size"]
+                and meta["mtime_ns"] == stamp["mtime_ns"]):
+            return TargetIndex(path)
+    return build_index(graph_path, fmt) if build else None
+
+
+def target_signature(graph_path, fmt, k):
+    """Refuter signature of a target, from its index when there is one."""
+    index = load_index(graph_path, fmt, build=False)
+    return index.signature(k) if index else Signature.from_file(graph_path, fmt, k)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build persistent target indexes next to graph files.")
+    ap.add_argument("roots", nargs="+", help="graph files or directories")
+    ap.add_argument("--format", default=None, choices=["lad", "ri", "vf3"],
+                    help="default: guessed from the file name")
+    ap.add_argument("--nds", type=int, default=NDS_COLUMNS, help="neighbour degrees kept per vertex")
+    ap.add_argument("--force", action="store_true", help="rebuild up-to-date indexes too")
+    args = ap.parse_args(argv)
+
+    built = 0
+    for path in iter_instance_files(args.roots):
+        if not args.force and load_index(path, args.format, build=False):
+            continue
+        index = build_index(path, args.format, args.nds)
+        print(f"[Index] {path}: {index.n} vertices, {index.m} edges")
+        built += 1
+    print(f"Built {built} indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from graph_tools.dataset import load_dataset
+
+# Search throughput (nodes per second) per suite, family and solver, from
+# the results dataset.  Node counts do not depend on the machine, so
+# nodes / search_time compares how much work each solver gets through per
+# second independently of which machine ran it.  The solver's own
+# search_time is used where it prints one, the runner's wall time
+# otherwise.  Only solvers that report nodes (Glasgow and the in-repo
+# engines, PathLAD, RI) appear.
+
+
+def nodes_per_second(columns):
+    """(mask of usable runs, nodes per second for those runs)."""
+    time = np.where(np.isfinite(columns["search_time"]) & (columns["search_time"] > 0),
+                    columns["search_time"], columns["wall"])
+    ok = (columns["status"] == "solved") & (columns["nodes"] > 0) & (time > 0)
+    return ok, columns["nodes"][ok] / time[ok]
+
+
+def throughput_table(columns):
+    """Rows (suite, family, solver, runs, median, q1, q3) of nodes per second."""
+    ok, nps = nodes_per_second(columns)
+    keys = np.char.add(np.char.add(np.char.add(columns["suite"][ok], "|"),
+                                   np.char.add(columns["family"][ok], "|")), columns["solver"][ok])
+    groups, inverse = np.unique(keys, return_inverse=True)
+    order = np.lexsort((nps, inverse))
+    bounds = np.searchsorted(inverse[order], np.arange(len(groups) + 1))
+    rows = []
+    for g, key in enumerate(groups):
+        vals = nps[order[bounds[g]:bounds[g + 1]]]
+        q1, med, q3 = np.percentile(vals, [25, 50, 75])
+        rows.append((*key.split("|"), len(vals), med, q1, q3))
+    return rows
+
+
+def plot_throughput(columns, out_dir):
+    """One figure per suite: nodes/s per solver, one panel per family (log scale)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ok, nps = nodes_per_second(columns)
+    suite, family, solver = (columns[c][ok] for c in ("suite", "family", "solver"))
+    paths = []
+    for s in np.unique(suite):
+        families = np.unique(family[suite == s])
+        fig, axes = plt.subplots(1, len(families), figsize=(4 * len(families), 4), squeeze=False)
+        for ax, fam in zip(axes[0], families):
+            sel = (suite == s) & (family == fam)
+            solvers = np.unique(solver[sel])
+            ax.boxplot([nps[sel & (solver == name)] for name in solvers])
+            ax.set_xticks(range(1, len(solvers) + 1), list(solvers))
+            ax.set_yscale("log")
+            ax.set_title(fam)
+            ax.set_ylabel("vozlišča / s")
+            ax.grid(axis="y")
+        fig.tight_layout()
+        path = os.path.join(out_dir, f"throughput_{s}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Nodes-per-second throughput per solver and family.")
+    ap.add_argument("dataset", help="results dataset (file or summaries directory)")
+    ap.add_argument("--out", default="plots")
+    args = ap.parse_args(argv)
+
+    columns = load_dataset(args.dataset)
+    if columns is None:
+        print(f"No results dataset in {args.dataset} (run results.py first).")
+        return 1
+    print("suite | family | solver | runs | median nodes/s | q1 | q3")
+    for suite, family, solver, runs, med, q1, q3 in throughput_table(columns):
+        print(f"{suite} | {family} | {solver} | {runs} | {med:.4g} | {q1:.4g} | {q3:.4g}")
+    os.makedirs(args.out, exist_ok=True)
+    for path in plot_throughput(columns, args.out):
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
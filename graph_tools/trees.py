@@ -0,0 +1,236 @@
+import argparse
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from graph_tools.components import component_labels
+from graph_tools.csr import edge_sources, read_graph
+from graph_tools.solver_output import format_mapping
+
+# Exact matcher for tree patterns in forest targets (the tree family).  In a
+# forest every embedding of a tree is induced: an extra edge between the
+# images of two non-adjacent pattern vertices would close a cycle with the
+# image of the pattern path between them.
+#
+# The pattern is rooted at r.  A state is an arc p -> s of the target and
+# says "u is mapped to s and u's parent to p"; u's children then have to be
+# matched injectively to the other neighbours of s (bipartite matching).
+# States are boolean arrays over the arcs, computed bottom-up once per
+# isomorphism class of rooted pattern subtrees (AHU codes), so e.g. all
+# leaves share one array.  Subtree size and height give a cheap filter
+# before any matching is tried.
+
+
+class TargetForest:
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+        self.n = len(indptr) - 1
+        self.src = edge_sources(indptr)
+        self.deg = np.diff(indptr)
+        keys = self.src * self.n + indices
+        order = np.argsort(keys)
+        self.rev = order[np.searchsorted(keys[order], indices.astype(np.int64) * self.n + self.src)]
+        self.side_size, self.side_height = self._sides()
+
+    def _sides(self):
+        """Size and height of the x side of every arc s -> x."""
+        n = self.n
+        parent = np.full(n, -1, dtype=np.int64)
+        order = []
+        seen = np.zeros(n, dtype=bool)
+        for root in range(n):
+            if seen[root]:
+                continue
+            seen[root] = True
+            queue = deque([root])
+            while queue:
+                v = queue.popleft()
+                order.append(v)
+                for x in self.indices[self.indptr[v]:self.indptr[v + 1]]:
+                    if not seen[x]:
+                        seen[x] = True
+                        parent[x] = v
+                        queue.append(x)
+
+        _, labels = component_labels(self.indptr, self.indices)
+        comp_size = np.bincount(labels)
+        down_size = np.ones(n, dtype=np.int64)
+        down_h = np.zeros(n, dtype=np.int64)
+        for v in reversed(order):
+            if parent[v] >= 0:
+                down_size[parent[v]] += down_size[v]
+                down_h[parent[v]] = max(down_h[parent[v]], down_h[v] + 1)
+
+        # height of the parent's side, seen from v (rerooting)
+        up_h = np.zeros(n, dtype=np.int64)
+        for v in order:
+            kids = [x for x in self.indices[self.indptr[v]:self.indptr[v + 1]] if parent[x] == v]
+            best = sorted((down_h[x] + 1 for x in kids), reverse=True)[:2] + [0, 0]
+            above = up_h[v] + 1 if parent[v] >= 0 else 0
+            for x in kids:
+                other = best[1] if down_h[x] + 1 == best[0] else best[0]
+                up_h[x] = max(above, other)
+
+        size = np.empty(len(self.indices), dtype=np.int64)
+        height = np.empty(len(self.indices), dtype=np.int64)
+        for a in range(len(self.indices)):
+            s, x = self.src[a], self.indices[a]
+            if parent[x] == s:
+                size[a], height[a] = down_size[x], down_h[x]
+            else:
+                size[a], height[a] = comp_size[labels[s]] - down_size[s], up_h[s]
+        return size, height
+
+
+def rooted_pattern(indptr, indices, root=0):
+    """Children lists, post-order, sizes, heights and AHU class ids."""
+    n = len(indptr) - 1
+    parent = np.full(n, -1, dtype=np.int64)
+    order = [root]
+    seen = np.zeros(n, dtype=bool)
+    seen[root] = True
+    for v in order:
+        for x in indices[indptr[v]:indptr[v + 1]]:
+            if not seen[x]:
+                seen[x] = True
+                parent[x] = v
+                order.append(int(x))
+    children = [[] for _ in range(n)]
+    for v in order[1:]:
+        children[parent[v]].append(v)
+
+    size = np.ones(n, dtype=np.int64)
+    height = np.zeros(n, dtype=np.int64)
+    cls = np.zeros(n, dtype=np.int64)
+    codes = {}
+    for v in reversed(order):
+        for c in children[v]:
+            size[v] += size[c]
+            height[v] = max(height[v], height[c] + 1)
+        cls[v] = codes.setdefault(tuple(sorted(cls[c] for c in children[v])), len(codes))
+    return children, order[::-1], size, height, cls
+
+
+def _match(child_ok, arcs):
+    """Injective assignment child -> arc (Kuhn), or None.
+
+    ``child_ok[i]`` is the boolean state array of child i, ``arcs`` the
+    arcs it may use.
+    """
+    owner = {}
+
+    def augment(i, visited):
+        for a in arcs:
+            if child_ok[i][a] and a not in visited:
+                visited.add(a)
+                if a not in owner or augment(owner[a], visited):
+                    owner[a] = i
+                    return True
+        return False
+
+    for i in range(len(child_ok)):
+        if not augment(i, set()):
+            return None
+    return {i: a for a, i in owner.items()}
+
+
+def _state(T, ok_children, size, height, k):
+    """State array for a pattern vertex with the given children states."""
+    ok = (T.side_size >= size) & (T.side_height >= height) & (T.deg[T.indices] - 1 >= k)
+    if k == 0:
+        return ok
+    avail = []
+    for c_ok in ok_children:
+        cnt = np.bincount(T.src, weights=c_ok, minlength=T.n)
+        # arcs usable from s other than the one back to the parent
+        avail.append(cnt[T.indices] - c_ok[T.rev])
+        ok &= avail[-1] > 0
+    if k == 1:
+        return ok
+    for a in np.flatnonzero(ok):
+        s = T.indices[a]
+        arcs = [b for b in range(T.indptr[s], T.indptr[s + 1]) if b != T.rev[a]]
+        if _match(ok_children, arcs) is None:
+            ok[a] = False
+    return ok
+
+
+def find_tree_embedding(p_indptr, p_indices, t_indptr, t_indices):
+    """Pattern -> target mapping of a tree pattern into a forest target, or None."""
+    n_p = len(p_indptr) - 1
+    if n_p == 0:
+        return {}
+    T = TargetForest(t_indptr, t_indices)
+    if n_p > T.n:
+        return None
+    # root the pattern at a vertex of maximum degree: fewest root candidates
+    root = int(np.argmax(np.diff(p_indptr)))
+    children, postorder, size, height, cls = rooted_pattern(p_indptr, p_indices, root)
+
+    state = {}
+    for u in postorder:
+        if u == root or cls[u] in state:
+            continue
+        state[cls[u]] = _state(T, [state[cls[c]] for c in children[u]], size[u], height[u],
+                               len(children[u]))
+
+    kids = [state[cls[c]] for c in children[root]]
+    for s in np.argsort(-T.deg):
+        if T.deg[s] < len(kids):
+            break
+        arcs = list(range(T.indptr[s], T.indptr[s + 1]))
+        assignment = _match(kids, arcs)
+        if assignment is None:
+            continue
+        mapping = {root: int(s)}
+        stack = [(children[root][i], a) for i, a in assignment.items()]
+        while stack:
+            u, a = stack.pop()
+            x = int(T.indices[a])
+            mapping[u] = x
+            arcs = [b for b in range(T.indptr[x], T.indptr[x + 1]) if b != T.rev[a]]
+            sub = _match([state[cls[c]] for c in children[u]], arcs)
+            stack.extend((children[u][i], b) for i, b in sub.items())
+        return mapping
+    return None
+
+
+def is_forest(indptr, indices):
+    n = len(indptr) - 1
+    return len(indices) // 2 == n - component_labels(indptr, indices)[0]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Find an induced tree pattern in a forest target.")
+    ap.add_argument("pattern")
+    ap.add_argument("target")
+    ap.add_argument("--format", default="lad", choices=["lad", "ri", "vf3"])
+    args = ap.parse_args(argv)
+
+    pattern = read_graph(args.pattern, args.format)
+    target = read_graph(args.target, args.format)
+    if not is_forest(*pattern) or component_labels(*pattern)[0] > 1:
+        print("pattern is not a tree", file=sys.stderr)
+        return 2
+    if not is_forest(*target):
+        print("target is not a forest", file=sys.stderr)
+        return 2
+
+    start = time.time()
+    mapping = find_tree_embedding(*pattern, *target)
+    elapsed = (time.time() - start) * 1000
+    if mapping is None:
+        print("status = false")
+    else:
+        print("status = true")
+        print("mapping = " + format_mapping(mapping))
+    print(f"search_time = {elapsed:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
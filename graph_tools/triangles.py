@@ -0,0 +1,74 @@
+import numpy as np
+
+from graph_tools.csr import edge_positions, edge_sources
+from graph_tools.pruning import core_numbers
+
+# Triangle listing on a degeneracy-oriented graph: every edge points from the
+# endpoint that comes first in (core number, degree, id) order, so each
+# vertex keeps at most about degeneracy-many out-neighbours and every
+# triangle a < b < c is found exactly once, from the oriented edge (a, b)
+# and the out-neighbour c of b that is also an out-neighbour of a.
+
+
+def degeneracy_rank(indptr, indices):
+    n = len(indptr) - 1
+    core = core_numbers(indptr, indices)
+    order = np.lexsort((np.arange(n), np.diff(indptr), core))
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+    return rank
+
+
+def orient(indptr, indices, rank):
+    """Oriented CSR (u -> v iff rank[u] < rank[v]) with sorted rows."""
+    n = len(indptr) - 1
+    src = edge_sources(indptr)
+    dst = indices.astype(np.int64)
+    keep = rank[src] < rank[dst]
+    src, dst = src[keep], dst[keep]
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+    out_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=out_indptr[1:])
+    return out_indptr, dst
+
+
+def iter_triangles(indptr, indices, chunk=1 << 22, oriented=None):
+    """Yield arrays (a, b, c) of triangles, about ``chunk`` candidates at a time.
+
+    ``oriented`` is the output of orient() if the caller already has it.
+    """
+    n = len(indptr) - 1
+    out_indptr, out_indices = oriented or orient(indptr, indices, degeneracy_rank(indptr, indices))
+    keys = edge_sources(out_indptr) * n + out_indices
+    a_all = edge_sources(out_indptr)
+    b_all = out_indices
+    work = np.cumsum(np.diff(out_indptr)[b_all])
+    lo = 0
+    while lo < len(b_all):
+        base = work[lo - 1] if lo else 0
+        hi = max(lo + 1, int(np.searchsorted(work, base + chunk, side="right")))
+        a, b = a_all[lo:hi], b_all[lo:hi]
+        pos = edge_positions(out_indptr, b)
+        reps = out_indptr[b + 1] - out_indptr[b]
+        a_rep = np.repeat(a, reps)
+        b_rep = np.repeat(b, reps)
+        c = out_indices[pos]
+        probe = a_rep * n + c
+        at = np.searchsorted(keys, probe)
+        at[at == len(keys)] = 0
+        hit = keys[at] == probe if len(keys) else np.zeros(len(probe), dtype=bool)
+        if hit.any():
+            yield a_rep[hit], b_rep[hit], c[hit]
+        lo = hi
+
+
+def triangle_counts(indptr, indices):
+    """Number of triangles through every vertex."""
+    n = len(indptr) - 1
+    counts = np.zeros(n, dtype=np.int64)
+    for a, b, c in iter_triangles(indptr, indices):
+        counts += np.bincount(a, minlength=n)
+        counts += np.bincount(b, minlength=n)
+        counts += np.bincount(c, minlength=n)
+    return counts
@@ -0,0 +1,250 @@
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from graph_tools.csr import edge_positions, read_graph
+from graph_tools.solver_output import parse_mapping, solver_status
+
+# Checks the embeddings that solvers print in the results logs: the mapping
+# must be injective, keep every pattern edge and map every pattern non-edge
+# to a non-edge of the target.  Also cross-checks the SAT/UNSAT verdicts of
+# all solvers that ran on the same instance.
+#
+# With PRUNE_TARGETS the solvers see the k-core of the target, relabelled,
+# and print mappings in its ids.  Given the solver's working directory
+# (--workdir SOLVER=DIR), the staged target's pruning map
+# (<test_dir>_maps/<target>.npy, graph_tools.pruning) is looked up and the
+# mapping translated back to the original's ids before it is checked.
+
+FNAME_RE  = re.compile(r"^(.+?)_(.+)_results\.txt$")
+HEADER_RE = re.compile(r"^\[Run\] (\S+) (?:grp=(\S+) lvl=(\S+)|\S+ graph=(\S+))$")
+CMD_RE    = re.compile(r"^\[Run\] CMD: (.*)$")
+COMPONENT_MAPPING_RE = re.compile(r"^\[Components\] mapping = (.*)$", re.M)
+
+SOLVER_FORMAT = {"Glasgow": "lad", "LAD": "lad", "SICS": "lad", "RI": "ri", "VF3": "vf3",
+                 "Cycles": "lad", "Trees": "lad", "Matcher": "lad", "ColourCoding": "lad"}
+
+# Patterns up to this size are compared as dense boolean adjacency matrices.
+DENSE_LIMIT = 4096
+
+
+def iter_runs(log_path):
+    """Yield one dict per [Run] block of a runner log."""
+    m = FNAME_RE.match(os.path.basename(log_path))
+    family = m.group(2) if m else None
+    run = None
+    with open(log_path, errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            h = HEADER_RE.match(line)
+            if h:
+                if run:
+                    yield run
+                solver, grp, lvl, graph = h.groups()
+                instance = f"{grp}_{lvl}" if grp is not None else graph.split(".")[0]
+                run = {"solver": solver, "family": family, "instance": instance,
+                       "generated": grp is not None, "cmd": None, "output": []}
+                continue
+            if run is None:
+                continue
+            c = CMD_RE.match(line)
+            if c and run["cmd"] is None:
+                run["cmd"] = c.group(1)
+            else:
+                run["output"].append(line)
+    if run:
+        yield run
+
+
+def command_files(solver_name, cmd):
+    """(pattern path, target path) as passed to the solver."""
+    tokens = cmd.split()
+    if solver_name == "LAD":
+        return tokens[tokens.index("-p") + 1], tokens[tokens.index("-t") + 1]
+    if solver_name == "RI":
+        return tokens[-1], tokens[-2]
+    return tokens[-2], tokens[-1]
+
+
+class InstanceLocator:
+    """Find the repository copy of a staged instance file.
+
+    The runners copy e.g. generated_graphs/instances/tree_lad/1_subgraph_10 to
+    <solver>/test/tree/1_subgraph_10, so files are matched by name and, when a
+    name is ambiguous, by the staged directory name (tree -> tree_lad).
+    """
+
+    def __init__(self, roots):
+        self.by_name = defaultdict(list)
+        for root in roots:
+            for dirpath, _, files in os.walk(root):
+                for f in files:
+                    self.by_name[f].append(os.path.join(dirpath, f))
+
+    def locate(self, staged_path):
+        candidates = self.by_name.get(os.path.basename(staged_path), [])
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+        staged_dir = os.path.basename(os.path.dirname(staged_path)).replace("_", "").lower()
+        for path in candidates:
+            d = os.path.basename(os.path.dirname(path)).replace("_", "").lower()
+            if d.startswith(staged_dir):
+                return path
+        return None
+
+
+@lru_cache(maxsize=256)
+def load(path, fmt):
+    return read_graph(path, fmt)
+
+
+def pruning_map(workdir, staged_path):
+    """Original ids of a pruned staged target, or None if it was not pruned."""
+    staged = os.path.normpath(os.path.join(workdir, staged_path))
+    map_path = os.path.join(os.path.dirname(staged) + "_maps", os.path.basename(staged) + ".npy")
+    return np.load(map_path) if os.path.exists(map_path) else None
+
+
+def _image_edges(t_indptr, t_indices, f, n_p):
+    """Pattern-index pairs (u, v) whose images are adjacent in the target."""
+    inv = np.full(len(t_indptr) - 1, -1, dtype=np.int64)
+    inv[f] = np.arange(n_p)
+    pos = edge_positions(t_indptr, f)
+    src = np.repeat(np.arange(n_p), t_indptr[f + 1] - t_indptr[f])
+    dst = inv[t_indices[pos]]
+    keep = dst >= 0
+    return src[keep], dst[keep]
+
+
+def check_embedding(pattern, target, mapping):
+    """None if ``mapping`` is an induced embedding, otherwise the first problem."""
+    p_indptr, p_indices = pattern
+    t_indptr, t_indices = target
+    n_p, n_t = len(p_indptr) - 1, len(t_indptr) - 1
+
+    f = np.full(n_p, -1, dtype=np.int64)
+    keys = np.fromiter(mapping.keys(), dtype=np.int64, count=len(mapping))
+    vals = np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping))
+    if len(keys) and (keys.min() < 0 or keys.max() >= n_p):
+        return "mapping names a vertex outside the pattern"
+    f[keys] = vals
+    if (f < 0).any():
+        return f"pattern vertex {int(np.flatnonzero(f < 0)[0])} is not mapped"
+    if f.max(initial=-1) >= n_t:
+        return "mapping names a vertex outside the target"
+    if len(np.unique(f)) < n_p:
+        return "mapping is not injective"
+
+    src, dst = _image_edges(t_indptr, t_indices, f, n_p)
+    p_src = np.repeat(np.arange(n_p), np.diff(p_indptr))
+    if n_p <= DENSE_LIMIT:
+        # pattern adjacency against the adjacency of the images
+        want = np.zeros((n_p, n_p), dtype=bool)
+        have = np.zeros((n_p, n_p), dtype=bool)
+        want[p_src, p_indices] = True
+        have[src, dst] = True
+        diff = want != have
+        if not diff.any():
+            return None
+        u, v = (int(x[0]) for x in np.nonzero(diff))
+        return (f"edge ({u},{v}) not preserved" if want[u, v]
+                else f"non-edge ({u},{v}) mapped to an edge")
+    want = np.unique(p_src * n_p + p_indices)
+    have = np.unique(src * n_p + dst)
+    missing = np.setdiff1d(want, have)
+    if len(missing):
+        return f"edge ({missing[0] // n_p},{missing[0] % n_p}) not preserved"
+    extra = np.setdiff1d(have, want)
+    if len(extra):
+        return f"non-edge ({extra[0] // n_p},{extra[0] % n_p}) mapped to an edge"
+    return None
+
+
+def verify_logs(log_paths, locator, workdirs=None):
+    """Verify every printed mapping; returns (checked, problems, disagreements).
+
+    ``workdirs`` ({solver: working directory}) locates the pruning maps.
+    """
+    workdirs = workdirs or {}
+    checked = 0
+    problems = []
+    verdicts = defaultdict(dict)
+    for log_path in log_paths:
+        for run in iter_runs(log_path):
+            solver = run["solver"]
+            if solver not in SOLVER_FORMAT:
+                continue
+            fmt = SOLVER_FORMAT[solver]
+            output = "\n".join(run["output"])
+            status = solver_status(solver, output)
+            # The synthetic generators draw a new graph per format, so only
+            # solvers sharing a format see the same generated instance.
+            source = fmt if run["generated"] else None
+            key = (run["family"], run["instance"], source)
+            if status:
+                verdicts[key][solver] = status
+            if status != "sat" or not run["cmd"]:
+                continue
+
+            pattern_file, target_file = command_files(solver, run["cmd"])
+            comp = COMPONENT_MAPPING_RE.search(output)
+            if comp:
+                # component mode: the mapping is already in ids of the whole target
+                target_file = re.sub(r"\.cc\d+$", "", target_file)
+                mapping = parse_mapping("Glasgow", "mapping = " + comp.group(1))
+            else:
+                mapping = parse_mapping(solver, output)
+                old_ids = pruning_map(workdirs[solver], target_file) if solver in workdirs else None
+                if mapping and old_ids is not None and max(mapping.values()) < len(old_ids):
+                    mapping = {p: int(old_ids[t]) for p, t in mapping.items()}
+            pattern_path = locator.locate(pattern_file)
+            target_path = locator.locate(target_file)
+            if mapping is None or pattern_path is None or target_path is None:
+                continue
+            checked += 1
+            problem = check_embedding(load(pattern_path, fmt), load(target_path, fmt), mapping)
+            if problem:
+                problems.append((log_path, solver, run["instance"], problem))
+            else:
+                verdicts[key]["verified"] = "sat"
+
+    disagreements = [(key, v) for key, v in verdicts.items() if len(set(v.values())) > 1]
+    return checked, problems, disagreements
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Verify solver mappings and verdicts in results logs.")
+    ap.add_argument("logs", nargs="+", help="*_results.txt files or directories holding them")
+    ap.add_argument("--instances", nargs="+", default=["generated_graphs/instances",
+                                                        "random_graphs/instances",
+                                                        "real_graphs/generating_instances"],
+                    help="directories with the original instance files")
+    ap.add_argument("--workdir", action="append", default=[], metavar="SOLVER=DIR",
+                    help="a solver's working directory, to translate mappings on pruned targets")
+    args = ap.parse_args(argv)
+    workdirs = dict(w.split("=", 1) for w in args.workdir)
+
+    log_paths = []
+    for p in args.logs:
+        if os.path.isdir(p):
+            log_paths += sorted(os.path.join(p, f) for f in os.listdir(p) if f.endswith("_results.txt"))
+        else:
+            log_paths.append(p)
+
+    checked, problems, disagreements = verify_logs(log_paths, InstanceLocator(args.instances), workdirs)
+    print(f"Verified {checked} mappings, {len(problems)} invalid.")
+    for log_path, solver, instance, problem in problems:
+        print(f"  [Invalid] {solver} {instance} ({os.path.basename(log_path)}): {problem}")
+    print(f"{len(disagreements)} instances with disagreeing verdicts.")
+    for (family, instance, _), v in disagreements:
+        print(f"  [Disagree] {family} {instance}: " + ", ".join(f"{s}={r}" for s, r in sorted(v.items())))
+    return 1 if problems or disagreements else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
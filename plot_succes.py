@@ -1,14 +1,17 @@
+import argparse
+from collections import Counter
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import os, io, glob
-import re
 
-summary_dirs = {
-   "generated_graphs": "generated_graphs/summaries",
-   "random_graphs":    "random_graphs/summaries",
-   "real_graphs":      "real_graphs/summaries",
-}
+from graph_tools.dataset import load_datasets
+
+dataset_dirs = [
+   "generated_graphs/summaries",
+   "random_graphs/summaries",
+   "real_graphs/summaries",
+]
 
 solvers = ["Glasgow", "PathLAD", "RI", "SICS", "VF3"]
 
@@ -76,140 +79,95 @@ file_to_display_mapping = {
    "pentagon": "R5C"
 }
 
-def count_times(df):
-   col = next((c for c in df.columns if "time" in c.lower()), None)
-   if col is None:
-       return 0
-   df[col] = pd.to_numeric(df[col], errors="coerce")
-   return df[col].notna().sum()
-
 def map_solver_name(solver):
    return "PathLAD" if solver == "LAD" else solver
 
-group_solver = {s: {g: 0 for g in all_groups} for s in solvers}
-
-for kind, folder in summary_dirs.items():
-   for path in glob.glob(os.path.join(folder, "*_summary.txt")):
-       fname = os.path.basename(path)
-
-       if kind == "generated_graphs":
-           base, _ = os.path.splitext(fname)
-           solver = map_solver_name(base.replace("_summary", ""))
-
-           lines = open(path).readlines()
-           curr, buf = None, []
-           for L in lines:
-               if L.startswith("-- test family:"):
-                   if curr and buf:
-                       df = pd.read_csv(io.StringIO("".join(buf)),
-                                        sep=r"\s*\|\s*", engine="python")
-                       df.columns = df.columns.str.strip()
-                       for col in df.columns:
-                           m = re.match(r"(\d+)_time", col)
-                           if m:
-                               pct = m.group(1)
-                               grp_file = f"{curr}_{pct}"
-                               grp_display = file_to_display_mapping.get(grp_file, grp_file)
-                               if grp_display in all_groups:
-                                   group_solver[solver][grp_display] += df[col].notna().sum()
-
-                   fam_raw   = L[len("-- test family:"):].strip()
-                   fam_clean = fam_raw.strip("- ").strip().replace("-", "_")
-                   curr      = fam_clean
-                   buf = []
-
-               elif "|" in L:
-                   buf.append(L)
-
-           if curr and buf:
-               df = pd.read_csv(io.StringIO("".join(buf)),
-                                sep=r"\s*\|\s*", engine="python")
-               df.columns = df.columns.str.strip()
-               for col in df.columns:
-                   m = re.match(r"(\d+)_time", col)
-                   if m:
-                       pct = m.group(1)
-                       grp_file = f"{curr}_{pct}"
-                       grp_display = file_to_display_mapping.get(grp_file, grp_file)
-                       if grp_display in all_groups:
-                           group_solver[solver][grp_display] += df[col].notna().sum()
-
-       else:
-           base, _ = os.path.splitext(fname)
-           parts = base.split("_")
-           solver = map_solver_name(parts[0])
-
-           with open(path) as f:
-               piped = [l for l in f if "|" in l]
-           df = pd.read_csv(io.StringIO("".join(piped)),
-                            sep=r"\s*\|\s*", engine="python")
-           df.columns = df.columns.str.strip()
-           time_col = next(c for c in df.columns if "time" in c.lower())
-           df[time_col] = pd.to_numeric(df[time_col], errors="coerce")
-
-           if kind == "random_graphs":
-               size_map = {
-                   "500":  "IBU-500-50",
-                   "700":  "IBU-700-70",
-                   "1000": "IBU-1000-100",
-               }
-               graph_col = df.columns[0]
-               for size, grp in size_map.items():
-                   mask = df[graph_col].str.contains(f"_graph_{size}")
-                   group_solver[solver][grp] += df.loc[mask, time_col].notna().sum()
-
-           else:
-               # real_graphs
-               raw_group = "_".join(parts[1:-1])
-               grp_display = file_to_display_mapping.get(raw_group, raw_group)
-               if grp_display in all_groups:
-                   group_solver[solver][grp_display] += df[time_col].notna().sum()
-
-df_counts = (
-   pd.DataFrame(group_solver)
-     .T
-     .reindex(solvers)[all_groups]
-     .fillna(0)
-     .astype(int)
-)
-
-fig, ax = plt.subplots(figsize=(10, 6))
-x = np.arange(len(solvers))
-bottom = np.zeros(len(solvers), dtype=int)
-
-for grp in all_groups:
-   vals = df_counts[grp].values
-   ax.bar(x, vals, bottom=bottom, label=grp, color=group_colors[grp])
-   bottom += vals
-
-ax.set_xticks(x)
-ax.set_xticklabels(solvers, rotation=45, ha="right")
-ax.set_ylabel("število rešenih primerov")
-ax.set_xlabel("reševalniki")
-
-max_total = bottom.max()
-ax.set_ylim(0, max_total * 1.05)
-
-yt = list(ax.get_yticks())
-if max_total not in yt:
-   yt.append(max_total)
-   yt = sorted(yt)
-ax.set_yticks(yt)
-
-handles, labels = ax.get_legend_handles_labels()
-seen = set()
-h2, l2 = [], []
-for h, L in zip(handles, labels):
-   if L not in seen:
-       seen.add(L)
-       h2.append(h)
-       l2.append(L)
-
-h2 = h2[::-1]
-l2 = l2[::-1]
-
-ax.legend(h2, l2, title="Legenda", bbox_to_anchor=(1.02,1), loc="upper left")
-
-plt.tight_layout()
-plt.savefig("solver_success.png", dpi=150)
-plt.show()
\ No newline at end of file
+def test_group(suite, family, level):
+   """Legend group of a dataset row ("ER-10", "IBU-500-50", "R3C", ...) or None."""
+   if suite == "generated":
+      return file_to_display_mapping.get(f"{family}_{level}")
+   if suite == "random":
+      return file_to_display_mapping.get("random_" + family.replace("_random", ""))
+   return file_to_display_mapping.get(family)
+
+def count_solved(columns):
+   """Solved instances per solver (rows) and test group (columns) of a results dataset."""
+   group_solver = {s: {g: 0 for g in all_groups} for s in solvers}
+   solved = columns["status"] == "solved"
+   keys = zip(columns["solver"][solved], columns["suite"][solved],
+              columns["family"][solved], columns["level"][solved])
+   for (solver, suite, family, level), n in Counter(keys).items():
+      solver, grp = map_solver_name(str(solver)), test_group(str(suite), str(family), int(level))
+      if solver in group_solver and grp in all_groups:
+         group_solver[solver][grp] += n
+
+   df_counts = (
+      pd.DataFrame(group_solver)
+        .T
+        .reindex(solvers)[all_groups]
+        .fillna(0)
+        .astype(int)
+   )
+   return df_counts
+
+def plot_solver_success(df_counts, out_path="solver_success.png", show=False):
+   """Stacked bar chart of the solved instances per solver and test group."""
+   fig, ax = plt.subplots(figsize=(10, 6))
+   x = np.arange(len(solvers))
+   bottom = np.zeros(len(solvers), dtype=int)
+
+   for grp in all_groups:
+      vals = df_counts[grp].values
+      ax.bar(x, vals, bottom=bottom, label=grp, color=group_colors[grp])
+      bottom += vals
+
+   ax.set_xticks(x)
+   ax.set_xticklabels(solvers, rotation=45, ha="right")
+   ax.set_ylabel("število rešenih primerov")
+   ax.set_xlabel("reševalniki")
+
+   max_total = bottom.max()
+   ax.set_ylim(0, max_total * 1.05)
+
+   yt = list(ax.get_yticks())
+   if max_total not in yt:
+      yt.append(max_total)
+      yt = sorted(yt)
+   ax.set_yticks(yt)
+
+   handles, labels = ax.get_legend_handles_labels()
+   seen = set()
+   h2, l2 = [], []
+   for h, L in zip(handles, labels):
+      if L not in seen:
+          seen.add(L)
+          h2.append(h)
+          l2.append(L)
+
+   h2 = h2[::-1]
+   l2 = l2[::-1]
+
+   ax.legend(h2, l2, title="Legenda", bbox_to_anchor=(1.02,1), loc="upper left")
+
+   plt.tight_layout()
+   plt.savefig(out_path, dpi=150)
+   if show:
+      plt.show()
+   plt.close(fig)
+   return out_path
+
+def main(argv=None):
+   ap = argparse.ArgumentParser(description="Stacked bar chart of solved instances per solver.")
+   ap.add_argument("datasets", nargs="*", default=dataset_dirs, help="results datasets (files or summary directories)")
+   ap.add_argument("--out", default="solver_success.png")
+   ap.add_argument("--show", action="store_true", help="also open the figure in a window")
+   args = ap.parse_args(argv)
+   columns = load_datasets(args.datasets)
+   if columns is None:
+      print("No results datasets found (run results.py first).")
+      return 1
+   plot_solver_success(count_solved(columns), args.out, args.show)
+   return 0
+
+if __name__ == "__main__":
+   raise SystemExit(main())
@@ -57,32 +57,32 @@ def export_graph_vf3(G, file_path, node_attr='label', default_node_attr=1):
                 f.write(f"{node} {neighbor}\n")
     print(f"VF3 graph exported to {file_path}")
 
-if __name__ == "__main__":
-    num_graphs = 100
-    n1, n2 = 1000, 100
-
-    lad_dir = "LAD"
-    ri_dir = "RI"
-    vf3_dir = "VF3"
+def generate_random_suite(num_graphs, n1, n2, lad_dir="LAD", ri_dir="RI", vf3_dir="VF3"):
     os.makedirs(lad_dir, exist_ok=True)
     os.makedirs(ri_dir, exist_ok=True)
     os.makedirs(vf3_dir, exist_ok=True)
 
     p_sub = random.uniform(0.01, 0.1)
     G_sub = generate_random_graph(n2, p_sub)
-    export_graph_lad(G_sub, os.path.join(lad_dir, "subgraph100.lad"))
-    export_graph_ri(G_sub, os.path.join(ri_dir, "subgraph100.gfu"), "#query")
-    export_graph_vf3(G_sub, os.path.join(vf3_dir, "subgraph100.sub.grf"))
+    export_graph_lad(G_sub, os.path.join(lad_dir, f"subgraph{n2}.lad"))
+    export_graph_ri(G_sub, os.path.join(ri_dir, f"subgraph{n2}.gfu"), "#query")
+    export_graph_vf3(G_sub, os.path.join(vf3_dir, f"subgraph{n2}.sub.grf"))
 
     for i in range(1, num_graphs + 1):
         p1 = random.uniform(0.01, 0.1)
         G1 = generate_random_graph(n1, p1)
 
         # LAD format
-        export_graph_lad(G1, os.path.join(lad_dir, f"{i}_random_graph_1000.lad"))
+        export_graph_lad(G1, os.path.join(lad_dir, f"{i}_random_graph_{n1}.lad"))
 
         # RI format
-        export_graph_ri(G1, os.path.join(ri_dir, f"{i}_random_graph_1000.gfu"), "#data")
+        export_graph_ri(G1, os.path.join(ri_dir, f"{i}_random_graph_{n1}.gfu"), "#data")
 
         # VF3 format
-        export_graph_vf3(G1, os.path.join(vf3_dir, f"{i}_random_graph_1000.grf"))
\ No newline at end of file
+        export_graph_vf3(G1, os.path.join(vf3_dir, f"{i}_random_graph_{n1}.grf"))
+
+if __name__ == "__main__":
+    num_graphs = 100
+    n1, n2 = 1000, 100
+
+    generate_random_suite(num_graphs, n1, n2)
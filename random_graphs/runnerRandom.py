@@ -1,10 +1,30 @@
 import os
 import shutil
-import subprocess
+import sys
 import time
 
+# graph_tools and results.py live in the repository root (this is also run
+# as a script from here)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_tools.builds import build_line
+from graph_tools.components import solve_by_components
+from graph_tools.progress import Progress, runtime_history
+from graph_tools.pruning import pattern_min_degree, prune_target
+from graph_tools.repeats import log_samples, run_repeated
+from graph_tools.refute import Signature, refute, saved_solver_hours
+from graph_tools.selector import Selector
+from graph_tools.target_index import target_signature
+from results import parse_real_log
+
 
 RANDOM_GRAPHS_DIR = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/random_graphs/instances/1000-100"
+REPO_DIR = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem"
+
+# logs are named <solver>_<size>_random_results.txt in results/, where
+# results.py (SUITES) and graph.py (RANDOM_SIZES) expect them
+RANDOM_SIZE = os.path.basename(RANDOM_GRAPHS_DIR)
+RESULTS_DIR = "results"
 
 SOLVER_DEST_DIRS = {
     "Glasgow": "/home/jana/Documents/DIPLOMA/SOLVERJI/GLASGOW/glasgow-subgraph-solver/testRandom",
@@ -12,16 +32,61 @@ SOLVER_DEST_DIRS = {
     "RI":      "/home/jana/Documents/DIPLOMA/SOLVERJI/RI/RI/testRandom",
     "VF3":     "/home/jana/Documents/DIPLOMA/SOLVERJI/VF3/vf3lib/testRandom",
     "SICS":    "/home/jana/Documents/DIPLOMA/SOLVERJI/SICS/sics/testRandom",
+    "Matcher": "/home/jana/Documents/DIPLOMA/SOLVERJI/MATCHER/testRandom",
 }
 
 SUBGRAPH_FILE = {
     "Glasgow": "subgraph100.lad",
     "LAD":     "subgraph100.lad",
     "SICS":    "subgraph100.lad",
+    "Matcher": "subgraph100.lad",
     "RI":      "subgraph100.gfu",
     "VF3":     "subgraph100.sub.grf",
 }
 
+SOLVER_FORMAT = {
+    "Glasgow": "lad",
+    "LAD":     "lad",
+    "SICS":    "lad",
+    "Matcher": "lad",
+    "RI":      "ri",
+    "VF3":     "vf3",
+}
+
+# Replace every staged target by the k-core of the pattern
+# (k = smallest pattern degree) before the solvers run.
+PRUNE_TARGETS = False
+
+# Solve the connected components of each target separately, largest first
+# and in parallel, stopping at the first component that holds the pattern.
+SPLIT_COMPONENTS = False
+COMPONENT_JOBS = os.cpu_count() or 1
+
+# Try to prove every instance infeasible before the solvers run.  The
+# verdicts go to a "Refuter" results log that is summarised like a solver.
+REFUTE_INSTANCES = False
+# Do not hand instances the refuter proved infeasible to the solvers.
+SKIP_REFUTED = False
+
+# Model trained with `python -m graph_tools.selector train`.  When set, every
+# instance is only run with the solver the model predicts to be fastest.
+SELECTOR_MODEL = None
+
+# Repeated measurement (graph_tools.repeats): up to REPEATS timed runs per
+# cell after WARMUP_RUNS discarded ones, stopping early once the 95% CI of
+# the median is within REPEAT_REL_CI of it.  Set by `benchmark.py run
+# --repeats/--warmup/--rel-ci`; components mode always runs once.
+REPEATS = 1
+WARMUP_RUNS = 0
+REPEAT_REL_CI = 0.05
+
+# Live progress (graph_tools.progress): status for `benchmark.py progress`
+# and a Prometheus textfile (None: don't write one).  The ETA starts from
+# the per-solver runtimes of the last campaign's results dataset.
+PROGRESS_FILE = os.path.join("results", "progress.json")
+METRICS_FILE = os.path.join("results", "benchmark_random.prom")
+HISTORY_DATASET = "summaries"
+
 def log_print(msg, log_file):
     log_file.write(msg + "\n")
     log_file.flush()
@@ -33,6 +98,7 @@ def copy_random_tests(solver_name):
         "Glasgow": "LAD",
         "LAD": "LAD",
         "SICS": "LAD",
+        "Matcher": "LAD",
         "RI": "RI",
         "VF3": "VF3",
     }
@@ -62,13 +128,84 @@ def copy_random_tests(solver_name):
 
     print(f"[Copy] {solver_name}: copied random graphs and subgraph file to {dst}")
 
-def run_random_tests_for_solver(solver, log_file):
+def prune_random_tests(solver_name):
+    test_dir = os.path.join(SOLVER_DEST_DIRS[solver_name], "random")
+    subgraph_file = SUBGRAPH_FILE[solver_name]
+    fmt = SOLVER_FORMAT[solver_name]
+    map_dir = os.path.join(SOLVER_DEST_DIRS[solver_name], "random_maps")
+    if os.path.exists(map_dir):
+        shutil.rmtree(map_dir)
+
+    pattern_abs = os.path.join(test_dir, subgraph_file)
+    if not os.path.isfile(pattern_abs):
+        return
+    k = pattern_min_degree(pattern_abs, fmt)
+    for f in sorted(os.listdir(test_dir)):
+        if f == subgraph_file or not os.path.isfile(os.path.join(test_dir, f)):
+            continue
+        n0, n1, m0, m1 = prune_target(os.path.join(test_dir, f), fmt, k,
+                                      os.path.join(map_dir, f + ".npy"))
+        if n1 < n0:
+            print(f"[Prune] {solver_name} {f}: {k}-core {n0}->{n1} vertices, {m0}->{m1} edges")
+
+def refute_random_tests(log_file, results_dir, timeout):
+    """Run the refutation checks on the LAD copies; returns {graph stem: reason}."""
+    src_dir = os.path.join(RANDOM_GRAPHS_DIR, "LAD")
+    pattern = Signature.from_file(os.path.join(src_dir, SUBGRAPH_FILE["LAD"]), "lad")
+    random_graphs = sorted(f for f in os.listdir(src_dir)
+                           if f != SUBGRAPH_FILE["LAD"] and os.path.isfile(os.path.join(src_dir, f)))
+
+    refuted = {}
+    for random_graph in random_graphs:
+        log_print(f"\n[Run] Refuter random graph={random_graph}", log_file)
+        start = time.time()
+        reason = refute(pattern, target_signature(os.path.join(src_dir, random_graph), "lad", pattern.k))
+        elapsed = time.time() - start
+        if reason is None:
+            log_print(f"[Refute] inconclusive after {elapsed:.2f}s", log_file)
+            continue
+        log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
+        log_print(f"[Refute] infeasible: {reason}", log_file)
+        refuted[random_graph.split(".")[0]] = reason
+
+    # what the solvers spent on these instances last time (timeout if unknown)
+    previous = {}
+    for solver_name in SOLVER_DEST_DIRS:
+        path = os.path.join(results_dir, f"{solver_name}_{RANDOM_SIZE}_random_results.txt")
+        records = parse_real_log(path) if os.path.exists(path) else {}
+        previous[solver_name] = {g.split(".")[0]: (None if r["timeout"] else r["time"])
+                                 for g, r in records.items()}
+    hours = saved_solver_hours(refuted, previous, timeout)
+    log_print(f"\n[Refute] {len(refuted)}/{len(random_graphs)} instances infeasible, "
+              f"worth {hours:.2f} solver-hours", log_file)
+    print(f"[Refute] {len(refuted)}/{len(random_graphs)} instances infeasible, worth {hours:.2f} solver-hours")
+    return refuted
+
+def select_random_solvers(model_path):
+    """Instance name -> solver picked by the selector, from the LAD files."""
+    selector = Selector.load(model_path)
+    lad_dir = os.path.join(RANDOM_GRAPHS_DIR, "LAD")
+    pattern = os.path.join(lad_dir, SUBGRAPH_FILE["Glasgow"])
+    selected = {}
+    for f in sorted(os.listdir(lad_dir)):
+        if f != SUBGRAPH_FILE["Glasgow"]:
+            selected[f.split(".")[0]] = selector.choose(pattern, os.path.join(lad_dir, f), 120.0)
+    return selected
+
+def list_random_tests(solver_name):
+    """Staged targets of a solver, [] without its pattern."""
+    test_dir = os.path.join(SOLVER_DEST_DIRS[solver_name], "random")
+    subgraph_file = SUBGRAPH_FILE[solver_name]
+    if not os.path.isdir(test_dir) or not os.path.isfile(os.path.join(test_dir, subgraph_file)):
+        return []
+    return sorted(f for f in os.listdir(test_dir)
+                  if f != subgraph_file and os.path.isfile(os.path.join(test_dir, f)))
+
+def run_random_tests_for_solver(solver, log_file, refuted=None, selected=None):
     test_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], "random")
     subgraph_file = SUBGRAPH_FILE[solver["name"]]
 
-    random_graphs = [f for f in os.listdir(test_dir)
-                     if f != subgraph_file and os.path.isfile(os.path.join(test_dir, f))]
-    random_graphs.sort()
+    random_graphs = list_random_tests(solver["name"])
 
     pattern_abs = os.path.join(test_dir, subgraph_file)
     if not os.path.isfile(pattern_abs):
@@ -78,6 +215,24 @@ def run_random_tests_for_solver(solver, log_file):
     for random_graph in random_graphs:
         target_abs = os.path.join(test_dir, random_graph)
 
+        if refuted and random_graph.split(".")[0] in refuted:
+            log_print(f"\n[Run] {solver['name']} random graph={random_graph}", log_file)
+            log_print(f"[Run] Skipped (refuted: {refuted[random_graph.split('.')[0]]})", log_file)
+            continue
+
+        if selected and selected.get(random_graph.split(".")[0], solver["name"]) != solver["name"]:
+            log_print(f"\n[Run] {solver['name']} random graph={random_graph}", log_file)
+            log_print(f"[Run] Skipped (selected: {selected[random_graph.split('.')[0]]})", log_file)
+            continue
+
+        if SPLIT_COMPONENTS:
+            log_print(f"\n[Run] {solver['name']} random graph={random_graph}", log_file)
+            solve_by_components(solver, SOLVER_FORMAT[solver["name"]], pattern_abs, target_abs,
+                                os.path.join(SOLVER_DEST_DIRS[solver["name"]], "random_components"),
+                                120.0, COMPONENT_JOBS, lambda msg: log_print(msg, log_file),
+                                os.path.join(SOLVER_DEST_DIRS[solver["name"]], "random_maps", random_graph + ".npy"))
+            continue
+
         pattern_rel = "./" + os.path.relpath(pattern_abs, solver["workdir"])
         target_rel  = "./" + os.path.relpath(target_abs,  solver["workdir"])
 
@@ -91,29 +246,18 @@ def run_random_tests_for_solver(solver, log_file):
             f"--track-origins=yes "
             f"--log-file={vg_log} "
             f"{base_cmd}"
-        )
+        ) if solver.get("valgrind", True) else base_cmd
 
         log_print(f"\n[Run] {solver['name']} random graph={random_graph}", log_file)
         log_print(f"[Run] CMD: {vg_cmd}", log_file)
 
-        start = time.time()
-        try:
-            proc = subprocess.run(
-                vg_cmd,
-                cwd=solver["workdir"],
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                timeout=120.0
-            )
-            elapsed = time.time() - start
-            log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
-
-        except subprocess.TimeoutExpired:
-            elapsed = time.time() - start
+        proc, samples, warmups, elapsed = run_repeated(vg_cmd, solver["workdir"], 120.0,
+                                                       REPEATS, WARMUP_RUNS, REPEAT_REL_CI)
+        log_samples(samples, warmups, lambda msg: log_print(msg, log_file))
+        if proc is None:
             log_print(f"[Run] TIMED OUT after 120s (elapsed={elapsed:.2f}s)", log_file)
             continue
+        log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
 
         if proc.stdout:
             log_print(proc.stdout, log_file)
@@ -142,10 +286,31 @@ def run_random_tests_for_solver(solver, log_file):
 def main():
     for solver_name in SOLVER_DEST_DIRS:
         copy_random_tests(solver_name)
+        if PRUNE_TARGETS:
+            prune_random_tests(solver_name)
 
-    os.makedirs("results 1000-100", exist_ok=True)
-    os.makedirs("results", exist_ok=True) 
+    os.makedirs(RESULTS_DIR, exist_ok=True)
 
+    progress = Progress("random", PROGRESS_FILE, METRICS_FILE, runtime_history(HISTORY_DATASET))
+    if REFUTE_INSTANCES:
+        lad_dir = os.path.join(RANDOM_GRAPHS_DIR, "LAD")
+        progress.plan("Refuter", sum(f != SUBGRAPH_FILE["LAD"] and os.path.isfile(os.path.join(lad_dir, f))
+                                     for f in os.listdir(lad_dir)))
+    for solver_name in SOLVER_DEST_DIRS:
+        progress.plan(solver_name, len(list_random_tests(solver_name)))
+
+    refuted = {}
+    if REFUTE_INSTANCES:
+        log_path = os.path.join(RESULTS_DIR, f"Refuter_{RANDOM_SIZE}_random_results.txt")
+        with open(log_path, "w") as lf:
+            log_print("=== START Refuter (random) ===", lf)
+            refuted = refute_random_tests(progress.watch(lf), RESULTS_DIR, 120.0)
+            log_print("=== END   Refuter (random) ===", lf)
+        print(f"[Done] Refuter random → {log_path}")
+        if not SKIP_REFUTED:
+            refuted = {}
+
+    selected = select_random_solvers(SELECTOR_MODEL) if SELECTOR_MODEL else None
 
     solvers = [
         {
@@ -172,6 +337,13 @@ def main():
             "name": "SICS",
             "workdir": "/home/jana/Documents/DIPLOMA/SOLVERJI/SICS/sics",
             "command": "./a.out {pattern} {target}",
+        },
+        {
+            # in-repo bitset matcher (graph_tools/matcher.py)
+            "name": "Matcher",
+            "workdir": REPO_DIR,
+            "command": "python3 -m graph_tools.matcher --timeout 120 {pattern} {target}",
+            "valgrind": False,
         }
     ]
 
@@ -180,10 +352,11 @@ def main():
         if not os.path.isdir(test_dir):
             print(f"[Skip] {solver['name']} has no 'random' tests, skipping.")
             continue
-        log_path = os.path.join("results 1000-100", f"{solver['name']}_random_results.txt")
+        log_path = os.path.join(RESULTS_DIR, f"{solver['name']}_{RANDOM_SIZE}_random_results.txt")
         with open(log_path, "w") as lf:
             log_print(f"=== START {solver['name']} (random) ===", lf)
-            run_random_tests_for_solver(solver, lf)
+            log_print(build_line(solver), lf)
+            run_random_tests_for_solver(solver, progress.watch(lf), refuted, selected)
             log_print(f"=== END   {solver['name']} (random) ===", lf)
         print(f"[Done] {solver['name']} random → {log_path}")
 
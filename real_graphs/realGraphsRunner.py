@@ -1,9 +1,22 @@
 import os
 import shutil
-import subprocess
+import sys
 import time
 
+# graph_tools lives in the repository root (this is also run as a script from here)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_tools.builds import build_line
+from graph_tools.colour_coding import MAX_K, ColourCoding, miss_probability, trials_for
+from graph_tools.components import solve_by_components
+from graph_tools.csr import read_graph
+from graph_tools.progress import Progress, runtime_history
+from graph_tools.pruning import pattern_min_degree, prune_target
+from graph_tools.repeats import log_samples, run_repeated
+from graph_tools.runlog import iter_records
+
 REAL_GRAPHS_DIR = "/home/jana/Documents/DIPLOMA/REAL TESTI/REAL"
+REPO_DIR = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem"
 SUBGRAPH_DIR = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/real graphs/generating instances/pentagon"
 
 SOLVER_DEST_DIRS = {
@@ -12,16 +25,63 @@ SOLVER_DEST_DIRS = {
     "RI":      "/home/jana/Documents/DIPLOMA/SOLVERJI/RI/RI/testReal",
     "VF3":     "/home/jana/Documents/DIPLOMA/SOLVERJI/VF3/vf3lib/testReal",
     "SICS":    "/home/jana/Documents/DIPLOMA/SOLVERJI/SICS/sics/testReal",
+    "Cycles":  "/home/jana/Documents/DIPLOMA/SOLVERJI/CYCLES/testReal",
 }
 
 SUBGRAPH_FILE = {
     "Glasgow": "pentagonLAD",
     "LAD":     "pentagonLAD",
     "SICS":    "pentagonLAD",
+    "Cycles":  "pentagonLAD",
     "RI":      "pentagonRI.gfu",
     "VF3":     "pentagonVF3.sub.grf",
 }
 
+SOLVER_FORMAT = {
+    "Glasgow": "lad",
+    "LAD":     "lad",
+    "SICS":    "lad",
+    "Cycles":  "lad",
+    "RI":      "ri",
+    "VF3":     "vf3",
+}
+
+# Replace every staged target by the k-core of the pattern
+# (k = smallest pattern degree, 2 for the cycles) before the solvers run.
+PRUNE_TARGETS = False
+
+# Solve the connected components of each target separately, largest first
+# and in parallel, stopping at the first component that holds the pattern.
+SPLIT_COMPONENTS = False
+COMPONENT_JOBS = os.cpu_count() or 1
+
+# Screen every target with colour coding (graph_tools.colour_coding) before
+# the solvers run.  Its verdicts are probabilistic ("status = false" holds
+# with probability >= 1 - SCREEN_DELTA), so they go to their own log,
+# results/ColourCoding_real_screen.txt, which results.py does not summarise.
+# Once the solvers are done their SAT/UNSAT answers are checked against the
+# screen and every disagreement is added to that log: an embedding the
+# screen found refutes an UNSAT answer, a SAT answer on a target the screen
+# missed is one of its rare false negatives.
+SCREEN_INSTANCES = False
+SCREEN_DELTA = 0.01
+SCREEN_TIMEOUT = 60.0
+
+# Repeated measurement (graph_tools.repeats): up to REPEATS timed runs per
+# cell after WARMUP_RUNS discarded ones, stopping early once the 95% CI of
+# the median is within REPEAT_REL_CI of it.  Set by `benchmark.py run
+# --repeats/--warmup/--rel-ci`; components mode always runs once.
+REPEATS = 1
+WARMUP_RUNS = 0
+REPEAT_REL_CI = 0.05
+
+# Live progress (graph_tools.progress): status for `benchmark.py progress`
+# and a Prometheus textfile (None: don't write one).  The ETA starts from
+# the per-solver runtimes of the last campaign's results dataset.
+PROGRESS_FILE = os.path.join("results", "progress.json")
+METRICS_FILE = os.path.join("results", "benchmark_real.prom")
+HISTORY_DATASET = "summaries"
+
 def log_print(msg, log_file):
     log_file.write(msg + "\n")
     log_file.flush()
@@ -33,7 +93,7 @@ def copy_real_tests(solver_name):
         print(f"[Copy] Skipping {solver_name} (dst or subgraph file missing)")
         return
 
-    if solver_name in ["Glasgow", "LAD", "SICS"]:
+    if solver_name in ["Glasgow", "LAD", "SICS", "Cycles"]:
         real_graphs_src = os.path.join(REAL_GRAPHS_DIR, "LAD")
     elif solver_name == "RI":
         real_graphs_src = os.path.join(REAL_GRAPHS_DIR, "RI")
@@ -65,13 +125,86 @@ def copy_real_tests(solver_name):
 
     print(f"[Copy] {solver_name}: copied real graphs and subgraph file to {dst}")
 
+def prune_real_tests(solver_name):
+    test_dir = os.path.join(SOLVER_DEST_DIRS[solver_name], "real")
+    subgraph_file = SUBGRAPH_FILE[solver_name]
+    fmt = SOLVER_FORMAT[solver_name]
+    map_dir = os.path.join(SOLVER_DEST_DIRS[solver_name], "real_maps")
+    if os.path.exists(map_dir):
+        shutil.rmtree(map_dir)
+
+    pattern_abs = os.path.join(test_dir, subgraph_file)
+    if not os.path.isfile(pattern_abs):
+        return
+    k = pattern_min_degree(pattern_abs, fmt)
+    for f in sorted(os.listdir(test_dir)):
+        if f == subgraph_file or not os.path.isfile(os.path.join(test_dir, f)):
+            continue
+        n0, n1, m0, m1 = prune_target(os.path.join(test_dir, f), fmt, k,
+                                      os.path.join(map_dir, f + ".npy"))
+        if n1 < n0:
+            print(f"[Prune] {solver_name} {f}: {k}-core {n0}->{n1} vertices, {m0}->{m1} edges")
+
+def screen_real_tests(log_file):
+    """Colour-coding screen of the LAD targets; returns {graph stem: "embedding" | "unlikely" | "inconclusive"}."""
+    src_dir = os.path.join(REAL_GRAPHS_DIR, "LAD")
+    pattern = read_graph(os.path.join(SUBGRAPH_DIR, SUBGRAPH_FILE["Glasgow"]), "lad")
+    k = len(pattern[0]) - 1
+    if k > MAX_K:
+        print(f"[Screen] pattern has {k} > {MAX_K} vertices, not screening")
+        return {}
+
+    verdicts = {}
+    for real_graph in sorted(f for f in os.listdir(src_dir) if os.path.isfile(os.path.join(src_dir, f))):
+        start = time.time()
+        engine = ColourCoding(*pattern, *read_graph(os.path.join(src_dir, real_graph), "lad"))
+        mapping, trials, aborted = engine.solve(trials_for(k, SCREEN_DELTA), SCREEN_TIMEOUT)
+        elapsed = time.time() - start
+        name = real_graph.split(".")[0]
+        if mapping is not None:
+            verdicts[name] = "embedding"
+            log_print(f"[Screen] {real_graph}: embedding found after {trials} trials in {elapsed:.2f}s", log_file)
+        elif aborted:
+            verdicts[name] = "inconclusive"
+            log_print(f"[Screen] {real_graph}: inconclusive after {trials} trials in {elapsed:.2f}s", log_file)
+        else:
+            verdicts[name] = "unlikely"
+            log_print(f"[Screen] {real_graph}: no embedding (false-negative probability "
+                      f"{miss_probability(k, trials):.3g}) in {elapsed:.2f}s", log_file)
+    found = sum(v == "embedding" for v in verdicts.values())
+    print(f"[Screen] {found}/{len(verdicts)} targets hold the pattern")
+    return verdicts
+
+def cross_check_screen(verdicts, log_paths, log_file):
+    """Solver answers that contradict the screen, as (solver, graph, answer, verdict)."""
+    disagreements = []
+    for log_path in log_paths:
+        for rec in iter_records(log_path, stats=True):
+            verdict = verdicts.get(rec.instance)
+            if rec.answer is None or verdict in (None, "inconclusive"):
+                continue
+            if (rec.answer == "sat") != (verdict == "embedding"):
+                disagreements.append((rec.solver, rec.instance, rec.answer, verdict))
+                log_print(f"[Screen] {rec.solver} {rec.instance}: solver says {rec.answer}, "
+                          f"screen says {verdict}", log_file)
+    log_print(f"[Screen] {len(disagreements)} solver answer(s) disagree with the screen", log_file)
+    print(f"[Screen] {len(disagreements)} solver answer(s) disagree with the screen")
+    return disagreements
+
+def list_real_tests(solver_name):
+    """Staged targets of a solver, [] without its pattern."""
+    test_dir = os.path.join(SOLVER_DEST_DIRS[solver_name], "real")
+    subgraph_file = SUBGRAPH_FILE[solver_name]
+    if not os.path.isdir(test_dir) or not os.path.isfile(os.path.join(test_dir, subgraph_file)):
+        return []
+    return sorted(f for f in os.listdir(test_dir)
+                  if f != subgraph_file and os.path.isfile(os.path.join(test_dir, f)))
+
 def run_real_tests_for_solver(solver, log_file):
     test_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], "real")
     subgraph_file = SUBGRAPH_FILE[solver["name"]]
 
-    real_graphs = [f for f in os.listdir(test_dir)
-                   if f != subgraph_file and os.path.isfile(os.path.join(test_dir, f))]
-    real_graphs.sort()
+    real_graphs = list_real_tests(solver["name"])
 
     # subgraph path
     pattern_abs = os.path.join(test_dir, subgraph_file)
@@ -83,6 +216,14 @@ def run_real_tests_for_solver(solver, log_file):
         target_abs = os.path.join(test_dir, real_graph)
 
         # relative paths for execution
+        if SPLIT_COMPONENTS:
+            log_print(f"\n[Run] {solver['name']} real graph={real_graph}", log_file)
+            solve_by_components(solver, SOLVER_FORMAT[solver["name"]], pattern_abs, target_abs,
+                                os.path.join(SOLVER_DEST_DIRS[solver["name"]], "real_components"),
+                                120.0, COMPONENT_JOBS, lambda msg: log_print(msg, log_file),
+                                os.path.join(SOLVER_DEST_DIRS[solver["name"]], "real_maps", real_graph + ".npy"))
+            continue
+
         pattern_rel = "./" + os.path.relpath(pattern_abs, solver["workdir"])
         target_rel  = "./" + os.path.relpath(target_abs,  solver["workdir"])
 
@@ -96,29 +237,18 @@ def run_real_tests_for_solver(solver, log_file):
             f"--track-origins=yes "
             f"--log-file={vg_log} "
             f"{base_cmd}"
-        )
+        ) if solver.get("valgrind", True) else base_cmd
 
         log_print(f"\n[Run] {solver['name']} real graph={real_graph}", log_file)
         log_print(f"[Run] CMD: {vg_cmd}", log_file)
 
-        start = time.time()
-        try:
-            proc = subprocess.run(
-                vg_cmd,
-                cwd=solver["workdir"],
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                timeout=120.0
-            )
-            elapsed = time.time() - start
-            log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
-
-        except subprocess.TimeoutExpired:
-            elapsed = time.time() - start
+        proc, samples, warmups, elapsed = run_repeated(vg_cmd, solver["workdir"], 120.0,
+                                                       REPEATS, WARMUP_RUNS, REPEAT_REL_CI)
+        log_samples(samples, warmups, lambda msg: log_print(msg, log_file))
+        if proc is None:
             log_print(f"[Run] TIMED OUT after 120s (elapsed={elapsed:.2f}s)", log_file)
             continue
+        log_print(f"[Run] Done in {elapsed:.2f}s", log_file)
 
         if proc.stdout:
             log_print(proc.stdout, log_file)
@@ -148,6 +278,8 @@ def main():
     # copy, clean
     for solver_name in SOLVER_DEST_DIRS:
         copy_real_tests(solver_name)
+        if PRUNE_TARGETS:
+            prune_real_tests(solver_name)
 
     os.makedirs("results", exist_ok=True)
 
@@ -176,20 +308,48 @@ def main():
             "name": "SICS",
             "workdir": "/home/jana/Documents/DIPLOMA/SOLVERJI/SICS/sics",
             "command": "./a.out {pattern} {target}",
+        },
+        {
+            # in-repo induced 3/4/5-cycle detector (graph_tools/cycles.py),
+            # a lower-bound reference for the general solvers
+            "name": "Cycles",
+            "workdir": REPO_DIR,
+            "command": "python3 -m graph_tools.cycles {pattern} {target}",
+            "valgrind": False,
         }
     ]
 
+    screen_log = os.path.join("results", "ColourCoding_real_screen.txt")
+    screen = {}
+    if SCREEN_INSTANCES:
+        with open(screen_log, "w") as lf:
+            log_print("=== START ColourCoding screen (real) ===", lf)
+            screen = screen_real_tests(lf)
+            log_print("=== END   ColourCoding screen (real) ===", lf)
+        print(f"[Done] ColourCoding screen real → {screen_log}")
+
+    progress = Progress("real", PROGRESS_FILE, METRICS_FILE, runtime_history(HISTORY_DATASET))
+    for solver in solvers:
+        progress.plan(solver["name"], len(list_real_tests(solver["name"])))
+
+    solver_logs = []
     for solver in solvers:
         test_dir = os.path.join(SOLVER_DEST_DIRS[solver["name"]], "real")
         if not os.path.isdir(test_dir):
             print(f"[Skip] {solver['name']} has no 'real' tests, skipping.")
             continue
         log_path = os.path.join("results", f"{solver['name']}_real_results.txt")
+        solver_logs.append(log_path)
         with open(log_path, "w") as lf:
             log_print(f"=== START {solver['name']} (real) ===", lf)
-            run_real_tests_for_solver(solver, lf)
+            log_print(build_line(solver), lf)
+            run_real_tests_for_solver(solver, progress.watch(lf))
             log_print(f"=== END   {solver['name']} (real) ===", lf)
         print(f"[Done] {solver['name']} real → {log_path}")
 
+    if screen:
+        with open(screen_log, "a") as lf:
+            cross_check_screen(screen, solver_logs, lf)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,63 +1,245 @@
+import argparse
+import hashlib
+import json
 import os
 import re
 from collections import defaultdict
 
-RESULTS_DIR = "/home/jana/Documents/DIPLOMA/AAA/Analiza-resevalnikov-za-podgrafni-izomorfizem/random_graphs/results 1000-100"
-OUTPUT_DIR  = "summariesRandom1000-100"
+from graph_tools.runlog import PARSER_VERSION, iter_records, iter_results_logs
 
-FNAME_RE       = re.compile(r"^(.+?)_(tree|quatrilateral|pentagon|er|scale_free|real|random)_results\.txt$")
-TIME_RE        = re.compile(r"Done in ([0-9.]+)s")
-TIMEOUT_RE     = re.compile(r"TIMED OUT after [0-9.]+s\s+\(elapsed=([0-9.]+)s\)")
-TOTAL_ALLOC_RE = re.compile(r"total heap usage: [0-9,]+ allocs, [0-9,]+ frees, ([0-9,]+) bytes allocated")
-GRAPH_RE       = re.compile(r"\[Run\] .+ graph=([^\s]+)")
+# runner logs and summaries of each suite, relative to the repository root
+SUITES = {
+    "generated": ("generated_graphs/results", "generated_graphs/summaries"),
+    "random":    ("random_graphs/results",    "random_graphs/summaries"),
+    "real":      ("real_graphs/results",      "real_graphs/summaries"),
+}
+
+FNAME_RE       = re.compile(r"^(.+?)_(tree|triangle|quatrilateral|pentagon|er|scale_free|real|random)_results\.txt$")
+
+# Summaries are regenerated incrementally: <summaries>/manifest.json records
+# only size, mtime and parser version of every log (plus its solver and
+# suite), so only new or changed logs are parsed again (in a process pool),
+# and only the summaries they feed are rewritten (or removed, once no log
+# feeds them).  Each log's parsed runs are cached in
+# <summaries>/runs/<hash of the log path>.json and read back only when a
+# summary or the dataset has to be rebuilt from them.  The runs
+# are also written as one columnar dataset (graph_tools.dataset) per output
+# directory.  NumPy (for the dataset) and multiprocessing are only imported
+# once a log has to be parsed, so a run over unchanged logs reads one small
+# manifest and stats the logs.
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 3
+RUNS_DIR = "runs"
+JOBS = os.cpu_count() or 1
+
+GENERATED_FAMILIES = ["er", "tree", "scale_free"]
+
+# runs the solver never got, left out of its summary rather than shown as NaN
+# (the Refuter's own summary lists the refuted instances, the analysis
+# report a Selector row for selector campaigns)
+LEFT_OUT = ("refuted", "unselected")
 
 def parse_real_log(path):
+    """{graph (or grp_lvl): {"time", "mem", "timeout"}} for one runner log.
+
+    Works for the generated, real and random logs alike (graph_tools.runlog).
+    """
     data = {}
-    cur_graph = None
-    with open(path) as f:
-        for line in f:
-            m = GRAPH_RE.search(line)
-            if m:
-                cur_graph = m.group(1)
-                data[cur_graph] = {"time": None, "mem": None, "timeout": False}
-                continue
-            if cur_graph is None:
-                continue
-            m = TIMEOUT_RE.search(line)
-            if m:
-                data[cur_graph]["timeout"] = True
-                data[cur_graph]["time"] = None
-                continue
-            m = TIME_RE.search(line)
-            if m:
-                data[cur_graph]["timeout"] = False
-                data[cur_graph]["time"] = float(m.group(1))
-                continue
-            m = TOTAL_ALLOC_RE.search(line)
-            if m:
-                data[cur_graph]["mem"] = int(m.group(1).replace(",", ""))
-                continue
+    for rec in iter_records(path):
+        key = rec.graph if rec.graph is not None else rec.instance
+        data[key] = {"time": rec.time, "mem": rec.alloc, "timeout": rec.timeout is not None}
     return data
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    for fn in os.listdir(RESULTS_DIR):
-        m = FNAME_RE.match(fn)
-        if not m:
-            continue
-        solver, family = m.group(1), m.group(2)
-        parsed = parse_real_log(os.path.join(RESULTS_DIR, fn))
-        out_path = os.path.join(OUTPUT_DIR, f"{solver}_{family}_summary.txt")
-        with open(out_path, "w") as out:
-            out.write(f"=== Summary for solver: {solver} ({family} graphs) ===\n\n")
-            hdr = ["graph", "time(s)", "alloc(B)"]
+def _stamp(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "parser": f"{PARSER_VERSION}.{MANIFEST_VERSION}"}
+
+def _parse(path):
+    """(path, manifest entry, runs as dataset rows plus the graph file name) for one log."""
+    from graph_tools.dataset import run_row
+    runs = []
+    solver = suite = None
+    for rec in iter_records(path, stats=True):
+        solver, suite = rec.solver, rec.suite
+        runs.append({**run_row(rec), "graph": rec.graph})
+    return path, {**_stamp(path), "solver": solver, "suite": suite}, runs
+
+def _runs_path(output_dir, path):
+    return os.path.join(output_dir, RUNS_DIR, hashlib.sha1(path.encode()).hexdigest()[:16] + ".json")
+
+def save_runs(output_dir, path, runs):
+    cache = _runs_path(output_dir, path)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    with open(cache + ".tmp", "w") as f:
+        f.write(json.dumps(runs))
+    os.replace(cache + ".tmp", cache)
+
+def load_runs(output_dir, path):
+    with open(_runs_path(output_dir, path)) as f:
+        return json.load(f)
+
+def summary_name(path, suite):
+    solver, family = FNAME_RE.match(os.path.basename(path)).groups()
+    return f"{solver}_summary.txt" if suite == "generated" else f"{solver}_{family}_summary.txt"
+
+def _time_cell(run, reported=False):
+    """Seconds of a solved run: wall time, or with ``reported`` the solver's own runtime where it prints one."""
+    if run["status"] != "solved":
+        return "NaN"
+    own = run.get("runtime", float("nan"))
+    return f"{own if reported and own == own else run['wall']:.3f}"
+
+def _alloc_cell(run):
+    return "NaN" if run["alloc"] != run["alloc"] else str(run["alloc"])
+
+def write_graph_summary(out_path, path, entry, runs):
+    solver, family = FNAME_RE.match(os.path.basename(path)).groups()
+    # the log's own headers name the solver and suite ("RI", "random"),
+    # the file name may carry more ("RI_1000-100")
+    solver, family = entry["solver"] or solver, entry["suite"] or family
+    parsed = {run["graph"]: run for run in runs if run["status"] not in LEFT_OUT}
+    with open(out_path, "w") as out:
+        out.write(f"=== Summary for solver: {solver} ({family} graphs) ===\n\n")
+        hdr = ["graph", "time(s)", "alloc(B)"]
+        out.write(" | ".join(hdr) + "\n")
+        for graph in sorted(parsed.keys()):
+            out.write(f"{graph} | {_time_cell(parsed[graph])} | {_alloc_cell(parsed[graph])}\n")
+
+def write_generated_summary(out_path, solver, logs):
+    """One "-- test family --" table per family log of a solver.
+
+    As in the original tables, times are the solver's own runtime (pathLAD
+    prints none and gets the runner's wall time).
+    """
+    by_family = {FNAME_RE.match(os.path.basename(p)).group(2): runs for p, runs in logs}
+    families = [f for f in GENERATED_FAMILIES if f in by_family]
+    families += sorted(set(by_family) - set(families))
+    with open(out_path, "w") as out:
+        out.write(f"=== Summary for solver: {solver} ===\n\n")
+        for family in families:
+            cells = defaultdict(dict)
+            levels = set()
+            for run in by_family[family]:
+                if run["status"] in LEFT_OUT:
+                    continue
+                cells[run["group"]][run["level"]] = run
+                levels.add(run["level"])
+            levels = sorted(levels)
+            hdr = ["group"] + [f"{lvl}_time(s)" for lvl in levels] + [f"{lvl}_alloc(B)" for lvl in levels]
+            out.write(f"-- test family: {family} --\n")
             out.write(" | ".join(hdr) + "\n")
-            for graph in sorted(parsed.keys()):
-                rec = parsed[graph]
-                t = "NaN" if rec["timeout"] or rec["time"] is None else f"{rec['time']:.3f}"
-                m = str(rec["mem"]) if rec["mem"] is not None else "NaN"
-                out.write(f"{graph} | {t} | {m}\n")
-        print(f"Wrote summary for {solver} ({family}) → {out_path}")
-        
+            for grp in sorted(cells):
+                row = cells[grp]
+                times = [_time_cell(row[lvl], reported=True) if lvl in row else "NaN" for lvl in levels]
+                allocs = [_alloc_cell(row[lvl]) if lvl in row else "NaN" for lvl in levels]
+                out.write(" | ".join([str(grp)] + times + allocs) + "\n")
+            out.write("\n")
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        # dumps() uses the C encoder, json.dump() to a file does not
+        f.write(json.dumps(manifest))
+    os.replace(path + ".tmp", path)
+
+def _has_dataset(output_dir, fmt=None):
+    if fmt:
+        return os.path.exists(os.path.join(output_dir, f"results.{fmt}"))
+    return any(f.startswith("results.") for f in os.listdir(output_dir))
+
+def summarize(roots, output_dir, jobs=JOBS, force=False, fmt=None):
+    """Re-parse new or changed logs under ``roots`` and rewrite the summaries they feed."""
+    os.makedirs(output_dir, exist_ok=True)
+    old = load_manifest(output_dir)
+    logs = [p for p in iter_results_logs(roots) if FNAME_RE.match(os.path.basename(p))]
+    manifest = {}
+    stale = []
+    for path in logs:
+        entry = old.get(path)
+        if (not force and entry and all(entry[k] == v for k, v in _stamp(path).items())
+                and os.path.exists(_runs_path(output_dir, path))):
+            manifest[path] = entry
+        else:
+            stale.append(path)
+
+    if jobs > 1 and len(stale) > 1:
+        import multiprocessing as mp
+        with mp.Pool(min(jobs, len(stale))) as pool:
+            parsed = pool.map(_parse, stale, chunksize=1)
+    else:
+        parsed = [_parse(p) for p in stale]
+    runs = {}
+    for path, entry, log_runs in parsed:
+        manifest[path] = entry
+        runs[path] = log_runs
+        save_runs(output_dir, path, log_runs)
+
+    def runs_of(path):
+        if path not in runs:
+            runs[path] = load_runs(output_dir, path)
+        return runs[path]
+
+    groups = defaultdict(list)
+    for path in logs:
+        out_path = os.path.join(output_dir, summary_name(path, manifest[path]["suite"]))
+        groups[out_path].append(path)
+    removed = old.keys() - manifest.keys()
+    changed = {os.path.join(output_dir, summary_name(p, manifest[p]["suite"])) for p in stale}
+    changed |= {os.path.join(output_dir, summary_name(p, old[p].get("suite"))) for p in removed
+                if FNAME_RE.match(os.path.basename(p))}
+    for out_path, paths in sorted(groups.items()):
+        if out_path not in changed and os.path.exists(out_path):
+            continue
+        if manifest[paths[0]]["suite"] == "generated":
+            solver = FNAME_RE.match(os.path.basename(paths[0])).group(1)
+            write_generated_summary(out_path, solver, [(p, runs_of(p)) for p in paths])
+        else:
+            write_graph_summary(out_path, paths[-1], manifest[paths[-1]], runs_of(paths[-1]))
+        print(f"Wrote summary → {out_path}")
+    # summaries whose every log is gone
+    for out_path in sorted(changed - groups.keys()):
+        if os.path.exists(out_path):
+            os.remove(out_path)
+            print(f"Removed summary → {out_path}")
+
+    if stale or removed or not _has_dataset(output_dir, fmt):
+        from graph_tools.dataset import to_columns, write_dataset
+        rows = [run for path in logs for run in runs_of(path)]
+        print(f"Wrote dataset → {write_dataset(to_columns(rows), output_dir, fmt=fmt)}")
+
+    if stale or removed or manifest.keys() != old.keys():
+        save_manifest(output_dir, manifest)
+        for path in removed:
+            if os.path.exists(_runs_path(output_dir, path)):
+                os.remove(_runs_path(output_dir, path))
+    print(f"Parsed {len(stale)} of {len(logs)} logs ({len(logs) - len(stale)} unchanged).")
+    return manifest
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarise runner logs (*_results.txt) into *_summary.txt tables.")
+    ap.add_argument("roots", nargs="*", help="log files or directories (default: every suite's results)")
+    ap.add_argument("--out", help="summaries directory (required with roots)")
+    ap.add_argument("--jobs", type=int, default=JOBS)
+    ap.add_argument("--force", action="store_true", help="re-parse every log")
+    ap.add_argument("--format", choices=["parquet", "feather", "npz"],
+                    help="dataset format (default: parquet with pyarrow, else npz)")
+    args = ap.parse_args(argv)
+    if args.roots:
+        if not args.out:
+            ap.error("--out is required when log roots are given")
+        summarize(args.roots, args.out, args.jobs, args.force, args.format)
+        return 0
+    for logs, out in SUITES.values():
+        if os.path.isdir(logs):
+            summarize([logs], out, args.jobs, args.force, args.format)
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
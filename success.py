@@ -1,42 +1,53 @@
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
-import glob, os
 
-# 1) Collect counts of non-NaN times from all *_summary.csv
-counts = {}
-families = set()
+from graph_tools.dataset import load_datasets
 
-for path in glob.glob('*_summary.txt'):
-    fname = os.path.basename(path)
-    solver, *fam_parts, _ = fname.split('_')
-    family = '_'.join(fam_parts).replace('_summary', '')
-    
-    # Read, splitting on "|" or whitespace — adjust sep if needed
-    df = pd.read_csv(path, sep=r'\s*\|\s*', engine='python', na_values=['NaN'])
-    
-    # Find the time column automatically
-    time_col = [c for c in df.columns if 'time' in c.lower()][0]
-    solved = df[time_col].notna().sum()
-    
-    counts.setdefault(solver, {})[family] = solved
-    families.add(family)
+def count_solved(columns, suite=None):
+    # 1) Count solved runs per solver and test family of the results dataset
+    mask = columns['status'] == 'solved'
+    if suite is not None:
+        mask &= columns['suite'] == suite
+    df = pd.DataFrame({'solver': columns['solver'][mask], 'family': columns['family'][mask]})
 
-# 2) Build a solver × family DataFrame
-df = pd.DataFrame(counts).T.fillna(0).astype(int)
-df = df.reindex(sorted(df.index))            # sort solvers alphabetically
-df = df[sorted(families)]                     # sort families
+    # 2) Build a solver × family DataFrame
+    df = pd.crosstab(df['solver'], df['family'])
+    df = df.reindex(sorted(df.index))            # sort solvers alphabetically
+    return df[sorted(df.columns)]                 # sort families
 
-# 3) Plot stacked bar chart
-ax = df.plot(
-    kind='bar',
-    stacked=True,
-    edgecolor='black',
-    figsize=(8,5)
-)
-ax.set_xlabel('Solver')
-ax.set_ylabel('Number of Solved Instances')
-ax.set_title('Solver Performance Across Test Families')
-ax.legend(title='Test Family', bbox_to_anchor=(1.02,1), loc='upper left')
-plt.xticks(rotation=45, ha='right')
-plt.tight_layout()
-plt.show()
+def plot_families(df, out_path=None):
+    # 3) Plot stacked bar chart
+    ax = df.plot(
+        kind='bar',
+        stacked=True,
+        edgecolor='black',
+        figsize=(8,5)
+    )
+    ax.set_xlabel('Solver')
+    ax.set_ylabel('Number of Solved Instances')
+    ax.set_title('Solver Performance Across Test Families')
+    ax.legend(title='Test Family', bbox_to_anchor=(1.02,1), loc='upper left')
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    if out_path:
+        plt.savefig(out_path)
+    else:
+        plt.show()
+    plt.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solved instances per solver, stacked by test family.")
+    ap.add_argument("datasets", nargs="*", default=["."], help="results datasets (files or summary directories)")
+    ap.add_argument("--suite", help="only this suite (generated, random or real)")
+    ap.add_argument("--out", help="save the figure here instead of showing it")
+    args = ap.parse_args(argv)
+    columns = load_datasets(args.datasets)
+    if columns is None:
+        print("No results datasets found (run results.py first).")
+        return 1
+    plot_families(count_solved(columns, args.suite), args.out)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())